@@ -0,0 +1,30 @@
+"""Booking cafe/date index
+
+Revision ID: 5b1f3c9a7d20
+Revises: 2cecb8e09e2e
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1f3c9a7d20'
+down_revision = '2cecb8e09e2e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bookingmodel', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_bookingmodel_cafe_id_booking_date',
+            ['cafe_id', 'booking_date'],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('bookingmodel', schema=None) as batch_op:
+        batch_op.drop_index('ix_bookingmodel_cafe_id_booking_date')
@@ -0,0 +1,43 @@
+"""Slot templates
+
+Revision ID: 8e4d2a6c1f93
+Revises: 5b1f3c9a7d20
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4d2a6c1f93'
+down_revision = '5b1f3c9a7d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('slot_templates',
+    sa.Column('cafe_id', sa.Integer(), nullable=False),
+    sa.Column('weekday', sa.SmallInteger(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=False),
+    sa.Column('end_time', sa.Time(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('active', sa.Boolean(), nullable=False),
+    sa.CheckConstraint('weekday BETWEEN 0 AND 6', name='ck_slot_templates_weekday_range'),
+    sa.CheckConstraint('end_time > start_time', name='ck_slot_templates_time_order'),
+    sa.ForeignKeyConstraint(['cafe_id'], ['cafe.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('slot_templates', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_slot_templates_cafe_id'), ['cafe_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('slot_templates', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_slot_templates_cafe_id'))
+
+    op.drop_table('slot_templates')
@@ -0,0 +1,50 @@
+"""Stats rollups
+
+Revision ID: a4d9c3e7f185
+Revises: f2c6d8b4a019
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d9c3e7f185'
+down_revision = 'f2c6d8b4a019'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('booking_daily_rollup',
+    sa.Column('cafe_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('bookings', sa.Integer(), nullable=False),
+    sa.Column('guests', sa.Integer(), nullable=False),
+    sa.Column('cancelled', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('cafe_id', 'date', name=op.f('pk_booking_daily_rollup'))
+    )
+    op.create_table('booking_occupancy_rollup',
+    sa.Column('cafe_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('slot_id', sa.Integer(), nullable=False),
+    sa.Column('table_id', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=False),
+    sa.Column('end_time', sa.Time(), nullable=False),
+    sa.Column('bookings', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('cafe_id', 'date', 'slot_id', 'table_id', name=op.f('pk_booking_occupancy_rollup'))
+    )
+    op.create_table('dish_preorder_rollup',
+    sa.Column('cafe_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('dish_id', sa.Integer(), nullable=False),
+    sa.Column('orders', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('cafe_id', 'date', 'dish_id', name=op.f('pk_dish_preorder_rollup'))
+    )
+
+
+def downgrade():
+    op.drop_table('dish_preorder_rollup')
+    op.drop_table('booking_occupancy_rollup')
+    op.drop_table('booking_daily_rollup')
@@ -0,0 +1,29 @@
+"""Stats pending days
+
+Revision ID: b8e1f4c2d7a9
+Revises: e6c3a8d1f572
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e1f4c2d7a9'
+down_revision = 'e6c3a8d1f572'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stats_pending_days',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cafe_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_stats_pending_days'))
+    )
+
+
+def downgrade():
+    op.drop_table('stats_pending_days')
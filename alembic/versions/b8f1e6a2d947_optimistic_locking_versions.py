@@ -0,0 +1,39 @@
+"""Optimistic locking versions
+
+Revision ID: b8f1e6a2d947
+Revises: a4d9c3e7f185
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8f1e6a2d947'
+down_revision = 'a4d9c3e7f185'
+branch_labels = None
+depends_on = None
+
+
+TABLES = [
+    'bookingmodel',
+    'bookingmodel_archive',
+    'cafe',
+    'dish',
+    'tables',
+    'time_slots',
+    'time_slots_archive',
+]
+
+
+def upgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('version')
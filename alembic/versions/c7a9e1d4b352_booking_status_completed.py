@@ -0,0 +1,32 @@
+"""Booking status completed
+
+Revision ID: c7a9e1d4b352
+Revises: 8e4d2a6c1f93
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7a9e1d4b352'
+down_revision = '8e4d2a6c1f93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute(
+                "ALTER TYPE bookingstatus ADD VALUE IF NOT EXISTS 'COMPLETED'"
+            )
+
+
+def downgrade():
+    # Значение из типа enum в Postgres не удаляется,
+    # завершенные бронирования возвращаются в ACTIVE.
+    op.execute(
+        "UPDATE bookingmodel SET status = 'ACTIVE' "
+        "WHERE status = 'COMPLETED'"
+    )
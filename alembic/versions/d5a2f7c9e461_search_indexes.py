@@ -0,0 +1,57 @@
+"""Search indexes on cafes and dishes
+
+Revision ID: d5a2f7c9e461
+Revises: b8f1e6a2d947
+Create Date: 2026-10-19 10:00:00.000000
+
+Только для Postgres, в SQLite поиск идет по индексу в памяти.
+
+Индексы tsvector строятся по тому же выражению, что и запрос поиска.
+Триграммные индексы создаются, только если расширение pg_trgm доступно
+на сервере; без него поиск обходится tsvector и ILIKE.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.core.search import SEARCH_COLUMNS, document_sql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a2f7c9e461'
+down_revision = 'b8f1e6a2d947'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    for table in SEARCH_COLUMNS:
+        op.execute(
+            f'CREATE INDEX ix_{table}_search_document ON {table} '
+            f'USING gin (({document_sql(table)}))'
+        )
+    trgm_available = bind.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_available_extensions "
+        "WHERE name = 'pg_trgm')"
+    )).scalar()
+    if not trgm_available:
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table, columns in SEARCH_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f'CREATE INDEX ix_{table}_{column}_trgm ON {table} '
+                f'USING gin ({column} gin_trgm_ops)'
+            )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, columns in SEARCH_COLUMNS.items():
+        for column in columns:
+            op.execute(f'DROP INDEX IF EXISTS ix_{table}_{column}_trgm')
+        op.execute(f'DROP INDEX IF EXISTS ix_{table}_search_document')
@@ -0,0 +1,76 @@
+"""Booking archive tables
+
+Revision ID: e3b8f0a5c617
+Revises: c7a9e1d4b352
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b8f0a5c617'
+down_revision = 'c7a9e1d4b352'
+branch_labels = None
+depends_on = None
+
+
+def archived_at():
+    return sa.Column('archived_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False)
+
+
+def upgrade():
+    op.create_table('bookingmodel_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('cafe_id', sa.Integer(), nullable=False),
+    sa.Column('booking_date', sa.Date(), nullable=False),
+    sa.Column('guests_number', sa.Integer(), nullable=False),
+    sa.Column('status', postgresql.ENUM('BOOKED', 'CANCELLED', 'ACTIVE', 'COMPLETED', name='bookingstatus', create_type=False), nullable=False),
+    sa.Column('note', sa.Text(), nullable=True),
+    sa.Column('active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    archived_at(),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_bookingmodel_archive'))
+    )
+    op.create_index('ix_bookingmodel_archive_cafe_id_booking_date', 'bookingmodel_archive', ['cafe_id', 'booking_date'], unique=False)
+    op.create_index(op.f('ix_bookingmodel_archive_user_id'), 'bookingmodel_archive', ['user_id'], unique=False)
+    for name, column in (
+        ('booking_tables_archive', 'table_id'),
+        ('booking_slots_archive', 'slot_id'),
+        ('booking_dishes_archive', 'dish_id'),
+    ):
+        op.create_table(name,
+        sa.Column('booking_id', sa.Integer(), nullable=False),
+        sa.Column(column, sa.Integer(), nullable=False),
+        archived_at(),
+        sa.PrimaryKeyConstraint('booking_id', column, name=op.f(f'pk_{name}'))
+        )
+    op.create_table('time_slots_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('cafe_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=False),
+    sa.Column('end_time', sa.Time(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    archived_at(),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_time_slots_archive'))
+    )
+    op.create_index('ix_time_slots_archive_cafe_id_date', 'time_slots_archive', ['cafe_id', 'date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_time_slots_archive_cafe_id_date', table_name='time_slots_archive')
+    op.drop_table('time_slots_archive')
+    op.drop_table('booking_dishes_archive')
+    op.drop_table('booking_slots_archive')
+    op.drop_table('booking_tables_archive')
+    op.drop_index(op.f('ix_bookingmodel_archive_user_id'), table_name='bookingmodel_archive')
+    op.drop_index('ix_bookingmodel_archive_cafe_id_booking_date', table_name='bookingmodel_archive')
+    op.drop_table('bookingmodel_archive')
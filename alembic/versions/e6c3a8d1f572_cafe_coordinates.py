@@ -0,0 +1,49 @@
+"""Cafe coordinates
+
+Revision ID: e6c3a8d1f572
+Revises: d5a2f7c9e461
+Create Date: 2026-10-19 10:00:00.000000
+
+Индекс GiST по точке кафе создается только в Postgres, где доступно
+расширение PostGIS; без него поиск рядом идет по индексу в памяти.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.core.geo import LOCATION_SQL
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6c3a8d1f572'
+down_revision = 'd5a2f7c9e461'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('cafe', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True))
+
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    postgis_available = bind.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_available_extensions "
+        "WHERE name = 'postgis')"
+    )).scalar()
+    if postgis_available:
+        op.execute('CREATE EXTENSION IF NOT EXISTS postgis')
+        op.execute(
+            f'CREATE INDEX ix_cafe_location ON cafe USING gist (({LOCATION_SQL})) '
+            'WHERE latitude IS NOT NULL AND longitude IS NOT NULL'
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_cafe_location')
+    with op.batch_alter_table('cafe', schema=None) as batch_op:
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
@@ -0,0 +1,172 @@
+"""Partition bookings and time slots by month
+
+Revision ID: f2c6d8b4a019
+Revises: e3b8f0a5c617
+Create Date: 2026-10-19 10:00:00.000000
+
+Только для Postgres, в SQLite миграция ничего не делает.
+
+Первичный ключ секционированной таблицы обязан включать ключ секции,
+поэтому id перестает быть уникальным сам по себе и внешние ключи
+booking_tables, booking_slots и booking_dishes на bookingmodel
+и time_slots удаляются. Уникальность id обеспечивает последовательность,
+удаление связей выполняют CRUD и архивирование.
+
+Секции создаются помесячно с первого месяца данных до последнего
+и еще на MONTHS_AHEAD месяцев вперед, чтобы перенесенные строки
+не попадали в секцию DEFAULT. Помесячная арифметика и DDL повторяют
+src.core.partitions, но не импортируются: миграция не должна меняться
+вместе с кодом приложения.
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6d8b4a019'
+down_revision = 'e3b8f0a5c617'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+TABLES = {
+    'bookingmodel': {
+        'key': 'booking_date',
+        'indexes': {
+            'ix_bookingmodel_cafe_id': ['cafe_id'],
+            'ix_bookingmodel_user_id': ['user_id'],
+            'ix_bookingmodel_cafe_id_booking_date': ['cafe_id', 'booking_date'],
+        },
+        'foreign_keys': [
+            ('cafe_id', 'cafe', 'CASCADE'),
+            ('user_id', 'user', 'CASCADE'),
+        ],
+    },
+    'time_slots': {
+        'key': 'date',
+        'indexes': {
+            'ix_time_slots_cafe_id': ['cafe_id'],
+        },
+        'foreign_keys': [
+            ('cafe_id', 'cafe', None),
+        ],
+    },
+}
+
+ASSOCIATIONS = [
+    ('booking_tables', 'booking_id', 'bookingmodel'),
+    ('booking_slots', 'booking_id', 'bookingmodel'),
+    ('booking_slots', 'slot_id', 'time_slots'),
+    ('booking_dishes', 'booking_id', 'bookingmodel'),
+]
+
+
+def _add_months(month, count):
+    """Сдвигает первое число месяца на count месяцев."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_partitions(table, first, last):
+    """Создает помесячные секции с first по last включительно."""
+    month = first.replace(day=1)
+    while month <= last:
+        following = _add_months(month, 1)
+        op.execute(
+            f'CREATE TABLE IF NOT EXISTS {table}_p{month:%Y_%m} '
+            f'PARTITION OF {table} '
+            f"FOR VALUES FROM ('{month}') TO ('{following}')"
+        )
+        month = following
+
+
+def _rebuild(table, old_name, create_sql, pk_name, pk_columns):
+    """Переименовывает таблицу и создает пустую с тем же набором колонок."""
+    spec = TABLES[table]
+    bind = op.get_bind()
+    op.execute(f'ALTER TABLE {table} RENAME TO {old_name}')
+    for index in spec['indexes']:
+        op.execute(f'DROP INDEX IF EXISTS {index}')
+    sequence = bind.scalar(
+        sa.text("SELECT pg_get_serial_sequence(:table, 'id')"),
+        {'table': old_name},
+    )
+    op.execute(f'ALTER SEQUENCE {sequence} OWNED BY NONE')
+    op.execute(create_sql)
+    op.execute(
+        f'ALTER TABLE {table} ADD CONSTRAINT {pk_name} '
+        f'PRIMARY KEY ({", ".join(pk_columns)})'
+    )
+    return sequence
+
+
+def _finish(table, old_name, sequence):
+    spec = TABLES[table]
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old_name}')
+    # CASCADE удаляет внешние ключи ассоциативных таблиц на старую таблицу.
+    op.execute(f'DROP TABLE {old_name} CASCADE')
+    op.execute(f'ALTER SEQUENCE {sequence} OWNED BY {table}.id')
+    for index, columns in spec['indexes'].items():
+        op.create_index(index, table, columns, unique=False)
+    for column, referred, ondelete in spec['foreign_keys']:
+        op.create_foreign_key(
+            f'fk_{table}_{column}_{referred}', table, referred,
+            [column], ['id'], ondelete=ondelete,
+        )
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    current = date.today().replace(day=1)
+    for table, spec in TABLES.items():
+        key = spec['key']
+        old_name = f'{table}_legacy'
+        sequence = _rebuild(
+            table,
+            old_name,
+            f'CREATE TABLE {table} (LIKE {old_name} INCLUDING DEFAULTS '
+            f'INCLUDING CONSTRAINTS) PARTITION BY RANGE ({key})',
+            f'pk_{table}',
+            ['id', key],
+        )
+        first, last = bind.execute(
+            sa.text(f'SELECT min({key}), max({key}) FROM {old_name}')
+        ).one()
+        horizon = _add_months(current, MONTHS_AHEAD)
+        _create_partitions(
+            table,
+            min(first or current, current),
+            max(last or horizon, horizon),
+        )
+        op.execute(
+            f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT'
+        )
+        _finish(table, old_name, sequence)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        old_name = f'{table}_partitioned'
+        sequence = _rebuild(
+            table,
+            old_name,
+            f'CREATE TABLE {table} (LIKE {old_name} INCLUDING DEFAULTS '
+            f'INCLUDING CONSTRAINTS)',
+            f'{table}_pkey',
+            ['id'],
+        )
+        _finish(table, old_name, sequence)
+    for association, column, referred in ASSOCIATIONS:
+        op.create_foreign_key(
+            f'{association}_{column}_fkey', association, referred,
+            [column], ['id'], ondelete='CASCADE',
+        )
@@ -0,0 +1,396 @@
+"""Микробенчмарки горячих путей CRUD и валидаторов.
+
+Для каждого размера набора данных база заполняется заново (как в
+bench.load), затем каждый случай вызывается repeat раз в новой сессии,
+как в отдельном запросе. Для каждого вызова считаются время и число
+SQL-запросов: каскад selectin и вставки по одной строке видны по
+столбцу statements, повторная компиляция запросов - по столбцу
+compiled (промахи кеша SQLAlchemy), а по показателю роста exponent (наклон в
+логарифмическом масштабе между крайними размерами) - сверхлинейная
+зависимость от объема данных.
+
+Запуск::
+
+    python -m bench.hotpaths --sizes 500 2000 8000 --repeat 20
+    python -m bench.hotpaths --database-url postgresql+asyncpg://...
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import date
+from datetime import time as time_type
+from typing import Any, Awaitable, Callable, Optional
+
+from bench.load import configure_environment, seed
+
+Case = Callable[[Any, 'Sample'], Awaitable[Any]]
+
+
+@dataclass
+class Sample:
+    """Объекты, с которыми вызываются горячие пути."""
+
+    cafe_id: int
+    user_id: int
+    token: str
+    table_ids: list[int]
+    slot_ids: list[int]
+    slot_date: date
+    start_time: time_type
+    end_time: time_type
+    dish_ids: list[int]
+    page: Optional[list[Any]] = None
+    scope: Optional[Any] = None
+
+
+class StatementCounter:
+    """Считает запросы к базе через событие before_cursor_execute."""
+
+    def __init__(self) -> None:
+        """Создает счетчик с нулями."""
+        self.statements = 0
+        self.rows = 0
+        self.compiled = 0
+
+    def __call__(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        """Учитывает запрос; executemany - один запрос на много строк."""
+        self.statements += 1
+        self.rows += len(parameters) if executemany else 1
+        self.compiled += context.cache_hit.name == 'CACHE_MISS'
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default=None,
+                        help='пустая база; по умолчанию временный SQLite')
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[500, 2000, 8000],
+                        help='количество бронирований в наборе')
+    parser.add_argument('--cafes', type=int, default=5)
+    parser.add_argument('--tables', type=int, default=10)
+    parser.add_argument('--slots', type=int, default=8)
+    parser.add_argument('--page', type=int, default=100,
+                        help='бронирований в странице сериализации')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--cases', nargs='+', default=None,
+                        help='только эти случаи')
+    parser.add_argument('--seed', type=int, default=1)
+    return parser.parse_args()
+
+
+async def crud_booking_create(session: Any, sample: Sample) -> Any:
+    """CRUDBooking.create с двумя столами, двумя слотами и меню."""
+    from src.crud.booking import booking_crud
+    from src.models.booking import BookingStatus
+
+    return await booking_crud.create(
+        {
+            'cafe_id': sample.cafe_id,
+            'user_id': sample.user_id,
+            'booking_date': sample.slot_date,
+            'guests_number': 2,
+            'status': BookingStatus.BOOKED,
+            'tables': list(sample.table_ids),
+            'slots': list(sample.slot_ids),
+            'menu': list(sample.dish_ids),
+        },
+        session,
+    )
+
+
+async def check_booking_conflicts(session: Any, sample: Sample) -> Any:
+    """CRUDBooking.check_booking_conflicts."""
+    from src.crud.booking import booking_crud
+
+    return await booking_crud.check_booking_conflicts(
+        session, sample.cafe_id, sample.table_ids, sample.slot_ids,
+        sample.slot_date,
+    )
+
+
+async def validate_table(session: Any, sample: Sample) -> Any:
+    """validate_table_for_booking."""
+    from src.api.validators import validate_table_for_booking
+
+    return await validate_table_for_booking(
+        sample.table_ids, sample.cafe_id, 2, session,
+    )
+
+
+async def validate_slot(session: Any, sample: Sample) -> Any:
+    """validate_slot_for_booking."""
+    from src.api.validators import validate_slot_for_booking
+
+    return await validate_slot_for_booking(
+        sample.slot_ids, sample.cafe_id, session,
+    )
+
+
+async def check_time_conflict(session: Any, sample: Sample) -> Any:
+    """CRUDTimeSlot.check_time_conflict с пересечением одного слота."""
+    from src.crud.slot import time_slot_crud
+
+    return await time_slot_crud.check_time_conflict(
+        sample.cafe_id, sample.slot_date, sample.start_time,
+        sample.end_time, session,
+    )
+
+
+async def get_current_user(session: Any, sample: Sample) -> Any:
+    """get_current_user: разбор JWT и загрузка пользователя."""
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    from src.core.auth import get_current_user as dependency
+
+    return await dependency(
+        HTTPAuthorizationCredentials(
+            scheme='Bearer', credentials=sample.token,
+        ),
+        session,
+    )
+
+
+async def get_bookings_filtered(session: Any, sample: Sample) -> Any:
+    """CRUDBooking.get_multi_filtered, как в списке бронирований."""
+    from src.crud.booking import booking_crud
+
+    return await booking_crud.get_multi_filtered(
+        session, sample.scope, user_id=sample.user_id,
+    )
+
+
+async def get_dish_by_field(session: Any, sample: Sample) -> Any:
+    """CRUDBase.get_by_field по ID блюда со связями."""
+    from src.crud.dish import dish_crud
+
+    return await dish_crud.get_by_field(
+        session, extra_uploading=True, id=sample.dish_ids[0],
+    )
+
+
+def booking_page_stmt(sample: Sample, limit: int) -> Any:
+    """Запрос страницы бронирований кафе, как в списке бронирований."""
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+
+    from src.models import BookingModel
+
+    return (
+        select(BookingModel)
+        .options(
+            selectinload(BookingModel.user),
+            selectinload(BookingModel.cafe),
+            selectinload(BookingModel.tables),
+            selectinload(BookingModel.slots),
+            selectinload(BookingModel.menu),
+        )
+        .where(BookingModel.cafe_id == sample.cafe_id)
+        .order_by(BookingModel.id)
+        .limit(limit)
+    )
+
+
+async def load_booking_page(session: Any, sample: Sample) -> Any:
+    """Загрузка страницы бронирований со связями для схемы Booking."""
+    stmt = booking_page_stmt(sample, len(sample.page))
+    return (await session.execute(stmt)).scalars().all()
+
+
+async def serialize_booking_page(session: Any, sample: Sample) -> Any:
+    """Сериализация загруженной страницы в JSON схемой Booking."""
+    from src.core.serialization import dump_json
+    from src.schemas.booking import BookingListAdapter
+
+    return dump_json(BookingListAdapter, sample.page)
+
+
+CASES: dict[str, Case] = {
+    'crud_booking_create': crud_booking_create,
+    'check_booking_conflicts': check_booking_conflicts,
+    'validate_table_for_booking': validate_table,
+    'validate_slot_for_booking': validate_slot,
+    'check_time_conflict': check_time_conflict,
+    'get_current_user': get_current_user,
+    'get_bookings_filtered': get_bookings_filtered,
+    'get_dish_by_field': get_dish_by_field,
+    'load_booking_page': load_booking_page,
+    'serialize_booking_page': serialize_booking_page,
+}
+
+
+async def reset_and_seed(args: argparse.Namespace, size: int) -> None:
+    """Пересоздает схему и заполняет ее набором на size бронирований."""
+    from src.core.db import Base, engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    # Занята примерно половина пар (слот, стол), остальное свободно.
+    per_day = args.cafes * args.tables * args.slots
+    await seed(
+        argparse.Namespace(
+            cafes=args.cafes, tables=args.tables, slots=args.slots,
+            days=max(2, math.ceil(2 * size / per_day)), dishes=10,
+            users=50, bookings=size,
+        ),
+        random.Random(args.seed),
+    )
+
+
+async def make_sample(session: Any) -> Sample:
+    """Первое кафе, его столы, слоты первого дня и блюда."""
+    from sqlalchemy import select
+
+    from src.core.security import create_access_token
+    from src.models import Dish, TableModel, User
+    from src.models.slot import TimeSlot
+
+    cafe_id = 1
+    tables = (await session.scalars(
+        select(TableModel.id).where(TableModel.cafe_id == cafe_id)
+        .order_by(TableModel.id).limit(2),
+    )).all()
+    slots = (await session.execute(
+        select(TimeSlot.id, TimeSlot.date, TimeSlot.start_time,
+               TimeSlot.end_time)
+        .where(TimeSlot.cafe_id == cafe_id)
+        .order_by(TimeSlot.date, TimeSlot.start_time).limit(2),
+    )).all()
+    dishes = (await session.scalars(
+        select(Dish.id).where(Dish.cafe_id == cafe_id).limit(3),
+    )).all()
+    user_id = await session.scalar(select(User.id).limit(1))
+    return Sample(
+        cafe_id=cafe_id,
+        user_id=user_id,
+        token=create_access_token(user_id),
+        table_ids=list(tables),
+        slot_ids=[slot.id for slot in slots],
+        slot_date=slots[0].date,
+        start_time=slots[0].start_time,
+        end_time=slots[0].end_time,
+        dish_ids=list(dishes),
+    )
+
+
+async def measure(
+    case: Case,
+    sample: Sample,
+    repeat: int,
+    counter: StatementCounter,
+) -> dict[str, Any]:
+    """Время и число запросов на вызов, каждый вызов в новой сессии."""
+    from src.core.db import AsyncSessionLocal
+
+    timings, statements, rows, compiled = [], [], [], []
+    # Первый вызов прогревает кеш компиляции запросов и не учитывается.
+    async with AsyncSessionLocal() as session:
+        await case(session, sample)
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as session:
+            counter.statements = counter.rows = counter.compiled = 0
+            started = time.perf_counter()
+            await case(session, sample)
+            timings.append(time.perf_counter() - started)
+            statements.append(counter.statements)
+            rows.append(counter.rows)
+            compiled.append(counter.compiled)
+    return {
+        'calls': repeat,
+        'mean_ms': round(statistics.fmean(timings) * 1000, 3),
+        'p50_ms': round(statistics.median(timings) * 1000, 3),
+        'min_ms': round(min(timings) * 1000, 3),
+        'statements': round(statistics.fmean(statements), 1),
+        'rows_written_or_bound': round(statistics.fmean(rows), 1),
+        'compiled': round(statistics.fmean(compiled), 1),
+    }
+
+
+def growth_exponent(points: list[tuple[int, float]]) -> Optional[float]:
+    """Наклон log(время) по log(размер) между крайними размерами.
+
+    Около 0 - время не зависит от объема, около 1 - линейный рост,
+    больше 1 - сверхлинейный.
+    """
+    (size_a, time_a), (size_b, time_b) = points[0], points[-1]
+    if size_a == size_b or time_a <= 0:
+        return None
+    return round(math.log(time_b / time_a) / math.log(size_b / size_a), 2)
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Прогоняет случаи по всем размерам и печатает строки JSON."""
+    from sqlalchemy import event
+
+    from src.core.access import AccessScope
+    from src.core.auth import get_user_with_cafes
+    from src.core.db import AsyncSessionLocal, engine
+    from src.core.logger import logger
+
+    logger.setLevel('WARNING')
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, 'before_cursor_execute', counter)
+    cases = {
+        name: case for name, case in CASES.items()
+        if args.cases is None or name in args.cases
+    }
+    points: dict[str, list[tuple[int, float]]] = {name: [] for name in cases}
+    try:
+        for size in sorted(args.sizes):
+            await reset_and_seed(args, size)
+            async with AsyncSessionLocal() as session:
+                sample = await make_sample(session)
+                sample.scope = AccessScope(
+                    await get_user_with_cafes(session, sample.user_id),
+                )
+                sample.page = (await session.execute(
+                    booking_page_stmt(sample, args.page),
+                )).scalars().all()
+                for name, case in cases.items():
+                    result = await measure(case, sample, args.repeat, counter)
+                    points[name].append((size, result['mean_ms']))
+                    print(json.dumps({
+                        'case': name,
+                        'database': engine.dialect.name,
+                        'bookings': size,
+                        **result,
+                    }), flush=True)
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', counter)
+        await engine.dispose()
+    for name, series in points.items():
+        print(json.dumps({
+            'case': name,
+            'sizes': [size for size, _ in series],
+            'mean_ms': [value for _, value in series],
+            'exponent': growth_exponent(series),
+        }))
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    args = parse_args()
+    temp_path = configure_environment(args)
+    try:
+        asyncio.run(run(args))
+    finally:
+        if temp_path is not None:
+            os.remove(temp_path)
+
+
+if __name__ == '__main__':
+    main()
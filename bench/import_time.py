@@ -0,0 +1,129 @@
+"""Бюджет времени холодного старта: импорт src.main и create_app().
+
+Каждый замер - отдельный процесс Python с -X importtime, как при
+запуске воркера uvicorn или сбора тестов. Печатает медианы, модули
+с наибольшим собственным временем импорта и завершается с кодом 1,
+если медиана вышла за бюджет.
+
+Запуск::
+
+    python -m bench.import_time --repeat 5
+    python -m bench.import_time --import-budget-ms 600 --total-budget-ms 1500
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Any
+
+# Замер внутри дочернего процесса: время импорта и создания приложения.
+PROBE = '''
+import json, time
+started = time.perf_counter()
+import src.main
+imported = time.perf_counter()
+src.main.create_app()
+created = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+}))
+'''
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--import-budget-ms', type=float, default=600,
+                        help='бюджет импорта src.main')
+    parser.add_argument('--total-budget-ms', type=float, default=1500,
+                        help='бюджет импорта и create_app()')
+    parser.add_argument('--top', type=int, default=15,
+                        help='сколько самых долгих модулей показать')
+    return parser.parse_args()
+
+
+def probe_environment() -> dict[str, str]:
+    """Окружение дочернего процесса с обязательными настройками."""
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', 'sqlite+aiosqlite:///:memory:')
+    env.setdefault('SECRET', 'bench-secret')
+    env.setdefault('JWT_ALGORITHM', 'HS256')
+    env['SCHEDULER_ENABLED'] = 'false'
+    return env
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """Собственное и накопленное время импорта модулей, мкс."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(own), int(cumulative))
+    return modules
+
+
+def measure(env: dict[str, str]) -> tuple[dict[str, float], dict]:
+    """Один холодный запуск в отдельном процессе."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout), parse_importtime(result.stderr)
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    args = parse_args()
+    env = probe_environment()
+    timings: dict[str, list[float]] = defaultdict(list)
+    own_times: dict[str, list[int]] = defaultdict(list)
+    # Первый запуск прогревает .pyc и файловый кеш и не учитывается.
+    measure(env)
+    for _ in range(args.repeat):
+        sample, modules = measure(env)
+        for name, value in sample.items():
+            timings[name].append(value)
+        timings['total_ms'].append(sum(sample.values()))
+        for name, (own, _) in modules.items():
+            own_times[name].append(own)
+    report: dict[str, Any] = {
+        name: round(statistics.median(values), 1)
+        for name, values in timings.items()
+    }
+    report['slowest_modules_ms'] = {
+        name: round(statistics.median(values) / 1000, 1)
+        for name, values in sorted(
+            own_times.items(),
+            key=lambda item: statistics.median(item[1]),
+            reverse=True,
+        )[:args.top]
+    }
+    over = {
+        name: budget
+        for name, budget in (
+            ('import_ms', args.import_budget_ms),
+            ('total_ms', args.total_budget_ms),
+        )
+        if report[name] > budget
+    }
+    report['budget_ms'] = {
+        'import_ms': args.import_budget_ms,
+        'total_ms': args.total_budget_ms,
+    }
+    report['over_budget'] = sorted(over)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if over:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,481 @@
+"""Нагрузочный бенчмарк API на синтетических данных.
+
+Заполняет базу через модели приложения: кафе со столами, слотами
+и блюдами, менеджеры кафе, пользователи и бронирования. Затем гоняет
+приложение ASGI в том же процессе через httpx по смешанному сценарию:
+вход, список слотов, создание бронирования, список бронирований.
+Результат - JSON с пропускной способностью и задержками p50/p95/p99
+по операциям, чтобы сравнивать коммиты между собой.
+
+База должна быть пустой, таблицы создаются по моделям. По умолчанию
+используется временный файл SQLite, который удаляется после запуска.
+
+Запуск::
+
+    python -m bench.load --cafes 20 --bookings 5000 --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from datetime import time as time_type
+from typing import Any, Optional
+
+import httpx
+
+PASSWORD = 'bench-password'
+OPERATIONS = ('login', 'list_slots', 'create_booking', 'list_bookings')
+MAX_SLOTS_PER_DAY = 13
+DEFAULT_MIX = 'login=1,list_slots=6,create_booking=2,list_bookings=1'
+
+
+@dataclass
+class Account:
+    """Учетная запись виртуального пользователя."""
+
+    login: str
+    managed_cafe_id: Optional[int] = None
+    token: Optional[str] = None
+
+
+@dataclass
+class Dataset:
+    """ID созданных объектов, нужные сценарию."""
+
+    accounts: list[Account] = field(default_factory=list)
+    managers: list[Account] = field(default_factory=list)
+    tables: dict[int, list[tuple[int, int]]] = field(default_factory=dict)
+    slots: dict[int, list[tuple[int, date]]] = field(default_factory=dict)
+    dishes: dict[int, list[int]] = field(default_factory=dict)
+
+
+def parse_args() -> argparse.Namespace:
+    """Разбирает аргументы командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default=None,
+                        help='пустая база; по умолчанию временный SQLite')
+    parser.add_argument('--cafes', type=int, default=10)
+    parser.add_argument('--tables', type=int, default=10,
+                        help='столов на кафе')
+    parser.add_argument('--slots', type=int, default=8,
+                        choices=range(1, MAX_SLOTS_PER_DAY + 1),
+                        metavar=f'1..{MAX_SLOTS_PER_DAY}',
+                        help='часовых слотов на кафе в день с 10:00')
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--dishes', type=int, default=10,
+                        help='блюд на кафе')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--bookings', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='всего запросов сценария')
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--manager-share', type=float, default=0.25,
+                        help='доля виртуальных пользователей-менеджеров')
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help='веса операций: name=weight,...')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--app-log-level', default='WARNING')
+    parser.add_argument('--output', default=None,
+                        help='файл для JSON, по умолчанию stdout')
+    return parser.parse_args()
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """Веса операций из строки name=weight,..."""
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in OPERATIONS:
+            raise SystemExit(f'Неизвестная операция: {name}')
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+def configure_environment(args: argparse.Namespace) -> Optional[str]:
+    """Настраивает приложение через окружение до импорта src.
+
+    Возвращает путь временной базы SQLite, если она создана.
+    """
+    temp_path = None
+    database_url = args.database_url
+    if database_url is None:
+        handle, temp_path = tempfile.mkstemp(suffix='.db', prefix='bench-')
+        os.close(handle)
+        database_url = f'sqlite+aiosqlite:///{temp_path}'
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('SECRET', 'bench-secret')
+    os.environ.setdefault('JWT_ALGORITHM', 'HS256')
+    os.environ['SCHEDULER_ENABLED'] = 'false'
+    return temp_path
+
+
+async def seed(args: argparse.Namespace, rng: random.Random) -> Dataset:
+    """Создает схему и синтетические данные через модели приложения."""
+    # Импорт после configure_environment: настройки читаются при импорте.
+    from sqlalchemy import insert
+
+    from src.core.db import AsyncSessionLocal, Base, engine
+    from src.core.security import get_password_hash
+    from src.models import BookingModel, Cafe, Dish, TableModel, User
+    from src.models.booking import (
+        BookingStatus,
+        booking_slots_table,
+        booking_tables_table,
+    )
+    from src.models.slot import TimeSlot
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    dataset = Dataset()
+    hashed = get_password_hash(PASSWORD)
+    first_day = date.today() + timedelta(days=1)
+    async with AsyncSessionLocal() as session:
+        users = [
+            User(
+                username=f'bench_user_{index}',
+                phone=f'+7900{index:07d}',
+                email=f'user{index}@bench.test',
+                hashed_password=hashed,
+            )
+            for index in range(args.users)
+        ]
+        managers = [
+            User(
+                username=f'bench_manager_{index}',
+                phone=f'+7901{index:07d}',
+                email=f'manager{index}@bench.test',
+                hashed_password=hashed,
+            )
+            for index in range(args.cafes)
+        ]
+        cafes = [
+            Cafe(
+                name=f'Кафе {index}',
+                address=f'Улица {index}',
+                phone=f'+7902{index:07d}',
+                managers=[managers[index]],
+                tables=[
+                    TableModel(seats_number=rng.randint(2, 8))
+                    for _ in range(args.tables)
+                ],
+                time_slots=[
+                    TimeSlot(
+                        date=first_day + timedelta(days=day),
+                        start_time=time_type(10 + slot),
+                        end_time=time_type(11 + slot),
+                    )
+                    for day in range(args.days)
+                    for slot in range(args.slots)
+                ],
+                dishes=[
+                    Dish(name=f'Блюдо {dish}', price=100 + dish,
+                         description='Описание')
+                    for dish in range(args.dishes)
+                ],
+            )
+            for index in range(args.cafes)
+        ]
+        session.add_all([*users, *cafes])
+        await session.flush()
+
+        taken = set()
+        bookings, pairs = [], []
+        for _ in range(args.bookings):
+            cafe = rng.choice(cafes)
+            slot = rng.choice(cafe.time_slots)
+            table = rng.choice(cafe.tables)
+            if (slot.id, table.id) in taken:
+                continue
+            taken.add((slot.id, table.id))
+            bookings.append(BookingModel(
+                user_id=rng.choice(users).id,
+                cafe_id=cafe.id,
+                booking_date=slot.date,
+                guests_number=rng.randint(1, table.seats_number),
+                status=BookingStatus.BOOKED,
+            ))
+            pairs.append((slot.id, table.id))
+        session.add_all(bookings)
+        await session.flush()
+        if bookings:
+            await session.execute(insert(booking_slots_table), [
+                {'booking_id': booking.id, 'slot_id': slot_id}
+                for booking, (slot_id, _) in zip(bookings, pairs)
+            ])
+            await session.execute(insert(booking_tables_table), [
+                {'booking_id': booking.id, 'table_id': table_id}
+                for booking, (_, table_id) in zip(bookings, pairs)
+            ])
+        for cafe in cafes:
+            dataset.tables[cafe.id] = [
+                (table.id, table.seats_number) for table in cafe.tables
+            ]
+            dataset.slots[cafe.id] = [
+                (slot.id, slot.date) for slot in cafe.time_slots
+            ]
+            dataset.dishes[cafe.id] = [dish.id for dish in cafe.dishes]
+        dataset.accounts = [Account(user.email) for user in users]
+        dataset.managers = [
+            Account(manager.email, cafe.id)
+            for manager, cafe in zip(managers, cafes)
+        ]
+        await session.commit()
+    return dataset
+
+
+class Recorder:
+    """Задержки и коды ответов по операциям."""
+
+    def __init__(self) -> None:
+        """Создает пустые выборки."""
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+
+    async def call(
+        self,
+        name: str,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Выполняет запрос и записывает задержку и код ответа."""
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies[name].append(time.perf_counter() - started)
+        self.statuses[name][response.status_code] += 1
+        return response
+
+
+async def login(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    account: Account,
+) -> None:
+    """Вход пользователя, токен сохраняется в учетной записи."""
+    response = await recorder.call(
+        'login', client, 'POST', '/auth/login',
+        json={'name': account.login, 'password': PASSWORD},
+    )
+    if response.status_code == 200:
+        account.token = response.json()['access_token']
+
+
+async def run_operation(
+    name: str,
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    dataset: Dataset,
+    account: Account,
+    rng: random.Random,
+) -> None:
+    """Выполняет одну операцию сценария от имени пользователя."""
+    if name == 'login':
+        await login(client, recorder, account)
+        return
+    headers = {'Authorization': f'Bearer {account.token}'}
+    cafe_id = account.managed_cafe_id or rng.choice(list(dataset.slots))
+    slot_id, slot_date = rng.choice(dataset.slots[cafe_id])
+    if name == 'list_slots':
+        await recorder.call(
+            name, client, 'GET', f'/cafe/{cafe_id}/time_slots',
+            params={'date_param': slot_date.isoformat()}, headers=headers,
+        )
+    elif name == 'create_booking':
+        table_id, seats = rng.choice(dataset.tables[cafe_id])
+        await recorder.call(
+            name, client, 'POST', '/booking',
+            json={
+                'cafe_id': cafe_id,
+                'guests_number': rng.randint(1, seats),
+                'tables': [table_id],
+                'slots': [slot_id],
+                'menu': rng.sample(
+                    dataset.dishes[cafe_id],
+                    min(2, len(dataset.dishes[cafe_id])),
+                ),
+            },
+            headers=headers,
+        )
+    elif name == 'list_bookings':
+        await recorder.call(
+            name, client, 'GET', '/booking',
+            params={'cafe_id': cafe_id}, headers=headers,
+        )
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    dataset: Dataset,
+    account: Account,
+    weights: dict[str, float],
+    budget: list[int],
+    rng: random.Random,
+) -> None:
+    """Цикл одного виртуального пользователя, пока не исчерпан бюджет.
+
+    Список бронирований доступен только менеджерам, у обычных
+    пользователей эта операция исключается из смеси.
+    """
+    allowed = {
+        name: weight for name, weight in weights.items()
+        if weight > 0 and (
+            name != 'list_bookings' or account.managed_cafe_id is not None
+        )
+    }
+    names, values = list(allowed), list(allowed.values())
+    await login(client, recorder, account)
+    budget[0] -= 1
+    while budget[0] > 0:
+        budget[0] -= 1
+        name = rng.choices(names, values)[0]
+        await run_operation(name, client, recorder, dataset, account, rng)
+
+
+def percentile(values: list[float], share: float) -> float:
+    """Перцентиль по методу ближайшего ранга для отсортированных данных."""
+    index = max(0, min(len(values) - 1, round(share * len(values)) - 1))
+    return values[index]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict[str, Any]:
+    """Сводка по операциям: пропускная способность и задержки в мс."""
+    operations = {}
+    for name, latencies in sorted(recorder.latencies.items()):
+        latencies.sort()
+        operations[name] = {
+            'count': len(latencies),
+            'rps': round(len(latencies) / elapsed, 1),
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+            'max_ms': round(latencies[-1] * 1000, 2),
+            'statuses': {
+                str(code): count
+                for code, count in sorted(recorder.statuses[name].items())
+            },
+        }
+    total = sum(item['count'] for item in operations.values())
+    errors = sum(
+        count
+        for counter in recorder.statuses.values()
+        for code, count in counter.items()
+        if code >= 500
+    )
+    return {
+        'requests': total,
+        'server_errors': errors,
+        'elapsed_sec': round(elapsed, 3),
+        'rps': round(total / elapsed, 1),
+        'operations': operations,
+    }
+
+
+def git_revision() -> Optional[str]:
+    """Текущий коммит, если запуск из рабочей копии git."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Заполняет базу, прогоняет сценарий и возвращает отчет."""
+    rng = random.Random(args.seed)
+    weights = parse_mix(args.mix)
+    started = time.perf_counter()
+    dataset = await seed(args, rng)
+    seed_sec = time.perf_counter() - started
+
+    from src.core.db import engine
+    from src.core.logger import logger
+    from src.main import create_app
+
+    logger.setLevel(args.app_log_level)
+    managers = round(args.concurrency * args.manager_share)
+    # Копии учетных записей: у каждого виртуального пользователя свой токен.
+    accounts = [
+        Account(manager.login, manager.managed_cafe_id)
+        for manager in (
+            dataset.managers[index % len(dataset.managers)]
+            for index in range(managers)
+        )
+    ] + [
+        Account(dataset.accounts[index % len(dataset.accounts)].login)
+        for index in range(args.concurrency - managers)
+    ]
+    app = create_app()
+    recorder = Recorder()
+    budget = [args.requests]
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url='http://bench/api/v1',
+            ) as client:
+                started = time.perf_counter()
+                await asyncio.gather(*(
+                    virtual_user(
+                        client, recorder, dataset, account, weights, budget,
+                        random.Random(args.seed + index),
+                    )
+                    for index, account in enumerate(accounts)
+                ))
+                elapsed = time.perf_counter() - started
+    finally:
+        await engine.dispose()
+    return {
+        'meta': {
+            'revision': git_revision(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'database': engine.dialect.name,
+            'seed_sec': round(seed_sec, 3),
+            'dataset': {
+                name: getattr(args, name)
+                for name in (
+                    'cafes', 'tables', 'slots', 'days', 'dishes', 'users',
+                    'bookings',
+                )
+            },
+            'concurrency': args.concurrency,
+            'manager_share': args.manager_share,
+            'mix': weights,
+            'seed': args.seed,
+        },
+        **summarize(recorder, elapsed),
+    }
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    args = parse_args()
+    temp_path = configure_environment(args)
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        if temp_path is not None:
+            os.remove(temp_path)
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
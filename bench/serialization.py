@@ -0,0 +1,133 @@
+"""Бенчмарк сериализации списка бронирований.
+
+Сравнивает стандартный путь FastAPI (response_model + jsonable_encoder +
+json.dumps) с быстрым путем через заранее собранный TypeAdapter.
+
+Запуск::
+
+    python -m bench.serialization --rows 1000 5000 --repeat 5
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, datetime
+from datetime import time as time_type
+from types import SimpleNamespace
+from typing import Any, Callable, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.core.serialization import dump_json
+from src.schemas.booking import Booking, BookingListAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson необязателен
+    orjson = None
+
+
+def make_rows(count: int) -> list[SimpleNamespace]:
+    """Создает синтетические бронирования в форме ORM-объектов."""
+    now = datetime(2025, 1, 1, 12, 0)
+    manager = SimpleNamespace(
+        id=1, username='manager', phone='+79990000001',
+        active=True, email='manager@example.com',
+    )
+    cafe = SimpleNamespace(
+        id=1, name='Кафе', address='Адрес', phone='+79990000000',
+        description='Описание', photo=None, latitude=55.75,
+        longitude=37.62, active=True, managers=[manager],
+    )
+    rows = []
+    for idx in range(count):
+        user = SimpleNamespace(
+            id=idx, username=f'user{idx}', phone=f'+7999{idx:07d}',
+            active=True, email=None,
+        )
+        table = SimpleNamespace(
+            id=idx % 20 + 1, cafe=cafe, seats_number=4,
+            description=None, active=True,
+        )
+        slot = SimpleNamespace(
+            id=idx % 10 + 1, cafe=cafe, date=date(2025, 1, 2),
+            start_time=time_type(12, 0), end_time=time_type(13, 0),
+            description=None, active=True,
+        )
+        dish = SimpleNamespace(
+            id=idx % 5 + 1, cafe_id=1, cafe=cafe, name='Суп',
+            description='Горячий', price=300, photo=None, active=True,
+            created_at=now, updated_at=now, version=1,
+        )
+        rows.append(SimpleNamespace(
+            id=idx, user=user, cafe=cafe, tables=[table], slots=[slot],
+            menu=[dish], guests_number=2, status=0, active=True,
+            note=None, created_at=now, updated_at=now, version=1,
+        ))
+    return rows
+
+
+def fastapi_default(rows: list[Any]) -> bytes:
+    """Повторяет обработку ответа FastAPI при заданном response_model."""
+    field = create_model_field('response', List[Booking])
+    content = asyncio.run(
+        serialize_response(field=field, response_content=rows),
+    )
+    return JSONResponse(content).body
+
+
+def type_adapter(rows: list[Any]) -> bytes:
+    """Быстрый путь через TypeAdapter.dump_json."""
+    return dump_json(BookingListAdapter, rows)
+
+
+def type_adapter_orjson(rows: list[Any]) -> bytes:
+    """TypeAdapter для валидации и orjson для кодирования."""
+    value = BookingListAdapter.validate_python(rows, from_attributes=True)
+    return orjson.dumps(BookingListAdapter.dump_python(value, mode='json'))
+
+
+def measure(
+    func: Callable[[list[Any]], bytes],
+    rows: list[Any],
+    repeat: int,
+) -> float:
+    """Возвращает лучшую скорость в строках в секунду."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(rows)
+        best = min(best, time.perf_counter() - started)
+    return len(rows) / best
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    variants = {
+        'fastapi_default': fastapi_default,
+        'type_adapter': type_adapter,
+    }
+    if orjson is not None:
+        variants['type_adapter_orjson'] = type_adapter_orjson
+
+    for count in args.rows:
+        rows = make_rows(count)
+        assert json.loads(fastapi_default(rows)) == json.loads(
+            type_adapter(rows))
+        for name, func in variants.items():
+            print(json.dumps({
+                'variant': name,
+                'rows': count,
+                'rows_per_sec': round(measure(func, rows, args.repeat)),
+            }))
+
+
+if __name__ == '__main__':
+    main()
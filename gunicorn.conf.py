@@ -0,0 +1,25 @@
+"""Настройки gunicorn: несколько воркеров uvicorn на одном хосте.
+
+Запуск::
+
+    WEB_CONCURRENCY=4 gunicorn
+
+Плавный перезапуск без потери запросов - SIGHUP мастеру: gunicorn
+поднимает новые воркеры (они принимают соединения только после
+прогрева в lifespan) и останавливает старые, которые дожидаются
+текущих запросов. Пул соединений воркера считается из
+DB_MAX_CONNECTIONS и WEB_CONCURRENCY (src.core.db.pool_options).
+"""
+from src.core.config import settings
+
+wsgi_app = 'src.main:create_app()'
+worker_class = 'src.core.serving.AppWorker'
+workers = settings.web_concurrency
+bind = '0.0.0.0:8000'
+# Приложение и пул создаются в каждом воркере после fork:
+# соединения с базой нельзя делить между процессами.
+preload_app = False
+graceful_timeout = settings.graceful_timeout_sec
+timeout = 60
+keepalive = 5
+accesslog = '-'
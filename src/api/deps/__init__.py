@@ -4,3 +4,4 @@ from .access import (  # noqa
     can_view_inactive_booking,
     can_edit_booking,
 )
+from .headers import get_if_match  # noqa
@@ -1,3 +1,4 @@
+from src.core.access import AccessScope
 from src.core.exceptions import PermissionDeniedError
 from src.models import BookingModel, BookingStatus, User
 
@@ -7,11 +8,7 @@ def can_view_inactive(
     current_user: User,
 ) -> bool:
     """Возвращает True если админ или менеджер кафе."""
-    if current_user.is_superuser:
-        return True
-    if cafe_id is not None:
-        return cafe_id in current_user.managed_cafe_ids
-    return bool(current_user.managed_cafe_ids)
+    return AccessScope(current_user).can_view_inactive(cafe_id)
 
 
 def require_manager_or_admin(
@@ -19,8 +16,7 @@ def require_manager_or_admin(
     current_user: User,
 ) -> None:
     """Проверка прав текущего пользователя на управление указанным кафе."""
-    if (not current_user.is_superuser
-       and cafe_id not in current_user.managed_cafe_ids):
+    if not AccessScope(current_user).can_manage(cafe_id):
         raise PermissionDeniedError
 
 
@@ -29,19 +25,16 @@ def can_view_inactive_booking(
     user: User,
 ) -> bool:
     """Проверяет доступ к неактивным бронированиям."""
-    return (user.is_superuser or booking.cafe_id in
-            user.managed_cafe_ids or booking.user_id == user.id)
+    return (booking.user_id == user.id
+            or AccessScope(user).can_manage(booking.cafe_id))
 
 
 def can_edit_booking(booking: BookingModel, user: User) -> bool:
     """Определяет, может ли пользователь редактировать бронирование."""
     if booking.user_id == user.id:
-        return booking.active and booking.status != BookingStatus.CANCELLED
+        return booking.active and booking.status not in (
+            BookingStatus.CANCELLED,
+            BookingStatus.COMPLETED,
+        )
 
-    if user.is_superuser:
-        return True
-
-    if booking.cafe_id in user.managed_cafe_ids:
-        return True
-
-    return False
+    return AccessScope(user).can_manage(booking.cafe_id)
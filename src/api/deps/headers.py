@@ -0,0 +1,14 @@
+from typing import Optional
+
+from fastapi import Header
+
+
+def get_if_match(
+    if_match: Optional[str] = Header(
+        None,
+        alias='If-Match',
+        description='Ожидаемая версия объекта, например "3"',
+    ),
+) -> Optional[str]:
+    """Заголовок If-Match для оптимистической блокировки."""
+    return if_match
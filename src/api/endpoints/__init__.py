@@ -4,5 +4,12 @@ from .dish import router as dish_router  # noqa
 from .table import router as table_router  # noqa
 from .user import router as user_router  # noqa
 from .slot import router as slot_router # noqa
+from .slot_template import router as slot_template_router # noqa
 from .action import router as action_router # noqa
 from .booking import router as booking_router # noqa
+from .stats import router as stats_router # noqa
+from .availability import router as availability_router # noqa
+from .search import router as search_router # noqa
+from .profile import router as profile_router # noqa
+from .health import router as health_router # noqa
+from .statement_cache import router as statement_cache_router # noqa
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.deps import can_view_inactive, require_manager_or_admin
 from src.api.validators import cafe_exists, get_action_or_404, get_cafe_or_404
+from src.core.access import AccessScope
 from src.core.auth import get_current_user
 from src.core.db import get_async_session
 from src.core.exceptions import ResourceNotFoundError
@@ -35,15 +36,14 @@ async def get_actions(
     if cafe_id is not None:
         cafe = await get_cafe_or_404(cafe_id=cafe_id, session=session)
 
-    has_permission_for_inactive = can_view_inactive(cafe_id, current_user)
-
-    active_only = not (show_all is True and has_permission_for_inactive)
+    scope = AccessScope(current_user)
+    active_only = not (show_all is True and scope.can_view_inactive(cafe_id))
 
     actions = await action_crud.get_actions_with_access_control(
         session=session,
         cafe=cafe,
         active_only=active_only,
-        current_user=current_user,
+        scope=scope,
     )
 
     logger.info(
@@ -0,0 +1,157 @@
+import asyncio
+import json
+from contextlib import aclosing
+from datetime import date
+from typing import Any, AsyncIterator, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    WebSocketException,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.deps import can_view_inactive
+from src.api.validators import cafe_exists, cafe_exists_and_active
+from src.core.auth import get_current_user, get_websocket_user
+from src.core.constants import REALTIME_HEARTBEAT_SEC
+from src.core.db import AsyncSessionLocal, get_async_session
+from src.core.exceptions import AppException
+from src.core.logger import log_request, logger
+from src.core.realtime import availability_hub
+from src.crud.booking import booking_crud
+from src.models import User
+
+router = APIRouter(
+    prefix='/cafe/{cafe_id}/availability',
+    tags=['Занятость'],
+)
+
+
+async def _check_cafe(
+    cafe_id: int,
+    user: User,
+    session: AsyncSession,
+) -> None:
+    """Неактивное кафе доступно только менеджеру и администратору."""
+    if can_view_inactive(cafe_id, user):
+        await cafe_exists(cafe_id, session)
+    else:
+        await cafe_exists_and_active(cafe_id, session)
+
+
+async def _availability_events(
+    cafe_id: int,
+    day: date,
+) -> AsyncIterator[Optional[dict[str, Any]]]:
+    """Снимок занятости, затем изменения; None означает heartbeat.
+
+    Подписка оформляется до чтения снимка, чтобы не потерять изменения
+    между ними. Сессия открывается только на время снимка.
+    """
+    async with availability_hub.subscribe(cafe_id, day) as subscription:
+        async with AsyncSessionLocal() as session:
+            pairs = await booking_crud.get_occupied_pairs(
+                session, cafe_id, day,
+            )
+        yield {
+            'type': 'snapshot',
+            'cafe_id': cafe_id,
+            'date': day.isoformat(),
+            'occupied': pairs,
+        }
+        while True:
+            try:
+                yield await asyncio.wait_for(
+                    subscription.get(), REALTIME_HEARTBEAT_SEC,
+                )
+            except asyncio.TimeoutError:
+                yield None
+
+
+@log_request()
+@router.websocket('/ws')
+async def availability_ws(
+    websocket: WebSocket,
+    cafe_id: int,
+    day: date = Query(..., alias='date', description='Дата'),
+    user: User = Depends(get_websocket_user),
+    session: AsyncSession = Depends(get_async_session),
+) -> None:
+    """Занятость столов кафе на дату через WebSocket.
+
+    Первое сообщение - снимок занятых пар (слот, стол), дальше приходят
+    изменения occupancy, resync при переполнении очереди и ping.
+    """
+    try:
+        await _check_cafe(cafe_id, user, session)
+    except AppException as error:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION,
+            reason=error.detail,
+        )
+    # Соединение живет долго, держать сессию из зависимости незачем.
+    await session.close()
+    await websocket.accept()
+    logger.info(
+        'Подписка на занятость по WebSocket',
+        username=user.username,
+        user_id=user.id,
+        details={'cafe_id': cafe_id, 'date': day},
+    )
+    events = _availability_events(cafe_id, day)
+    try:
+        async with aclosing(events):
+            async for event in events:
+                await websocket.send_json(event or {'type': 'ping'})
+    except WebSocketDisconnect:
+        pass
+
+
+async def _sse(cafe_id: int, day: date) -> AsyncIterator[str]:
+    """Кодирует события занятости в формат Server-Sent Events."""
+    events = _availability_events(cafe_id, day)
+    async with aclosing(events):
+        async for event in events:
+            if event is None:
+                yield ': ping\n\n'
+            else:
+                yield (
+                    f"event: {event['type']}\n"
+                    f'data: {json.dumps(event)}\n\n'
+                )
+
+
+@log_request()
+@router.get(
+    '/sse',
+    response_class=StreamingResponse,
+    summary='Подписка на занятость столов кафе на дату (SSE)',
+)
+async def availability_sse(
+    cafe_id: int,
+    day: date = Query(..., alias='date', description='Дата'),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Занятость столов кафе на дату через Server-Sent Events.
+
+    События те же, что и в WebSocket, тип события передается в поле event.
+    """
+    await _check_cafe(cafe_id, current_user, session)
+    logger.info(
+        'Подписка на занятость по SSE',
+        username=current_user.username,
+        user_id=current_user.id,
+        details={'cafe_id': cafe_id, 'date': day},
+    )
+    return StreamingResponse(
+        _sse(cafe_id, day),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
@@ -1,32 +1,69 @@
-from typing import List, Optional
+from datetime import date, timedelta
+from http import HTTPStatus
+from itertools import product
+from typing import AsyncIterator, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, Header, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from src.api.deps import can_edit_booking, can_view_inactive_booking
+from src.api.deps import (
+    can_edit_booking,
+    can_view_inactive_booking,
+    get_if_match,
+    require_manager_or_admin,
+)
 from src.api.validators import (
+    cafe_exists,
     cafe_exists_and_active,
+    check_batch_item,
+    check_version,
     validate_dish_for_booking,
     validate_slot_for_booking,
     validate_table_for_booking,
 )
+from src.core.access import AccessScope
 from src.core.auth import get_current_user
-from src.core.db import get_async_session
+from src.core.config import settings
+from src.core.constants import IDEMPOTENCY_KEY_MAX_LENGTH
+from src.core.db import AsyncSessionLocal, get_async_session
 from src.core.exceptions import (
+    AppException,
     ConflictError,
     PermissionDeniedError,
     ResourceNotFoundError,
 )
+from src.core.export import EXPORT_MEDIA_TYPES, iter_csv, iter_ndjson
+from src.core.idempotency import IDEMPOTENCY_HEADER, run_idempotent
 from src.core.logger import log_request, logger
+from src.core.serialization import fast_json_response
+from src.crud.archive import archive_crud
 from src.crud.booking import CRUDBooking
+from src.crud.hold import hold_crud
+from src.crud.slot import time_slot_crud
 from src.models import BookingModel, User
-from src.schemas.booking import Booking, BookingCreate, BookingUpdate
+from src.models.archive import bookingmodel_archive_table
+from src.schemas.booking import (
+    Booking,
+    BookingArchived,
+    BookingBatchCreate,
+    BookingBatchItem,
+    BookingBatchItemResult,
+    BookingBatchResult,
+    BookingCreate,
+    BookingExport,
+    BookingHold,
+    BookingHoldCreate,
+    BookingListAdapter,
+    BookingUpdate,
+)
 
 router = APIRouter(prefix='/booking', tags=['Бронирование'])
 crud_booking = CRUDBooking()
 
+HELD_DETAIL = 'Выбранные столы или время удерживаются другим пользователем'
+TAKEN_DETAIL = 'Выбранные столы или время уже заняты'
+
 
 @log_request()
 @router.get(
@@ -52,54 +89,437 @@ async def get_bookings(
     session: AsyncSession = Depends(get_async_session),
 ) -> List[Booking]:
     """Получить список бронирований."""
-    if not (user.is_superuser or user.managed_cafe_ids):
+    scope = AccessScope(user)
+    if not scope.is_staff:
         raise PermissionDeniedError()
+    if cafe_id is not None and not scope.can_manage(cafe_id):
+        raise PermissionDeniedError()
+
+    bookings = await crud_booking.get_multi_filtered(
+        session,
+        scope,
+        cafe_id=cafe_id,
+        user_id=user_id,
+        active_only=not show_all,
+    )
+
+    logger.info(
+        'Получен список бронирований',
+        username=user.username,
+        user_id=user.id,
+        details={
+            'count': len(bookings),
+            'cafe_id': cafe_id,
+            'user_id': user_id,
+            'show_all': show_all
+        },
+    )
+    if settings.fast_json_response:
+        return fast_json_response(BookingListAdapter, bookings)
+    return bookings
+
+
+async def _export_bookings(
+    export_format: str,
+    cafe_id: int,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    active_only: bool,
+) -> AsyncIterator[bytes | str]:
+    """Стримит выгрузку в собственной сессии.
+
+    Сессия из зависимости закрывается до отправки тела ответа,
+    поэтому курсор открывается здесь.
+    """
+    encoder = iter_csv if export_format == 'csv' else iter_ndjson
+    async with AsyncSessionLocal() as session:
+        batches = crud_booking.stream_for_export(
+            session,
+            cafe_id,
+            date_from=date_from,
+            date_to=date_to,
+            active_only=active_only,
+        )
+        async for chunk in encoder(BookingExport, batches):
+            yield chunk
 
-    stmt = (
-        select(BookingModel)
-        .options(
-            selectinload(BookingModel.user),
-            selectinload(BookingModel.cafe),
-            selectinload(BookingModel.tables),
-            selectinload(BookingModel.slots),
-            selectinload(BookingModel.menu),
+
+@log_request()
+@router.get(
+    '/export',
+    response_class=StreamingResponse,
+    summary='Выгрузить бронирования кафе',
+    description='Потоковая выгрузка бронирований кафе в NDJSON или CSV '
+                '(только для администратора и менеджера)',
+)
+async def export_bookings(
+    cafe_id: int = Query(..., description='ID кафе'),
+    date_from: Optional[date] = Query(
+        None,
+        description='Дата бронирования с (включительно)',
+    ),
+    date_to: Optional[date] = Query(
+        None,
+        description='Дата бронирования по (включительно)',
+    ),
+    export_format: Literal['ndjson', 'csv'] = Query(
+        'ndjson',
+        alias='format',
+        description='Формат выгрузки',
+    ),
+    show_all: bool = Query(
+        False,
+        description='Включить неактивные бронирования',
+    ),
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+) -> StreamingResponse:
+    """Выгрузить бронирования кафе."""
+    await cafe_exists(cafe_id, session)
+    require_manager_or_admin(cafe_id, user)
+    if date_from and date_to and date_from > date_to:
+        raise AppException(
+            detail='Дата начала периода позже даты окончания',
         )
+
+    logger.info(
+        'Запущена выгрузка бронирований',
+        username=user.username,
+        user_id=user.id,
+        details={
+            'cafe_id': cafe_id,
+            'date_from': date_from,
+            'date_to': date_to,
+            'format': export_format,
+        },
+    )
+    filename = f'bookings_cafe_{cafe_id}.{export_format}'
+    return StreamingResponse(
+        _export_bookings(
+            export_format,
+            cafe_id,
+            date_from,
+            date_to,
+            active_only=not show_all,
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+        },
     )
 
-    if cafe_id is not None:
-        if user.is_superuser:
-            stmt = stmt.where(BookingModel.cafe_id == cafe_id)
-        else:
-            if cafe_id not in user.managed_cafe_ids:
-                raise PermissionDeniedError()
-            stmt = stmt.where(BookingModel.cafe_id == cafe_id)
-    else:
-        if not user.is_superuser:
-            stmt = stmt.where(BookingModel.cafe_id.in_(user.managed_cafe_ids))
 
-    if user_id is not None:
-        stmt = stmt.where(BookingModel.user_id == user_id)
+@log_request()
+@router.get(
+    '/archive',
+    response_model=List[BookingArchived],
+    summary='Получить архивные бронирования',
+    description='Бронирования, перенесенные в архив по сроку хранения '
+                '(только для администратора и менеджера)',
+)
+async def get_archived_bookings(
+    cafe_id: Optional[int] = Query(
+        None,
+        description='Показать бронирования в кафе',
+    ),
+    user_id: Optional[int] = Query(
+        None,
+        description='Показать бронирования пользователя',
+    ),
+    date_from: Optional[date] = Query(
+        None,
+        description='Дата бронирования с (включительно)',
+    ),
+    date_to: Optional[date] = Query(
+        None,
+        description='Дата бронирования по (включительно)',
+    ),
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+) -> List[BookingArchived]:
+    """Получить архивные бронирования."""
+    scope = AccessScope(user)
+    if not scope.is_staff:
+        raise PermissionDeniedError()
 
-    if not show_all:
-        stmt = stmt.where(BookingModel.active.is_(True))
+    archive = bookingmodel_archive_table
+    criteria = []
+    if cafe_id is not None:
+        require_manager_or_admin(cafe_id, user)
+        criteria.append(archive.c.cafe_id == cafe_id)
+    elif not scope.is_admin:
+        criteria.append(scope.manages(archive.c.cafe_id))
+    if user_id is not None:
+        criteria.append(archive.c.user_id == user_id)
+    if date_from is not None:
+        criteria.append(archive.c.booking_date >= date_from)
+    if date_to is not None:
+        criteria.append(archive.c.booking_date <= date_to)
 
-    result = await session.execute(stmt)
-    bookings = list(result.scalars().all())
+    bookings = await archive_crud.get_bookings(session, *criteria)
 
     logger.info(
-        'Получен список бронирований',
+        'Получен список архивных бронирований',
         username=user.username,
         user_id=user.id,
         details={
             'count': len(bookings),
             'cafe_id': cafe_id,
             'user_id': user_id,
-            'show_all': show_all
         },
     )
     return bookings
 
 
+@log_request()
+@router.post(
+    '/holds',
+    response_model=BookingHold,
+    status_code=status.HTTP_201_CREATED,
+    summary='Удержать столы и слоты',
+    description='Временно удержать столы и слоты на время оформления '
+                'бронирования, удержание истекает само',
+)
+async def create_hold(
+    hold_in: BookingHoldCreate,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+) -> BookingHold:
+    """Удержать столы и слоты."""
+    if await hold_crud.held_by_others(user.id, hold_in.tables, hold_in.slots):
+        raise ConflictError(detail=HELD_DETAIL)
+    await cafe_exists_and_active(hold_in.cafe_id, session)
+    await validate_table_for_booking(
+        hold_in.tables,
+        hold_in.cafe_id,
+        hold_in.guests_number,
+        session,
+    )
+    booking_date = await validate_slot_for_booking(
+        hold_in.slots,
+        hold_in.cafe_id,
+        session,
+    )
+    if await crud_booking.check_booking_conflicts(
+        session,
+        hold_in.cafe_id,
+        hold_in.tables,
+        hold_in.slots,
+        booking_date,
+    ):
+        raise ConflictError(detail=TAKEN_DETAIL)
+
+    hold = await hold_crud.create(
+        hold_in.cafe_id,
+        user.id,
+        hold_in.tables,
+        hold_in.slots,
+    )
+    if hold is None:
+        raise ConflictError(detail=HELD_DETAIL)
+
+    logger.info(
+        'Созданы удержания столов',
+        username=user.username,
+        user_id=user.id,
+        details={
+            'hold_id': hold['id'],
+            'cafe_id': hold_in.cafe_id,
+            'tables_count': len(hold_in.tables),
+            'slots_count': len(hold_in.slots),
+        },
+    )
+    return hold
+
+
+@log_request()
+@router.delete(
+    '/holds/{hold_id}',
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary='Снять удержание',
+    description='Досрочно снять удержание столов и слотов',
+)
+async def delete_hold(
+    hold_id: str,
+    user: User = Depends(get_current_user),
+) -> None:
+    """Снять удержание."""
+    hold = await hold_crud.get(hold_id)
+    if hold is None:
+        raise ResourceNotFoundError(resource_name='Удержание')
+    if hold['user_id'] != user.id and not user.is_superuser:
+        raise PermissionDeniedError()
+    await hold_crud.remove(hold)
+    logger.info(
+        'Снято удержание столов',
+        username=user.username,
+        user_id=user.id,
+        details={'hold_id': hold_id},
+    )
+
+
+async def _recurring_items(
+    batch_in: BookingBatchCreate,
+    session: AsyncSession,
+) -> tuple[list[BookingBatchItem], dict[int, AppException]]:
+    """Разворачивает правило повторения в элементы пакета.
+
+    Слоты всех дат ищутся одним запросом, даты без слота с нужным
+    временем сразу попадают в ошибки.
+    """
+    rule = batch_in.recurrence
+    dates = [
+        rule.start_date + timedelta(days=rule.interval_days * index)
+        for index in range(rule.count)
+    ]
+    slot_ids = await time_slot_crud.get_ids_by_time(
+        session,
+        batch_in.cafe_id,
+        dates,
+        rule.start_time,
+        rule.end_time,
+    )
+    items, errors = [], {}
+    for index, day in enumerate(dates):
+        if day not in slot_ids:
+            errors[index] = AppException(
+                status_code=HTTPStatus.NOT_FOUND,
+                detail=f'Слот на {day.isoformat()} не найден',
+                code='not_found',
+            )
+        items.append(BookingBatchItem(
+            guests_number=rule.guests_number,
+            tables=rule.tables,
+            slots=[slot_ids[day]] if day in slot_ids else [],
+            menu=rule.menu,
+            note=rule.note,
+        ))
+    return items, errors
+
+
+def _batch_results(
+    count: int,
+    created: dict[int, BookingModel],
+    errors: dict[int, AppException],
+) -> list[BookingBatchItemResult]:
+    """Результаты по элементам пакета в исходном порядке."""
+    results = []
+    for index in range(count):
+        if index in created:
+            results.append(BookingBatchItemResult(
+                index=index,
+                status_code=HTTPStatus.CREATED,
+                booking_id=created[index].id,
+                booking_date=created[index].booking_date,
+            ))
+        elif index in errors:
+            results.append(BookingBatchItemResult(
+                index=index,
+                status_code=errors[index].status_code,
+                detail=errors[index].detail,
+            ))
+        else:
+            results.append(BookingBatchItemResult(
+                index=index,
+                status_code=HTTPStatus.FAILED_DEPENDENCY,
+                detail='Пакет отклонен из-за ошибок в других элементах',
+            ))
+    return results
+
+
+@log_request()
+@router.post(
+    '/batch',
+    response_model=BookingBatchResult,
+    summary='Создать пакет бронирований',
+    description='Создать несколько бронирований в кафе по списку '
+                'или правилу повторения. В режиме atomic при ошибке '
+                'в любом элементе не создается ни одно бронирование',
+)
+async def create_booking_batch(
+    batch_in: BookingBatchCreate,
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+) -> BookingBatchResult:
+    """Создать пакет бронирований.
+
+    Столы, слоты, блюда и занятость проверяются для всего пакета
+    несколькими запросами, а не цепочкой запросов на каждый элемент.
+    """
+    cafe_id = batch_in.cafe_id
+    await cafe_exists_and_active(cafe_id, session)
+    if batch_in.recurrence is not None:
+        items, errors = await _recurring_items(batch_in, session)
+    else:
+        items, errors = batch_in.items, {}
+
+    table_ids = {table_id for item in items for table_id in item.tables}
+    slot_ids = {slot_id for item in items for slot_id in item.slots}
+    dish_ids = {dish_id for item in items for dish_id in item.menu}
+    tables, slots, dishes = await crud_booking.get_batch_refs(
+        session, cafe_id, table_ids, slot_ids, dish_ids,
+    )
+    dates = {}
+    for index, item in enumerate(items):
+        if index in errors:
+            continue
+        try:
+            dates[index] = check_batch_item(item, tables, slots, dishes)
+        except AppException as error:
+            errors[index] = error
+
+    held = await hold_crud.get_held_pairs(user.id, table_ids, slot_ids)
+    taken = await crud_booking.get_taken_pairs(
+        session, cafe_id, set(dates.values()), table_ids, slot_ids,
+    )
+    for index in dates:
+        pairs = set(product(items[index].slots, items[index].tables))
+        if pairs & held:
+            errors[index] = ConflictError(detail=HELD_DETAIL)
+        elif pairs & taken:
+            errors[index] = ConflictError(detail=TAKEN_DETAIL)
+        else:
+            taken |= pairs
+
+    valid = [] if batch_in.atomic and errors else [
+        index for index in dates if index not in errors
+    ]
+    bookings = await crud_booking.create_many(
+        session,
+        [
+            {
+                **items[index].model_dump(),
+                'cafe_id': cafe_id,
+                'user_id': user.id,
+                'booking_date': dates[index],
+            }
+            for index in valid
+        ],
+    )
+    created = dict(zip(valid, bookings))
+    for index in created:
+        await hold_crud.release_user_pairs(
+            user.id, items[index].tables, items[index].slots,
+        )
+
+    logger.info(
+        'Создан пакет бронирований',
+        username=user.username,
+        user_id=user.id,
+        details={
+            'cafe_id': cafe_id,
+            'items': len(items),
+            'created': len(created),
+            'atomic': batch_in.atomic,
+        },
+    )
+    return BookingBatchResult(
+        created=len(created),
+        failed=len(items) - len(created),
+        items=_batch_results(len(items), created, errors),
+    )
+
+
 @log_request()
 @router.get(
     '/{booking_id}',
@@ -132,20 +552,16 @@ async def get_booking(
     return booking
 
 
-@log_request()
-@router.post(
-    '',
-    response_model=Booking,
-    status_code=status.HTTP_201_CREATED,
-    summary='Создать новое бронирование',
-    description='Создать новое бронирование стола',
-)
-async def create_booking(
+async def _create_booking(
     booking_in: BookingCreate,
-    user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_async_session),
-) -> Booking:
-    """Создать бронирование."""
+    user: User,
+    session: AsyncSession,
+) -> BookingModel:
+    """Проверяет и создает бронирование."""
+    if await hold_crud.held_by_others(
+        user.id, booking_in.tables, booking_in.slots,
+    ):
+        raise ConflictError(detail=HELD_DETAIL)
     await cafe_exists_and_active(
         booking_in.cafe_id,
         session,
@@ -176,7 +592,7 @@ async def create_booking(
 
     if has_conflict:
         raise ConflictError(
-            detail='Выбранные столы или время уже заняты',
+            detail=TAKEN_DETAIL,
         )
 
     booking_data = booking_in.model_dump()
@@ -184,6 +600,9 @@ async def create_booking(
     booking_data['booking_date'] = booking_date
 
     booking = await crud_booking.create(booking_data, session)
+    await hold_crud.release_user_pairs(
+        user.id, booking_in.tables, booking_in.slots,
+    )
 
     logger.info(
         'Создано бронирование',
@@ -201,19 +620,45 @@ async def create_booking(
 
 
 @log_request()
-@router.patch(
-    '/{booking_id}',
+@router.post(
+    '',
     response_model=Booking,
-    summary='Обновить бронирование',
-    description='Обновить информацию о бронировании',
+    status_code=status.HTTP_201_CREATED,
+    summary='Создать новое бронирование',
+    description='Создать новое бронирование стола. Повтор запроса '
+                'с тем же заголовком Idempotency-Key возвращает '
+                'сохраненный ответ',
 )
-async def update_booking(
-    booking_id: int,
-    booking_in: BookingUpdate,
+async def create_booking(
+    booking_in: BookingCreate,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias=IDEMPOTENCY_HEADER,
+        max_length=IDEMPOTENCY_KEY_MAX_LENGTH,
+        description='Ключ идемпотентности запроса',
+    ),
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_async_session),
 ) -> Booking:
-    """Обновить бронирование."""
+    """Создать бронирование."""
+    return await run_idempotent(
+        idempotency_key,
+        f'{user.id}:create_booking',
+        booking_in,
+        lambda: _create_booking(booking_in, user, session),
+        Booking,
+        status.HTTP_201_CREATED,
+    )
+
+
+async def _update_booking(
+    booking_id: int,
+    booking_in: BookingUpdate,
+    if_match: Optional[str],
+    user: User,
+    session: AsyncSession,
+) -> BookingModel:
+    """Проверяет и обновляет бронирование."""
     booking = await crud_booking.get_with_relations(booking_id, session)
 
     if not booking:
@@ -225,6 +670,7 @@ async def update_booking(
         raise PermissionDeniedError(
             detail='Недостаточно прав для редактирования этого бронирования',
         )
+    check_version(booking, booking_in.version, if_match)
 
     update_data = booking_in.model_dump(exclude_unset=True)
     await cafe_exists_and_active(
@@ -265,6 +711,8 @@ async def update_booking(
         k in update_data for k in ('tables', 'slots')
     )
     if field_changed:
+        if await hold_crud.held_by_others(user.id, tables_ids, slots_ids):
+            raise ConflictError(detail=HELD_DETAIL)
         has_conflict = await crud_booking.check_booking_conflicts(
             session,
             booking.cafe_id,
@@ -276,10 +724,12 @@ async def update_booking(
 
         if has_conflict:
             raise ConflictError(
-                detail='Выбранные столы или время уже заняты',
+                detail=TAKEN_DETAIL,
             )
 
     updated_booking = await crud_booking.update(booking, booking_in, session)
+    if field_changed:
+        await hold_crud.release_user_pairs(user.id, tables_ids, slots_ids)
 
     logger.info(
         'Обновлено бронирование',
@@ -291,3 +741,37 @@ async def update_booking(
         },
     )
     return updated_booking
+
+
+@log_request()
+@router.patch(
+    '/{booking_id}',
+    response_model=Booking,
+    summary='Обновить бронирование',
+    description='Обновить информацию о бронировании. Повтор запроса '
+                'с тем же заголовком Idempotency-Key возвращает '
+                'сохраненный ответ',
+)
+async def update_booking(
+    booking_id: int,
+    booking_in: BookingUpdate,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias=IDEMPOTENCY_HEADER,
+        max_length=IDEMPOTENCY_KEY_MAX_LENGTH,
+        description='Ключ идемпотентности запроса',
+    ),
+    if_match: Optional[str] = Depends(get_if_match),
+    user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+) -> Booking:
+    """Обновить бронирование."""
+    return await run_idempotent(
+        idempotency_key,
+        f'{user.id}:update_booking:{booking_id}',
+        booking_in,
+        lambda: _update_booking(
+            booking_id, booking_in, if_match, user, session,
+        ),
+        Booking,
+    )
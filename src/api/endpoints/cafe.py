@@ -1,17 +1,34 @@
+from datetime import date, time
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from src.api.validators import check_cafe_name_duplicate
+from src.api.deps import get_if_match
+from src.api.validators import check_cafe_name_duplicate, check_version
 from src.core.auth import get_current_user, require_admin
+from src.core.constants import (
+    DEFAULT_NEARBY_LIMIT,
+    DEFAULT_NEARBY_RADIUS_KM,
+    MAX_NEARBY_LIMIT,
+    MAX_NEARBY_RADIUS_KM,
+)
 from src.core.db import get_async_session
 from src.core.exceptions import PermissionDeniedError, ResourceNotFoundError
 from src.core.logger import log_request, logger
+from src.crud.booking import booking_crud
 from src.crud.cafe import cafe_crud
 from src.models.cafe import Cafe as CafeModel
 from src.models.user import User
-from src.schemas.cafe import CafeCreate, CafeRead, CafeUpdate
+from src.schemas.cafe import (
+    CafeCreate,
+    CafeNearby,
+    CafeRead,
+    CafeShort,
+    CafeUpdate,
+)
 
 router = APIRouter(prefix='/cafes', tags=["Кафе"])
 
@@ -91,6 +108,76 @@ async def list_cafes(
     return cafes
 
 
+@log_request()
+@router.get(
+    '/nearby',
+    response_model=list[CafeNearby],
+    status_code=status.HTTP_200_OK,
+    summary='Активные кафе рядом с точкой, ближайшие первыми',
+)
+async def list_nearby_cafes(
+    lat: float = Query(..., ge=-90, le=90, description='Широта'),
+    lon: float = Query(..., ge=-180, le=180, description='Долгота'),
+    radius_km: float = Query(
+        DEFAULT_NEARBY_RADIUS_KM,
+        gt=0,
+        le=MAX_NEARBY_RADIUS_KM,
+        description='Радиус поиска, км',
+    ),
+    limit: int = Query(DEFAULT_NEARBY_LIMIT, ge=1, le=MAX_NEARBY_LIMIT),
+    day: Optional[date] = Query(
+        None,
+        alias='date',
+        description='Только кафе со свободным столом на дату',
+    ),
+    time_from: Optional[time] = Query(
+        None,
+        description='Слот начинается не раньше',
+    ),
+    time_to: Optional[time] = Query(
+        None,
+        description='Слот заканчивается не позже',
+    ),
+    guests: int = Query(1, ge=1, description='Количество гостей'),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> list[CafeNearby]:
+    """Кафе в радиусе от точки по возрастанию расстояния.
+
+    С датой остаются только кафе, где есть свободный стол на guests
+    мест в слоте из интервала time_from - time_to.
+    """
+    nearby = await cafe_crud.get_nearby(
+        session, lat, lon, radius_km, None if day else limit,
+    )
+    if day is not None:
+        free = await booking_crud.get_cafes_with_free_tables(
+            session,
+            [cafe_id for _, cafe_id in nearby],
+            day,
+            guests,
+            time_from,
+            time_to,
+        )
+        nearby = [item for item in nearby if item[1] in free][:limit]
+    cafes = await cafe_crud.get_many_with_managers(
+        [cafe_id for _, cafe_id in nearby], session,
+    )
+    logger.info(
+        'Получены кафе рядом с точкой',
+        username=current_user.username,
+        user_id=current_user.id,
+        details={'found': len(nearby), 'date': day},
+    )
+    return [
+        CafeNearby(
+            **CafeShort.model_validate(cafes[cafe_id]).model_dump(),
+            distance_km=round(distance, 3),
+        )
+        for distance, cafe_id in nearby
+    ]
+
+
 @log_request()
 @router.get(
     '/{cafe_id}',
@@ -139,6 +226,7 @@ async def get_cafe(
 async def update_cafe(
         cafe_id: int,
         payload: CafeUpdate,
+        if_match: Optional[str] = Depends(get_if_match),
         session: AsyncSession = Depends(get_async_session),
         current_user: User = Depends(require_admin),
 ) -> CafeRead:
@@ -146,6 +234,7 @@ async def update_cafe(
     cafe = await cafe_crud.get_with_managers(cafe_id, session)
     if not cafe:
         raise ResourceNotFoundError("Кафе")
+    check_version(cafe, payload.version, if_match)
 
         # 2. Обработка фото (base64 → путь)
     update_data = payload.model_dump(exclude_unset=True)
@@ -1,18 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.deps import get_if_match
 from src.api.deps.access import can_view_inactive, require_manager_or_admin
 from src.api.validators import (
     check_dish_name_duplicate,
+    check_version,
     get_cafe_or_404,
     get_dish_or_404,
 )
+from src.core.access import AccessScope
 from src.core.auth import get_current_user
 from src.core.db import get_async_session
+from src.core.importing import (
+    import_request_body,
+    read_import_rows,
+    validate_import_rows,
+)
 from src.core.logger import log_request, logger
 from src.crud.dish import dish_crud
 from src.models import User
 from src.schemas.dish import Dish, DishCreate, DishUpdate
+from src.schemas.importing import ImportSummary
 
 router = APIRouter(prefix='/dishes', tags=['Блюдо'])
 
@@ -37,15 +48,14 @@ async def get_all_dishes(
     if cafe_id is not None:
         cafe = await get_cafe_or_404(cafe_id=cafe_id, session=session)
 
-    has_permission_for_inactive = can_view_inactive(cafe_id, current_user)
-
-    active_only = not (show_all is True and has_permission_for_inactive)
+    scope = AccessScope(current_user)
+    active_only = not (show_all is True and scope.can_view_inactive(cafe_id))
 
     dishes = await dish_crud.get_dishes_with_access_control(
         session=session,
         cafe=cafe,
         active_only=active_only,
-        current_user=current_user,
+        scope=scope,
     )
 
     logger.info(
@@ -99,6 +109,68 @@ async def create_dish(
     return new_dish
 
 
+@log_request()
+@router.post(
+    '/import',
+    response_model=ImportSummary,
+    status_code=status.HTTP_201_CREATED,
+    summary='Массовый импорт блюд из JSON или CSV '
+            '(только для администратора и менеджера)',
+    openapi_extra=import_request_body(DishCreate),
+)
+async def import_dishes(
+        cafe_id: int,
+        request: Request,
+        current_user: User = Depends(get_current_user),
+        session: AsyncSession = Depends(get_async_session),
+) -> ImportSummary:
+    """Импорт меню кафе одним запросом (только для админа/менеджера).
+
+    Поле cafe_id в строках заменяется значением из параметра запроса.
+    Дубли названий проверяются одним запросом к БД и внутри файла,
+    такие строки пропускаются и перечисляются в ответе.
+    """
+    await get_cafe_or_404(cafe_id=cafe_id, session=session)
+    require_manager_or_admin(
+        cafe_id=cafe_id,
+        current_user=current_user,
+    )
+    rows = await read_import_rows(request)
+    valid, skipped = validate_import_rows(
+        DishCreate,
+        [{**row, 'cafe_id': cafe_id} for row in rows],
+    )
+    taken = await dish_crud.get_existing_names(
+        session,
+        cafe_id,
+        (dish.name for _, dish in valid),
+    )
+    dishes = []
+    for number, dish in valid:
+        if dish.name in taken:
+            skipped.append({
+                'row': number,
+                'reason': f'Блюдо «{dish.name}» уже существует',
+            })
+            continue
+        taken.add(dish.name)
+        dishes.append(dish)
+    skipped.sort(key=lambda item: item['row'])
+    created = await dish_crud.bulk_create(session, dishes)
+
+    logger.info(
+        'Импортированы блюда',
+        username=current_user.username,
+        user_id=current_user.id,
+        details={
+            'cafe_id': cafe_id,
+            'created': created,
+            'skipped': len(skipped),
+        },
+    )
+    return ImportSummary(created=created, skipped=skipped)
+
+
 @log_request()
 @router.get(
     '/{dish_id}',
@@ -154,6 +226,7 @@ async def get_dish_by_id(
 async def update_dish(
     dish_id: int,
     new_dish: DishUpdate,
+    if_match: Optional[str] = Depends(get_if_match),
     session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ) -> Dish:
@@ -167,6 +240,7 @@ async def update_dish(
         cafe_id=current_dish.cafe_id,
         current_user=current_user,
     )
+    check_version(current_dish, new_dish.version, if_match)
     new_cafe_id = new_dish.cafe_id
     if new_cafe_id is not None and new_cafe_id != cafe.id:
         cafe = await get_cafe_or_404(cafe_id=new_cafe_id, session=session)
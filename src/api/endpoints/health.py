@@ -0,0 +1,54 @@
+import asyncio
+
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.core.constants import HEALTH_DB_TIMEOUT_SEC
+from src.core.db import AsyncSessionLocal
+from src.schemas.health import HealthStatus
+
+# Без log_request: балансировщик опрашивает пробы каждые несколько секунд.
+router = APIRouter(prefix='/health', tags=['Состояние'])
+
+
+@router.get(
+    '/live',
+    response_model=HealthStatus,
+    summary='Процесс жив',
+)
+async def live() -> HealthStatus:
+    """Отвечает, пока цикл событий воркера работает."""
+    return HealthStatus(status='ok')
+
+
+@router.get(
+    '/ready',
+    response_model=HealthStatus,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {'model': HealthStatus}},
+    summary='Воркер прогрет и база доступна',
+)
+async def ready(request: Request) -> JSONResponse:
+    """Готов ли воркер принимать трафик.
+
+    503, пока идет прогрев или остановка, и если база не ответила
+    за HEALTH_DB_TIMEOUT_SEC секунд.
+    """
+    if not getattr(request.app.state, 'ready', False):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={'status': 'not_ready'},
+        )
+    try:
+        async with AsyncSessionLocal() as session:
+            await asyncio.wait_for(
+                session.execute(text('SELECT 1')),
+                HEALTH_DB_TIMEOUT_SEC,
+            )
+    except (SQLAlchemyError, OSError, asyncio.TimeoutError):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={'status': 'database_unavailable'},
+        )
+    return JSONResponse(content={'status': 'ready'})
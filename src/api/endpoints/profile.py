@@ -0,0 +1,70 @@
+from typing import List, Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from starlette.concurrency import run_in_threadpool
+
+from src.core.auth import require_admin
+from src.core.logger import log_request, logger
+from src.core.profiling import profile_store, to_collapsed
+from src.models import User
+from src.schemas.profile import ProfileInfo
+
+router = APIRouter(prefix='/profiles', tags=['Профилирование'])
+
+
+@log_request()
+@router.get(
+    '',
+    response_model=List[ProfileInfo],
+    summary='Сохраненные профили запросов (только для администратора)',
+)
+async def list_profiles(
+    current_user: User = Depends(require_admin),
+) -> List[ProfileInfo]:
+    """Профили из кольцевого буфера, новые первыми."""
+    profiles = await run_in_threadpool(profile_store.list)
+    logger.info(
+        'Получен список профилей',
+        username=current_user.username,
+        user_id=current_user.id,
+        details={'count': len(profiles)},
+    )
+    return profiles
+
+
+@log_request()
+@router.get(
+    '/{profile_id}',
+    response_class=Response,
+    summary='Скачать профиль запроса (только для администратора)',
+    description='speedscope - файл для https://www.speedscope.app, '
+                'collapsed - свернутые стеки для flamegraph.pl',
+)
+async def download_profile(
+    profile_id: str,
+    profile_format: Literal['speedscope', 'collapsed'] = Query(
+        'speedscope',
+        alias='format',
+        description='Формат файла',
+    ),
+    current_user: User = Depends(require_admin),
+) -> Response:
+    """Скачать профиль запроса."""
+    profile = await run_in_threadpool(profile_store.load, profile_id)
+    logger.info(
+        'Скачан профиль',
+        username=current_user.username,
+        user_id=current_user.id,
+        details={'profile_id': profile_id, 'format': profile_format},
+    )
+    if profile_format == 'collapsed':
+        filename = f'{profile_id}.collapsed.txt'
+        response: Response = PlainTextResponse(to_collapsed(profile))
+    else:
+        filename = f'{profile_id}.speedscope.json'
+        response = JSONResponse(profile)
+    response.headers['Content-Disposition'] = (
+        f'attachment; filename="{filename}"'
+    )
+    return response
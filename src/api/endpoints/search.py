@@ -0,0 +1,65 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.auth import get_current_user
+from src.core.constants import (
+    DEFAULT_SEARCH_LIMIT,
+    MAX_SEARCH_LIMIT,
+    SEARCH_QUERY_MAX_LENGTH,
+)
+from src.core.db import get_async_session
+from src.core.logger import log_request, logger
+from src.core.search import decode_cursor, encode_cursor
+from src.crud.search import search_crud
+from src.models import User
+from src.schemas.search import SearchResult
+
+router = APIRouter(prefix='/search', tags=['Поиск'])
+
+
+@log_request()
+@router.get(
+    '',
+    response_model=SearchResult,
+    summary='Поиск по названиям, адресам и описаниям кафе и блюд',
+)
+async def search(
+    q: str = Query(
+        ...,
+        min_length=2,
+        max_length=SEARCH_QUERY_MAX_LENGTH,
+        description='Поисковый запрос',
+    ),
+    limit: int = Query(
+        DEFAULT_SEARCH_LIMIT,
+        ge=1,
+        le=MAX_SEARCH_LIMIT,
+        description='Количество результатов на странице',
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description='Курсор из next_cursor предыдущей страницы',
+    ),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> SearchResult:
+    """Ищет активные кафе и блюда, лучшие совпадения первыми.
+
+    Страницы листаются курсором next_cursor, пока он не станет null.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    found = await search_crud.search(session, q, limit, after)
+    next_cursor = None
+    if len(found) > limit:
+        found = found[:limit]
+        last = found[-1]
+        next_cursor = encode_cursor(last['rank'], last['type'], last['id'])
+    logger.info(
+        'Поиск по кафе и блюдам',
+        username=current_user.username,
+        user_id=current_user.id,
+        details={'q': q, 'found': len(found)},
+    )
+    return SearchResult(items=found, next_cursor=next_cursor)
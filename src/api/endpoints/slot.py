@@ -1,12 +1,18 @@
 from datetime import date, datetime
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.deps import can_view_inactive, require_manager_or_admin
+from src.api.deps import (
+    can_view_inactive,
+    get_if_match,
+    require_manager_or_admin,
+)
 from src.api.validators import (
     cafe_exists,
     check_timeslot_intersections,
+    check_version,
     get_timeslot_or_404,
     get_timeslot_or_404_with_relations,
 )
@@ -14,8 +20,10 @@ from src.core.auth import get_current_user
 from src.core.db import get_async_session
 from src.core.logger import log_request, logger
 from src.crud.slot import time_slot_crud
+from src.crud.slot_template import slot_template_crud
 from src.models import User
 from src.schemas import TimeSlotCreate, TimeSlotRead, TimeSlotUpdate
+from src.schemas.slot import TimeSlotGenerate, TimeSlotGenerateResult
 
 router = APIRouter(
     prefix='/cafe/{cafe_id}/time_slots',
@@ -58,6 +66,45 @@ async def create_time_slot(
     return slot
 
 
+@log_request()
+@router.post(
+    '/generate',
+    response_model=TimeSlotGenerateResult,
+    status_code=status.HTTP_201_CREATED,
+    summary='Создание слотов по шаблонам расписания за период '
+            '(для администратора и менеджера)',
+)
+async def generate_time_slots(
+    cafe_id: int,
+    period: TimeSlotGenerate = ...,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> TimeSlotGenerateResult:
+    """Разворачиваем активные шаблоны cafe_id в слоты на период."""
+    await cafe_exists(cafe_id, session)
+    require_manager_or_admin(cafe_id, current_user)
+
+    templates = await slot_template_crud.get_multi_by_cafe(cafe_id, session)
+    created, skipped = await time_slot_crud.create_from_templates(
+        cafe_id,
+        templates,
+        period.date_from,
+        period.date_to,
+        session,
+    )
+    logger.info(
+        'Созданы слоты по шаблонам',
+        username=current_user.username,
+        user_id=current_user.id,
+        details={
+            'cafe_id': cafe_id,
+            'created': created,
+            'skipped': len(skipped),
+        },
+    )
+    return TimeSlotGenerateResult(created=created, skipped=skipped)
+
+
 @log_request()
 @router.get(
     '',
@@ -136,6 +183,7 @@ async def update_time_slot_by_id(
     cafe_id: int = Path(..., description='ID кафе'),
     time_slot_id: int = Path(..., description='ID временного слота'),
     slot_data: TimeSlotUpdate = ...,
+    if_match: Optional[str] = Depends(get_if_match),
     session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ) -> TimeSlotRead:
@@ -143,6 +191,7 @@ async def update_time_slot_by_id(
     await cafe_exists(cafe_id, session)
     require_manager_or_admin(cafe_id, current_user)
     slot = await get_timeslot_or_404(time_slot_id, session)
+    check_version(slot, slot_data.version, if_match)
     update_data = slot_data.model_dump(exclude_unset=True)
 
     new_date = update_data.get('date', slot.date)
@@ -0,0 +1,114 @@
+from fastapi import APIRouter, Depends, Path, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.deps import can_view_inactive, require_manager_or_admin
+from src.api.validators import cafe_exists, get_slot_template_or_404
+from src.core.auth import get_current_user
+from src.core.db import get_async_session
+from src.core.exceptions import AppException
+from src.core.logger import log_request, logger
+from src.crud.slot_template import slot_template_crud
+from src.models import User
+from src.schemas.slot import (
+    SlotTemplateCreate,
+    SlotTemplateRead,
+    SlotTemplateUpdate,
+)
+
+router = APIRouter(
+    prefix='/cafe/{cafe_id}/slot_templates',
+    tags=['Шаблоны расписания'],
+)
+
+
+@log_request()
+@router.post(
+    '',
+    response_model=SlotTemplateRead,
+    status_code=status.HTTP_201_CREATED,
+    summary='Создание шаблона расписания (для администратора и менеджера)',
+)
+async def create_slot_template(
+    cafe_id: int = Path(..., description='ID кафе'),
+    template_in: SlotTemplateCreate = ...,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> SlotTemplateRead:
+    """Создаем шаблон расписания в cafe_id."""
+    await cafe_exists(cafe_id, session)
+    require_manager_or_admin(cafe_id, current_user)
+    template = await slot_template_crud.create_for_cafe(
+        cafe_id, template_in, session,
+    )
+    logger.info(
+        'Создан шаблон расписания',
+        username=current_user.username,
+        user_id=current_user.id,
+        details={'template_id': template.id, 'cafe_id': cafe_id},
+    )
+    return template
+
+
+@log_request()
+@router.get(
+    '',
+    response_model=list[SlotTemplateRead],
+    summary='Получение шаблонов расписания кафе',
+)
+async def get_slot_templates(
+    cafe_id: int = Path(..., description='ID кафе'),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> list[SlotTemplateRead]:
+    """Получаем список шаблонов расписания в cafe_id."""
+    await cafe_exists(cafe_id, session)
+    templates = await slot_template_crud.get_multi_by_cafe(
+        cafe_id,
+        session,
+        include_inactive=can_view_inactive(cafe_id, current_user),
+    )
+    logger.info(
+        'Получен список шаблонов расписания',
+        username=current_user.username,
+        user_id=current_user.id,
+        details={'cafe_id': cafe_id, 'count': len(templates)},
+    )
+    return templates
+
+
+@log_request()
+@router.patch(
+    '/{template_id}',
+    response_model=SlotTemplateRead,
+    summary='Обновление шаблона расписания (администратор и менеджер)',
+)
+async def update_slot_template(
+    cafe_id: int = Path(..., description='ID кафе'),
+    template_id: int = Path(..., description='ID шаблона'),
+    template_in: SlotTemplateUpdate = ...,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> SlotTemplateRead:
+    """Обновляем шаблон расписания по id."""
+    await cafe_exists(cafe_id, session)
+    require_manager_or_admin(cafe_id, current_user)
+    template = await get_slot_template_or_404(template_id, cafe_id, session)
+
+    update_data = template_in.model_dump(exclude_unset=True)
+    start_time = update_data.get('start_time', template.start_time)
+    end_time = update_data.get('end_time', template.end_time)
+    if end_time <= start_time:
+        raise AppException(
+            detail='Время окончания должно быть позже времени начала',
+        )
+
+    template = await slot_template_crud.update_template(
+        template, template_in, session,
+    )
+    logger.info(
+        'Обновлён шаблон расписания',
+        username=current_user.username,
+        user_id=current_user.id,
+        details={'template_id': template.id, 'cafe_id': cafe_id},
+    )
+    return template
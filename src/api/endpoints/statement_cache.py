@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+
+from src.core.auth import require_admin
+from src.core.logger import log_request, logger
+from src.core.statement_cache import statement_cache_stats
+from src.models import User
+from src.schemas.statement_cache import StatementCacheReport
+
+router = APIRouter(prefix='/statement-cache', tags=['Профилирование'])
+
+
+@log_request()
+@router.get(
+    '',
+    response_model=StatementCacheReport,
+    summary='Кеш скомпилированных запросов (только для администратора)',
+    description='Счетчики воркера, который обработал запрос, '
+                'с момента его запуска',
+)
+async def get_statement_cache(
+    current_user: User = Depends(require_admin),
+) -> StatementCacheReport:
+    """Размер кеша и доля попаданий по именам запросов."""
+    report = statement_cache_stats.report()
+    logger.info(
+        'Получена статистика кеша запросов',
+        username=current_user.username,
+        user_id=current_user.id,
+        details={'size': report['size'], 'queries': len(report['queries'])},
+    )
+    return report
@@ -0,0 +1,106 @@
+from datetime import date, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.deps import require_manager_or_admin
+from src.api.validators import cafe_exists
+from src.core.auth import get_current_user
+from src.core.constants import DEFAULT_STATS_DAYS, MAX_STATS_DAYS
+from src.core.db import get_async_session
+from src.core.exceptions import AppException
+from src.core.logger import log_request, logger
+from src.crud.stats import stats_crud
+from src.models import User
+from src.models.stats import (
+    booking_daily_rollup_table,
+    booking_occupancy_rollup_table,
+    dish_preorder_rollup_table,
+)
+from src.schemas.stats import CafeStats
+
+router = APIRouter(prefix='/cafe/{cafe_id}/stats', tags=['Статистика'])
+
+
+@log_request()
+@router.get(
+    '',
+    response_model=CafeStats,
+    summary='Статистика загрузки кафе и предзаказов '
+            '(только для администратора и менеджера)',
+)
+async def get_cafe_stats(
+    cafe_id: int,
+    date_from: Optional[date] = Query(
+        None,
+        description='Начало периода (по умолчанию 30 дней назад)',
+    ),
+    date_to: Optional[date] = Query(
+        None,
+        description='Конец периода включительно (по умолчанию сегодня)',
+    ),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> CafeStats:
+    """Возвращает загрузку по дням, столам и времени слотов и предзаказы.
+
+    Данные читаются из агрегатов, а не из таблиц бронирований.
+    Изменения бронирований попадают в агрегаты с фоновым пересчетом
+    (STATS_PENDING_INTERVAL_SEC, по умолчанию раз в минуту).
+
+    Права доступа:
+    - Менеджер кафе или администратор.
+    """
+    await cafe_exists(cafe_id, session)
+    require_manager_or_admin(cafe_id, current_user)
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_STATS_DAYS)
+    if date_from > date_to:
+        raise AppException(
+            detail='Дата начала периода позже даты окончания',
+        )
+    if (date_to - date_from).days >= MAX_STATS_DAYS:
+        raise AppException(
+            detail=f'Период не может быть больше {MAX_STATS_DAYS} дней',
+        )
+
+    # NumPy загружается при первом запросе статистики, а не при старте.
+    from src.core.stats import aggregate_cafe_stats
+
+    rows = {
+        name: await stats_crud.get_rows(
+            session, table, cafe_id, date_from, date_to,
+        )
+        for name, table in (
+            ('daily', booking_daily_rollup_table),
+            ('occupancy', booking_occupancy_rollup_table),
+            ('dishes', dish_preorder_rollup_table),
+        )
+    }
+    stats = aggregate_cafe_stats(
+        date_from,
+        date_to,
+        slots=await stats_crud.get_slot_times(
+            session, cafe_id, date_from, date_to,
+        ),
+        tables=await stats_crud.get_tables(session, cafe_id),
+        **rows,
+    )
+    names = await stats_crud.get_dish_names(
+        session, [dish['dish_id'] for dish in stats['dishes']],
+    )
+    for dish in stats['dishes']:
+        dish['name'] = names.get(dish['dish_id'])
+
+    logger.info(
+        'Получена статистика кафе',
+        username=current_user.username,
+        user_id=current_user.id,
+        details={
+            'cafe_id': cafe_id,
+            'date_from': date_from,
+            'date_to': date_to,
+        },
+    )
+    return CafeStats(cafe_id=cafe_id, **stats)
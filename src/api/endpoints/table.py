@@ -1,13 +1,22 @@
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.deps import can_view_inactive, require_manager_or_admin
-from src.api.validators import cafe_exists, get_table_or_404
+from src.api.deps import get_if_match, require_manager_or_admin
+from src.api.validators import cafe_exists, check_version, get_table_or_404
+from src.core.access import AccessScope
 from src.core.auth import get_current_user
 from src.core.db import get_async_session
+from src.core.importing import (
+    import_request_body,
+    read_import_rows,
+    validate_import_rows,
+)
 from src.core.logger import log_request, logger
 from src.crud.table import table_crud
 from src.models import User
+from src.schemas.importing import ImportSummary
 from src.schemas.table import Table, TableCreate, TableUpdate
 
 router = APIRouter(prefix='/cafe/{cafe_id}/tables', tags=['Столы'])
@@ -34,13 +43,10 @@ async def get_tables_in_cafe(
 
     """
     await cafe_exists(cafe_id, session)
-    include_inactive = can_view_inactive(
-        cafe_id, current_user,
-    )
     tables = await table_crud.get_multi_by_cafe(
         session,
         cafe_id,
-        include_inactive,
+        AccessScope(current_user),
     )
 
     logger.info(
@@ -83,6 +89,52 @@ async def create_table(
     return table
 
 
+@log_request()
+@router.post(
+    '/import',
+    response_model=ImportSummary,
+    status_code=status.HTTP_201_CREATED,
+    summary='Массовый импорт столов из JSON или CSV '
+            '(только для администратора и менеджера)',
+    openapi_extra=import_request_body(TableCreate),
+)
+async def import_tables(
+    cafe_id: int,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user),
+) -> ImportSummary:
+    """Создает столы в указанном кафе из JSON-массива или CSV.
+
+    Невалидные строки пропускаются и перечисляются в ответе,
+    остальные вставляются пачками одной транзакцией.
+
+    Права доступа:
+    - Менеджер кафе или администратор.
+    """
+    await cafe_exists(cafe_id, session)
+    require_manager_or_admin(cafe_id, current_user)
+    rows = await read_import_rows(request)
+    valid, skipped = validate_import_rows(TableCreate, rows)
+    created = await table_crud.bulk_create(
+        session,
+        cafe_id,
+        [table_in for _, table_in in valid],
+    )
+
+    logger.info(
+        'Импортированы столы',
+        username=current_user.username,
+        user_id=current_user.id,
+        details={
+            'cafe_id': cafe_id,
+            'created': created,
+            'skipped': len(skipped),
+        },
+    )
+    return ImportSummary(created=created, skipped=skipped)
+
+
 @log_request()
 @router.get(
     '/{table_id}',
@@ -104,14 +156,11 @@ async def get_table_by_id(
     - Менеджеры кафе и администраторы видят также неактивный стол/кафе.
     """
     await cafe_exists(cafe_id, session)
-    include_inactive = can_view_inactive(
-        cafe_id, current_user,
-    )
     table = await get_table_or_404(
         session,
         table_id,
         cafe_id,
-        include_inactive,
+        AccessScope(current_user),
     )
 
     logger.info(
@@ -133,6 +182,7 @@ async def update_table(
     cafe_id: int,
     table_id: int,
     table_in: TableUpdate,
+    if_match: Optional[str] = Depends(get_if_match),
     session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user),
 ) -> Table:
@@ -147,8 +197,9 @@ async def update_table(
         session,
         table_id,
         cafe_id,
-        include_inactive=True,
+        AccessScope(current_user),
     )
+    check_version(table, table_in.version, if_match)
     updated_table = await table_crud.update(session, table, table_in)
 
     logger.info(
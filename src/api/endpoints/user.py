@@ -232,6 +232,7 @@ async def list_users(
     users = await user_crud.get_multi_filtered(
         session,
         only_active=only_active,
+        projection=UserRead,
     )
 
     logger.info(
@@ -1,23 +1,42 @@
 from fastapi import APIRouter
 
-from .endpoints import (
-    action_router,
-    auth_router,
-    booking_router,
-    cafe_router,
-    dish_router,
-    slot_router,
-    table_router,
-    user_router,
-)
 
-main_router = APIRouter()
+def get_routers() -> list[APIRouter]:
+    """Роутеры API в порядке подключения.
 
-main_router.include_router(auth_router)
-main_router.include_router(user_router)
-main_router.include_router(cafe_router)
-main_router.include_router(table_router)
-main_router.include_router(dish_router)
-main_router.include_router(slot_router)
-main_router.include_router(booking_router)
-main_router.include_router(action_router)
+    Модули эндпоинтов со схемами, CRUD и моделями импортируются
+    при вызове из create_app, а не при импорте src.main.
+    """
+    from .endpoints import (
+        action_router,
+        auth_router,
+        availability_router,
+        booking_router,
+        cafe_router,
+        dish_router,
+        profile_router,
+        search_router,
+        slot_router,
+        slot_template_router,
+        statement_cache_router,
+        stats_router,
+        table_router,
+        user_router,
+    )
+
+    return [
+        auth_router,
+        user_router,
+        cafe_router,
+        table_router,
+        dish_router,
+        slot_router,
+        slot_template_router,
+        booking_router,
+        action_router,
+        stats_router,
+        availability_router,
+        search_router,
+        profile_router,
+        statement_cache_router,
+    ]
@@ -4,10 +4,13 @@ from typing import Any, Optional, Type, Union
 from sqlalchemy import and_, exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.access import AccessScope
 from src.core.db import Base
 from src.core.exceptions import (
     AppException,
+    ConflictError,
     DuplicateError,
+    PreconditionFailedError,
     ResourceNotFoundError,
 )
 from src.core.logger import logger
@@ -15,15 +18,11 @@ from src.crud import (
     action_crud,
     cafe_crud,
     dish_crud,
+    slot_template_crud,
     table_crud,
     time_slot_crud,
 )
-from src.crud.cafe import cafe_crud
-from src.crud.dish import dish_crud
-from src.crud.table import table_crud
-from src.models import Action, Cafe, Dish, TableModel, TimeSlot
-from src.models.cafe import Cafe
-from src.models.table import TableModel
+from src.models import Action, Cafe, Dish, SlotTemplate, TableModel, TimeSlot
 from src.schemas.cafe import CafeCreate
 
 
@@ -31,14 +30,14 @@ async def get_table_or_404(
     session: AsyncSession,
     table_id: int,
     cafe_id: int,
-    include_inactive: bool,
+    scope: Optional[AccessScope] = None,
 ) -> TableModel:
-    """Проверка существования объекта с cafe_id, table_id."""
+    """Проверка существования стола кафе, видимого в области scope."""
     table = await table_crud.get_by_id_and_cafe(
         session,
         table_id,
         cafe_id,
-        include_inactive,
+        scope,
     )
     if not table:
         logger.warning(
@@ -66,7 +65,7 @@ async def check_dish_name_duplicate(
     dish = await dish_crud.get_by_field(
         session,
         name=dish_name,
-        cafe=cafe,
+        cafe_id=cafe.id,
     )
     if dish is not None:
         logger.warning(
@@ -164,6 +163,22 @@ async def get_timeslot_or_404_with_relations(
     return timeslot
 
 
+async def get_slot_template_or_404(
+    template_id: int,
+    cafe_id: int,
+    session: AsyncSession,
+) -> SlotTemplate:
+    """Проверяет, что шаблон расписания существует; если нет — 404."""
+    template = await slot_template_crud.get_with_cafe(
+        template_id=template_id,
+        cafe_id=cafe_id,
+        session=session,
+    )
+    if not template:
+        raise ResourceNotFoundError(resource_name='Шаблон расписания')
+    return template
+
+
 async def check_timeslot_intersections(
     *,
     cafe_id: int,
@@ -367,3 +382,68 @@ async def validate_dish_for_booking(
         raise ResourceNotFoundError(
             resource_name='Одно или несколько блюд',
         )
+
+
+def check_batch_item(
+    item: Any,
+    tables: dict[int, int],
+    slots: dict[int, date],
+    dishes: set[int],
+) -> date:
+    """Проверяет элемент пакета бронирований по загруженным данным.
+
+    Проверки и ошибки те же, что у validate_table_for_booking,
+    validate_slot_for_booking и validate_dish_for_booking, но без
+    запросов к базе. Возвращает дату бронирования.
+    """
+    if not item.tables:
+        raise AppException(detail='Список столов не может быть пустым')
+    if len({*item.tables} & tables.keys()) != len(item.tables):
+        raise ResourceNotFoundError(
+            resource_name='Один или несколько столов',
+        )
+    total_seats = sum(tables[table_id] for table_id in item.tables)
+    if item.guests_number > total_seats:
+        raise AppException(
+            detail=f'Общая вместимость столов {total_seats} меньше '
+                   f'числа гостей {item.guests_number}',
+        )
+    if not item.slots:
+        raise AppException(detail='Список слотов не может быть пустым')
+    if len({*item.slots} & slots.keys()) != len(item.slots):
+        raise ResourceNotFoundError(
+            resource_name='Один или несколько слотов',
+        )
+    slot_dates = {slots[slot_id] for slot_id in item.slots}
+    if len(slot_dates) != 1:
+        raise AppException(detail='Все слоты должны быть на одну дату.')
+    if not set(item.menu) <= dishes:
+        raise ResourceNotFoundError(
+            resource_name='Одно или несколько блюд',
+        )
+    return slot_dates.pop()
+
+
+def check_version(
+    obj: Any,
+    version: Optional[int],
+    if_match: Optional[str],
+) -> None:
+    """Сверяет версию объекта с ожидаемой клиентом.
+
+    Версия передается заголовком If-Match (например "3", ответ 412
+    при расхождении) или полем version в теле (ответ 409).
+    """
+    if if_match is not None and if_match.strip() != '*':
+        tags = {
+            tag.strip().removeprefix('W/').strip('"')
+            for tag in if_match.split(',')
+        }
+        if str(obj.version) not in tags:
+            raise PreconditionFailedError(
+                detail=f'Объект изменен, текущая версия {obj.version}',
+            )
+    if version is not None and version != obj.version:
+        raise ConflictError(
+            detail=f'Объект изменен, текущая версия {obj.version}',
+        )
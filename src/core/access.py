@@ -0,0 +1,67 @@
+from typing import Any, Optional
+
+from sqlalchemy import ColumnElement, and_, or_, select, true
+
+from src.models import User
+from src.models.cafe import cafe_managers_table
+
+
+class AccessScope:
+    """Права пользователя на кафе: проверки в Python и условия SQL.
+
+    Администратор видит и меняет все, менеджер - объекты своих кафе,
+    в том числе неактивные, остальные видят только активные объекты.
+    В SQL кафе менеджера задаются подзапросом к cafe_managers по ID
+    пользователя, а не списком ID: условие не растет с числом кафе
+    и одинаково для кеша компиляции.
+    """
+
+    def __init__(self, user: User) -> None:
+        """Создает область доступа пользователя."""
+        self.user = user
+
+    @property
+    def is_admin(self) -> bool:
+        """Пользователь - администратор."""
+        return self.user.is_superuser
+
+    @property
+    def is_staff(self) -> bool:
+        """Администратор или менеджер хотя бы одного кафе."""
+        return self.is_admin or bool(self.user.managed_cafe_ids)
+
+    def can_manage(self, cafe_id: int) -> bool:
+        """Управляет ли пользователь кафе cafe_id."""
+        return self.is_admin or cafe_id in self.user.managed_cafe_ids
+
+    def can_view_inactive(self, cafe_id: Optional[int] = None) -> bool:
+        """Видит ли пользователь неактивные объекты кафе.
+
+        Без cafe_id - неактивные объекты хотя бы одного кафе.
+        """
+        if cafe_id is None:
+            return self.is_staff
+        return self.can_manage(cafe_id)
+
+    def managed_cafe_ids(self) -> Any:
+        """Подзапрос ID кафе, которыми управляет пользователь."""
+        return (
+            select(cafe_managers_table.c.cafe_id)
+            .where(cafe_managers_table.c.user_id == self.user.id)
+            .scalar_subquery()
+        )
+
+    def manages(self, cafe_id: Any) -> ColumnElement[bool]:
+        """Условие: колонка cafe_id - кафе под управлением пользователя."""
+        if self.is_admin:
+            return true()
+        return cafe_id.in_(self.managed_cafe_ids())
+
+    def visible(self, cafe_id: Any, *active: Any) -> ColumnElement[bool]:
+        """Условие видимости: все флаги active истинны или кафе свое."""
+        if self.is_admin:
+            return true()
+        return or_(
+            and_(*(flag.is_(True) for flag in active)),
+            self.manages(cafe_id),
+        )
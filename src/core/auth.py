@@ -1,4 +1,14 @@
-from fastapi import Depends, HTTPException, Security, status
+from typing import Optional
+
+from fastapi import (
+    Depends,
+    HTTPException,
+    Query,
+    Security,
+    WebSocket,
+    WebSocketException,
+    status,
+)
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from sqlalchemy import select
@@ -25,7 +35,23 @@ async def get_current_user(
             detail='Not authenticated',
         )
 
-    token = creds.credentials
+    return await authenticate_token(creds.credentials, session)
+
+
+async def get_user_with_cafes(
+    session: AsyncSession,
+    user_id: int,
+) -> Optional[User]:
+    """Пользователь по ID вместе с кафе, которыми он управляет."""
+    res = await session.execute(
+        select(User).where(
+            User.id == user_id).options(selectinload(User.managed_cafes)),
+    )
+    return res.scalars().one_or_none()
+
+
+async def authenticate_token(token: str, session: AsyncSession) -> User:
+    """Возвращает активного пользователя по JWT-токену."""
     try:
         payload = jwt.decode(
             token,
@@ -46,11 +72,7 @@ async def get_current_user(
             detail='Invalid token',
         )
 
-    res = await session.execute(
-        select(User).where(
-            User.id == int(sub)).options(selectinload(User.managed_cafes)),
-    )
-    user = res.scalars().one_or_none()
+    user = await get_user_with_cafes(session, int(sub))
 
     if not user or not user.active:
         logger.warning(
@@ -88,3 +110,33 @@ async def require_admin(
         details={'user_id': current_user.id},
     )
     return current_user
+
+
+async def get_websocket_user(
+    websocket: WebSocket,
+    token: Optional[str] = Query(
+        None,
+        description='JWT-токен, если нельзя передать заголовок',
+    ),
+    session: AsyncSession = Depends(get_async_session),
+) -> User:
+    """Возвращает пользователя WebSocket-соединения.
+
+    Браузеры не передают заголовки при открытии WebSocket,
+    поэтому токен можно указать в параметре запроса.
+    """
+    scheme, _, credentials = websocket.headers.get(
+        'authorization', '',
+    ).partition(' ')
+    if scheme.lower() == 'bearer' and credentials:
+        token = credentials
+    if not token:
+        logger.warning('Попытка доступа без токена')
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+    try:
+        return await authenticate_token(token, session)
+    except HTTPException as error:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION,
+            reason=error.detail,
+        )
@@ -0,0 +1,110 @@
+import time
+from typing import Any, Callable, Optional
+
+from src.core.config import settings
+from src.core.logger import logger
+from src.core.realtime import LocalBus, PostgresBus, RedisBus, create_bus
+
+# Индексы в памяти воркера, которые сбрасываются через шину.
+SEARCH_CACHE = 'search'
+GEO_CACHE = 'geo'
+
+
+class Revalidation:
+    """Когда локальный индекс воркера нужно сверить с базой.
+
+    Пока сбросы кешей доходят до всех воркеров, индекс сверяется
+    с сигнатурой данных после сброса и не реже cache_revalidate_sec.
+    Иначе (несколько воркеров с локальной шиной) - при каждом вызове.
+    """
+
+    def __init__(self) -> None:
+        """Создает состояние: индекс еще не сверялся."""
+        self.checked_at: Optional[float] = None
+
+    def due(self) -> bool:
+        """Нужно ли сверить индекс сейчас."""
+        if self.checked_at is None or not cache_invalidation.coordinated:
+            return True
+        return (
+            time.monotonic() - self.checked_at
+            >= settings.cache_revalidate_sec
+        )
+
+    def checked(self) -> None:
+        """Отмечает, что индекс сверен с базой."""
+        self.checked_at = time.monotonic()
+
+    def reset(self) -> None:
+        """Сбрасывает отметку: следующий вызов сверит индекс."""
+        self.checked_at = None
+
+
+class CacheInvalidation:
+    """Рассылает сбросы кешей всем воркерам через шину.
+
+    Шина та же, что у событий занятости (realtime_bus), но канал
+    свой. Сообщение доходит и до отправителя, поэтому воркер
+    сбрасывает свои кеши так же, как чужие.
+    """
+
+    def __init__(self) -> None:
+        """Создает реестр кешей без подключения к шине."""
+        self._handlers: dict[str, list[Callable[[], None]]] = {}
+        self._bus: LocalBus | RedisBus | PostgresBus = LocalBus(
+            self.dispatch,
+        )
+        self._started = False
+
+    @property
+    def coordinated(self) -> bool:
+        """Доходят ли сбросы до всех воркеров, обслуживающих базу."""
+        return settings.realtime_bus != 'local' or (
+            settings.web_concurrency == 1
+        )
+
+    def register(self, name: str, handler: Callable[[], None]) -> None:
+        """Регистрирует обработчик сброса кеша name."""
+        self._handlers.setdefault(name, []).append(handler)
+
+    async def start(self) -> None:
+        """Подключается к шине из настроек."""
+        self._bus = create_bus(settings.cache_channel)
+        await self._bus.start(self.dispatch, self.reset_all)
+        self._started = True
+
+    async def stop(self) -> None:
+        """Отключается от шины."""
+        if self._started:
+            await self._bus.stop()
+            self._bus = LocalBus(self.dispatch)
+            self._started = False
+
+    def dispatch(self, message: dict[str, Any]) -> None:
+        """Вызывает обработчики кешей из сообщения шины."""
+        for name in message['caches']:
+            for handler in self._handlers.get(name, ()):
+                handler()
+
+    def reset_all(self) -> None:
+        """Сбрасывает все кеши: сбросы за время обрыва шины потеряны."""
+        for handlers in self._handlers.values():
+            for handler in handlers:
+                handler()
+
+    async def invalidate(self, *names: str) -> None:
+        """Сбрасывает кеши на всех воркерах, ошибки шины не ломают запрос.
+
+        Если сообщение потеряно, кеш сверится с базой не позже чем
+        через cache_revalidate_sec.
+        """
+        try:
+            await self._bus.publish({'caches': list(names)})
+        except Exception as error:
+            logger.error(
+                'Ошибка публикации сброса кеша',
+                details={'caches': names, 'error': repr(error)},
+            )
+
+
+cache_invalidation = CacheInvalidation()
@@ -1,6 +1,7 @@
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Optional
 
-from pydantic import EmailStr
+from pydantic import EmailStr, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -16,6 +17,55 @@ class Settings(BaseSettings):
     jwt_algorithm: str
     access_token_expire_min: int = 120
     bcrypt_rounds: int = 12
+    # Быстрая сериализация больших списков через TypeAdapter
+    fast_json_response: bool = False
+    # Фоновые задачи внутри процесса приложения: включаются
+    # SCHEDULER_ENABLED=true только в одном процессе, не в каждом воркере
+    scheduler_enabled: bool = False
+    booking_status_interval_sec: int = 60
+    archive_interval_sec: int = 3600
+    archive_retention_days: int = 90
+    partition_interval_sec: int = 86400
+    stats_pending_interval_sec: int = 60
+    stats_interval_sec: int = 3600
+    stats_rebuild_days: int = 7
+    # События занятости: local, redis или postgres
+    realtime_bus: str = 'local'
+    realtime_channel: str = 'availability'
+    realtime_queue_size: int = 100
+    redis_url: Optional[str] = None
+    # Хранилище ключей со сроком жизни: memory или redis
+    ttl_store: str = 'memory'
+    ttl_store_max_items: int = 100_000
+    # Несколько воркеров: пул соединений и кеши каждого воркера
+    web_concurrency: int = 1
+    db_max_connections: Optional[int] = None
+    db_reserved_connections: int = 10
+    db_pool_size: Optional[int] = None
+    db_max_overflow: int = 5
+    cache_channel: str = 'cache'
+    cache_revalidate_sec: int = 60
+    graceful_timeout_sec: int = 30
+    booking_hold_ttl_sec: int = 300
+    idempotency_ttl_sec: int = 86400
+    idempotency_pending_ttl_sec: int = 60
+    # Бюджет SQL-запросов на запрос к API: off, log или raise
+    query_budget_mode: str = 'off'
+    query_budget_default: int = 50
+    # Бюджеты маршрутов: {"GET /api/v1/cafes/{cafe_id}": 5}
+    query_budgets: dict[str, int] = {}
+    # Профилирование запросов выборкой стеков
+    profiling_enabled: bool = False
+    profile_sample_rate: float = 0.0
+    profile_interval_ms: float = 5.0
+    profile_dir: str = 'profiles'
+    profile_max_files: int = 100
+    # Кеш скомпилированных запросов SQLAlchemy и счетчики попаданий
+    db_query_cache_size: int = 500
+    statement_cache_stats: bool = True
+    # Прогрев воркера до приема трафика
+    warmup_connections: int = 5
+    warmup_statements: bool = True
     first_superuser_username: Optional[str] = None
     first_superuser_phone: Optional[str] = None
     first_superuser_email: Optional[EmailStr] = None
@@ -30,5 +80,24 @@ class Settings(BaseSettings):
     postgres_host: str | None = None
     postgres_port: int | None = None
 
+    @model_validator(mode='after')
+    def check_redis_url(self) -> 'Settings':
+        """Шине и хранилищу в Redis нужен адрес redis_url."""
+        if self.redis_url is None:
+            for name in ('realtime_bus', 'ttl_store'):
+                if getattr(self, name) == 'redis':
+                    raise ValueError(f'Для {name}=redis нужен REDIS_URL')
+        return self
 
-settings = Settings()
+
+@lru_cache
+def get_settings() -> Settings:
+    """Настройки приложения, читаются из окружения при первом вызове."""
+    return Settings()
+
+
+def __getattr__(name: str) -> Any:
+    """Общие settings создаются при первом обращении, а не при импорте."""
+    if name == 'settings':
+        return get_settings()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
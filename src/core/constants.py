@@ -17,3 +17,65 @@ SUPERUSER_DEFAULT_PHONE = '+00000000000'
 LOG_FILE = 'project.log'
 MAX_BYTES = 5 * 1024 * 1024  # 5 MB
 BACKUP_COUNT = 3
+
+# Выгрузка бронирований
+EXPORT_BATCH_SIZE = 1000
+
+# Генерация слотов по шаблонам расписания
+MAX_SLOT_GENERATE_DAYS = 92
+
+# Массовый импорт столов и блюд
+MAX_IMPORT_ROWS = 5000
+IMPORT_BATCH_SIZE = 500
+
+# Фоновая смена статусов бронирований
+STATUS_TRANSITION_BATCH_SIZE = 500
+
+# Архивирование старых бронирований и слотов
+ARCHIVE_BATCH_SIZE = 1000
+
+# Помесячные секции бронирований и слотов в Postgres
+PARTITION_MONTHS_AHEAD = 3
+
+# Статистика кафе по агрегатам
+MAX_STATS_DAYS = 366
+DEFAULT_STATS_DAYS = 30
+
+# Подписки на занятость столов
+REALTIME_HEARTBEAT_SEC = 15
+
+# Пакетное создание бронирований
+MAX_BATCH_BOOKINGS = 100
+
+# Ключи идемпотентности запросов
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+# Поиск по кафе и блюдам
+SEARCH_TS_CONFIG = 'russian'
+SEARCH_MIN_SIMILARITY = 0.3
+SEARCH_QUERY_MAX_LENGTH = 100
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# Поиск кафе рядом с точкой
+DEFAULT_NEARBY_RADIUS_KM = 5
+MAX_NEARBY_RADIUS_KM = 50
+DEFAULT_NEARBY_LIMIT = 20
+MAX_NEARBY_LIMIT = 100
+
+# Бюджет SQL-запросов на запрос к API
+QUERY_BUDGET_STACK_DEPTH = 8
+
+# Профилирование запросов
+PROFILE_MAX_SAMPLES = 20000
+PROFILE_MAX_STACK_DEPTH = 200
+
+# Пул соединений воркера: два слушающих соединения шины Postgres
+# (занятость и сброс кешей) и хотя бы одно для запросов
+DB_MIN_POOL_SIZE = 3
+
+# Проверки состояния воркера
+HEALTH_DB_TIMEOUT_SEC = 2
+
+# Запас до SIGKILL от gunicorn на закрытие шин и пула при остановке
+SHUTDOWN_MARGIN_SEC = 5
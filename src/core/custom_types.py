@@ -1,4 +1,6 @@
-from pydantic import constr
+from typing import Annotated
+
+from pydantic import WithJsonSchema, constr
 
 # Определяем кастомные, переиспользуемые типы здесь
 PhoneNumber = constr(
@@ -6,3 +8,9 @@ PhoneNumber = constr(
     min_length=10,
     max_length=15,
 )
+
+# Email в схемах ответа: уже проверен при записи, повторно не валидируется
+StoredEmail = Annotated[
+    str,
+    WithJsonSchema({'type': 'string', 'format': 'email'}),
+]
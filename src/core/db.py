@@ -1,7 +1,15 @@
 from datetime import datetime
 from typing import AsyncGenerator
 
-from sqlalchemy import Boolean, DateTime, MetaData, func
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Integer,
+    MetaData,
+    func,
+    make_url,
+    text,
+)
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -15,6 +23,7 @@ from sqlalchemy.orm import (
 )
 
 from src.core.config import settings
+from src.core.constants import DB_MIN_POOL_SIZE
 from src.core.logger import logger
 
 naming_convention = {
@@ -60,12 +69,60 @@ class ActiveMixin:
     active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
 
+class VersionMixin:
+    """Добавляет поле version для оптимистической блокировки.
+
+    SQLAlchemy добавляет версию в условие UPDATE и увеличивает ее.
+    Если строку успели изменить, UPDATE не находит ее и flush
+    выбрасывает StaleDataError.
+    """
+
+    version: Mapped[int] = mapped_column(
+        Integer,
+        server_default='1',
+        nullable=False,
+    )
+
+    @declared_attr.directive
+    def __mapper_args__(cls) -> dict:  # noqa: N805
+        return {'version_id_col': cls.version}
+
+
 Base = declarative_base(cls=PreBase)
 
+
+def pool_options() -> dict[str, int]:
+    """Размер пула соединений одного воркера для Postgres.
+
+    db_pool_size задает пул явно. Иначе, если известен max_connections
+    сервера (db_max_connections), соединения за вычетом резерва делятся
+    между воркерами. При плавном перезапуске старые и новые воркеры
+    работают одновременно, поэтому делитель - удвоенное число воркеров.
+    """
+    if make_url(settings.database_url).get_backend_name() != 'postgresql':
+        return {}
+    if settings.db_pool_size is not None:
+        return {
+            'pool_size': settings.db_pool_size,
+            'max_overflow': settings.db_max_overflow,
+        }
+    if settings.db_max_connections is None:
+        return {}
+    per_worker = max(
+        (settings.db_max_connections - settings.db_reserved_connections)
+        // (2 * settings.web_concurrency),
+        DB_MIN_POOL_SIZE,
+    )
+    overflow = min(settings.db_max_overflow, per_worker - DB_MIN_POOL_SIZE)
+    return {'pool_size': per_worker - overflow, 'max_overflow': overflow}
+
+
 engine = create_async_engine(
     settings.database_url,
     echo=False,
     future=True,
+    query_cache_size=settings.db_query_cache_size,
+    **pool_options(),
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -81,3 +138,29 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         logger.debug('Создана новая сессия AsyncSession')
         yield session
+
+
+async def advisory_xact_lock(session: AsyncSession, key: str) -> None:
+    """Берет advisory-блокировку Postgres до конца транзакции.
+
+    Сериализует одинаковые фоновые задачи на разных узлах.
+    В SQLite запись и так сериализована, блокировка не нужна.
+    """
+    if session.bind.dialect.name == 'postgresql':
+        await session.execute(
+            text('SELECT pg_advisory_xact_lock(hashtext(:key))'),
+            {'key': key},
+        )
+
+
+async def has_extension(session: AsyncSession, name: str) -> bool:
+    """Установлено ли расширение Postgres в текущей базе."""
+    if session.bind.dialect.name != 'postgresql':
+        return False
+    return bool(await session.scalar(
+        text(
+            'SELECT EXISTS '
+            '(SELECT 1 FROM pg_extension WHERE extname = :name)',
+        ),
+        {'name': name},
+    ))
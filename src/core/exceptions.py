@@ -61,6 +61,14 @@ class ConflictError(AppException):
     code = "conflict"
 
 
+class PreconditionFailedError(AppException):
+    """Версия объекта не совпала с заголовком If-Match."""
+
+    status_code = HTTPStatus.PRECONDITION_FAILED
+    detail = "Объект изменен другим запросом"
+    code = "precondition_failed"
+
+
 class DuplicateError(ConflictError):
     """Такая запись уже существует."""
 
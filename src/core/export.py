@@ -0,0 +1,44 @@
+import csv
+import io
+from typing import Any, AsyncIterator
+
+from pydantic import BaseModel, TypeAdapter
+
+EXPORT_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+async def iter_ndjson(
+    schema: type[BaseModel],
+    batches: AsyncIterator[list[dict[str, Any]]],
+) -> AsyncIterator[bytes]:
+    """Кодирует пачки строк в NDJSON, по одному чанку на пачку."""
+    adapter = TypeAdapter(schema)
+    async for batch in batches:
+        yield b''.join(
+            adapter.dump_json(adapter.validate_python(row)) + b'\n'
+            for row in batch
+        )
+
+
+async def iter_csv(
+    schema: type[BaseModel],
+    batches: AsyncIterator[list[dict[str, Any]]],
+) -> AsyncIterator[str]:
+    """Кодирует пачки строк в CSV с заголовком из полей схемы."""
+    adapter = TypeAdapter(schema)
+    fieldnames = list(schema.model_fields)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    yield buffer.getvalue()
+    async for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            adapter.dump_python(adapter.validate_python(row), mode='json')
+            for row in batch
+        )
+        yield buffer.getvalue()
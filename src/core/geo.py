@@ -0,0 +1,127 @@
+import math
+from typing import Any, Iterable, Optional
+
+EARTH_RADIUS_KM = 6371.0088
+
+LOCATION_SQL = (
+    'geography(ST_SetSRID(ST_MakePoint(cafe.longitude, cafe.latitude), 4326))'
+)
+"""Точка кафе в PostGIS, общая для индекса GiST и запроса."""
+
+Point = tuple[float, float, float]
+
+
+def to_unit_vector(latitude: float, longitude: float) -> Point:
+    """Точка на единичной сфере (ECEF) по широте и долготе."""
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    return (
+        math.cos(lat) * math.cos(lon),
+        math.cos(lat) * math.sin(lon),
+        math.sin(lat),
+    )
+
+
+def chord_for_km(distance_km: float) -> float:
+    """Длина хорды единичной сферы для расстояния по поверхности."""
+    angle = min(distance_km / EARTH_RADIUS_KM, math.pi)
+    return 2 * math.sin(angle / 2)
+
+
+def km_for_chord(chord: float) -> float:
+    """Расстояние по поверхности Земли для длины хорды."""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1.0))
+
+
+class GeoIndex:
+    """Пространственный индекс точек в памяти процесса.
+
+    k-d дерево по трем координатам точек на единичной сфере: порядок
+    по длине хорды совпадает с порядком по расстоянию по поверхности,
+    поэтому нет проблем у полюсов и линии перемены дат. Используется,
+    когда в базе нет PostGIS. Дерево строится целиком и перестраивается,
+    когда меняется сигнатура данных.
+    """
+
+    def __init__(self) -> None:
+        """Создает пустой индекс."""
+        self.signature: Any = None
+        self._ids: list[int] = []
+        self._points: list[Point] = []
+        # Узел i - медиана отрезка, потомки в _left[i] и _right[i].
+        self._left: list[int] = []
+        self._right: list[int] = []
+        self._axis: list[int] = []
+        self._root = -1
+        self._next = 0
+
+    def build(
+        self,
+        points: Iterable[tuple[int, float, float]],
+        signature: Any,
+    ) -> None:
+        """Строит дерево по точкам (id, широта, долгота)."""
+        items = [
+            (obj_id, to_unit_vector(latitude, longitude))
+            for obj_id, latitude, longitude in points
+        ]
+        size = len(items)
+        self._ids = [0] * size
+        self._points = [(0.0, 0.0, 0.0)] * size
+        self._left = [-1] * size
+        self._right = [-1] * size
+        self._axis = [0] * size
+        self._next = 0
+        self._root = self._build(items, 0)
+        self.signature = signature
+
+    def _build(self, items: list[tuple[int, Point]], depth: int) -> int:
+        """Строит поддерево и возвращает номер его корня."""
+        if not items:
+            return -1
+        axis = depth % 3
+        items.sort(key=lambda item: item[1][axis])
+        middle = len(items) // 2
+        node = self._next
+        self._next += 1
+        self._ids[node], self._points[node] = items[middle]
+        self._axis[node] = axis
+        self._left[node] = self._build(items[:middle], depth + 1)
+        self._right[node] = self._build(items[middle + 1:], depth + 1)
+        return node
+
+    def within(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: Optional[int] = None,
+    ) -> list[tuple[float, int]]:
+        """Точки в радиусе как (расстояние в км, id), ближайшие первыми."""
+        target = to_unit_vector(latitude, longitude)
+        radius_sq = chord_for_km(radius_km) ** 2
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node < 0:
+                continue
+            point = self._points[node]
+            distance_sq = sum(
+                (a - b) ** 2 for a, b in zip(point, target)
+            )
+            if distance_sq <= radius_sq:
+                found.append((distance_sq, self._ids[node]))
+            delta = target[self._axis[node]] - point[self._axis[node]]
+            near, far = (
+                (self._left[node], self._right[node]) if delta < 0
+                else (self._right[node], self._left[node])
+            )
+            stack.append(near)
+            if delta * delta <= radius_sq:
+                stack.append(far)
+        found.sort()
+        return [
+            (km_for_chord(math.sqrt(distance_sq)), obj_id)
+            for distance_sq, obj_id in found[:limit]
+        ]
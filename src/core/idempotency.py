@@ -0,0 +1,107 @@
+import asyncio
+from hashlib import sha256
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Optional
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from src.core.config import settings
+from src.core.exceptions import AppException, ConflictError
+from src.core.logger import logger
+from src.core.ttl_store import create_ttl_store
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+idempotency_store = create_ttl_store('idempotency')
+
+
+def _fingerprint(payload: BaseModel) -> str:
+    """Отпечаток тела запроса: повтор ключа с другим телом - ошибка."""
+    return sha256(
+        payload.model_dump_json(exclude_unset=True).encode(),
+    ).hexdigest()
+
+
+def _replay(record: Optional[dict[str, Any]], fingerprint: str) -> Any:
+    """Ответ по сохраненной записи ключа."""
+    if record is None or record['state'] == 'pending':
+        raise ConflictError(
+            detail='Запрос с этим ключом идемпотентности еще выполняется',
+        )
+    if record['fingerprint'] != fingerprint:
+        raise AppException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail='Ключ идемпотентности уже использован с другим запросом',
+            code='idempotency_key_reused',
+        )
+    return JSONResponse(
+        record['body'],
+        status_code=record['status_code'],
+        headers={'Idempotent-Replayed': 'true'},
+    )
+
+
+async def _keep_pending(key: str, pending: dict[str, Any]) -> None:
+    """Продлевает ожидающий ключ, пока выполняется обработчик."""
+    ttl = settings.idempotency_pending_ttl_sec
+    while True:
+        await asyncio.sleep(ttl / 2)
+        if not await idempotency_store.extend(key, pending, ttl):
+            logger.warning(
+                'Ключ идемпотентности истек во время выполнения запроса',
+                details={'key': key},
+            )
+            return
+
+
+async def run_idempotent(
+    key: Optional[str],
+    scope: str,
+    payload: BaseModel,
+    handler: Callable[[], Awaitable[Any]],
+    schema: type[BaseModel],
+    status_code: int = HTTPStatus.OK,
+) -> Any:
+    """Выполняет обработчик один раз на ключ идемпотентности.
+
+    Пока запрос выполняется, ключ помечен как pending и повтор получает
+    409. Срок pending продлевается, пока обработчик работает, поэтому
+    idempotency_pending_ttl_sec ограничивает блокировку ключа только
+    после падения воркера посреди запроса. Успешный ответ сохраняется,
+    повтор с тем же телом получает его без обращения к базе. При ошибке
+    ключ снимается, чтобы запрос можно было повторить.
+    """
+    if key is None:
+        return await handler()
+    store_key = f'{scope}:{key}'
+    fingerprint = _fingerprint(payload)
+    pending = {
+        'state': 'pending',
+        'fingerprint': fingerprint,
+        'token': uuid4().hex,
+    }
+    if not await idempotency_store.add(
+        store_key, pending, settings.idempotency_pending_ttl_sec,
+    ):
+        return _replay(await idempotency_store.get(store_key), fingerprint)
+    keeper = asyncio.create_task(_keep_pending(store_key, pending))
+    try:
+        result = await handler()
+    except BaseException:
+        await idempotency_store.delete(store_key)
+        raise
+    finally:
+        keeper.cancel()
+    await idempotency_store.set(
+        store_key,
+        {
+            'state': 'done',
+            'fingerprint': fingerprint,
+            'status_code': int(status_code),
+            'body': schema.model_validate(result).model_dump(mode='json'),
+        },
+        settings.idempotency_ttl_sec,
+    )
+    return result
@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+from typing import Any, Iterator
+
+from fastapi import Request
+from pydantic import BaseModel, ValidationError
+
+from src.core.constants import IMPORT_BATCH_SIZE, MAX_IMPORT_ROWS
+from src.core.exceptions import AppException
+
+
+def import_request_body(schema: type[BaseModel]) -> dict[str, Any]:
+    """Описание тела запроса импорта для OpenAPI."""
+    return {
+        'requestBody': {
+            'required': True,
+            'content': {
+                'application/json': {
+                    'schema': {
+                        'type': 'array',
+                        'items': {
+                            '$ref': f'#/components/schemas/{schema.__name__}',
+                        },
+                    },
+                },
+                'text/csv': {'schema': {'type': 'string'}},
+            },
+        },
+    }
+
+
+async def read_import_rows(request: Request) -> list[dict[str, Any]]:
+    """Читает строки импорта из JSON-массива или CSV с заголовком.
+
+    Пустые ячейки CSV пропускаются, чтобы сработали значения
+    по умолчанию из схемы.
+    """
+    body = await request.body()
+    content_type = request.headers.get('content-type', '')
+    if content_type.startswith('text/csv'):
+        reader = csv.DictReader(io.StringIO(body.decode('utf-8-sig')))
+        rows = [
+            {key: value for key, value in row.items() if value != ''}
+            for row in reader
+        ]
+    else:
+        try:
+            rows = json.loads(body)
+        except ValueError:
+            raise AppException(detail='Тело запроса не является JSON')
+        if not isinstance(rows, list) or not all(
+            isinstance(row, dict) for row in rows
+        ):
+            raise AppException(detail='Ожидается JSON-массив объектов')
+    if not rows:
+        raise AppException(detail='Нет строк для импорта')
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise AppException(
+            detail=f'Не больше {MAX_IMPORT_ROWS} строк за один импорт',
+        )
+    return rows
+
+
+def validate_import_rows(
+    schema: type[BaseModel],
+    rows: list[dict[str, Any]],
+) -> tuple[list[tuple[int, BaseModel]], list[dict[str, Any]]]:
+    """Валидирует строки схемой, возвращает валидные строки и ошибки.
+
+    Номера строк начинаются с 1, как в исходном файле без заголовка.
+    """
+    valid: list[tuple[int, BaseModel]] = []
+    errors: list[dict[str, Any]] = []
+    for number, row in enumerate(rows, start=1):
+        try:
+            valid.append((number, schema.model_validate(row)))
+        except ValidationError as error:
+            errors.append({
+                'row': number,
+                'reason': '; '.join(
+                    f"{'.'.join(map(str, item['loc']))}: {item['msg']}"
+                    for item in error.errors()
+                ),
+            })
+    return valid, errors
+
+
+def batched(
+    rows: list[dict[str, Any]],
+    size: int = IMPORT_BATCH_SIZE,
+) -> Iterator[list[dict[str, Any]]]:
+    """Разбивает строки на пачки для многострочных вставок."""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
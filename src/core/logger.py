@@ -109,6 +109,9 @@ class ProjectLogger(logging.Logger):
 
 logging.setLoggerClass(ProjectLogger)
 logger: ProjectLogger = logging.getLogger('central_logger')  # type: ignore
+# Остальные логгеры (SQLAlchemy, uvicorn) остаются обычными: их вызовы
+# с позиционными аргументами не совместимы с ProjectLogger.
+logging.setLoggerClass(logging.Logger)
 
 logging.getLogger("sqlalchemy.engine.Engine").setLevel(logging.WARNING)
 logging.getLogger("sqlalchemy.orm").setLevel(logging.WARNING)
@@ -0,0 +1,118 @@
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.constants import PARTITION_MONTHS_AHEAD
+from src.core.db import advisory_xact_lock
+from src.core.logger import logger
+
+PARTITIONED_TABLES = {
+    'bookingmodel': 'booking_date',
+    'time_slots': 'date',
+}
+"""Таблицы с помесячным секционированием в Postgres и ключ секции."""
+
+
+def month_start(day: date) -> date:
+    """Первое число месяца."""
+    return day.replace(day=1)
+
+
+def add_months(month: date, count: int) -> date:
+    """Сдвигает первое число месяца на count месяцев."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Имя секции таблицы за месяц."""
+    return f'{table}_p{month:%Y_%m}'
+
+
+def partition_ddl(table: str, month: date) -> str:
+    """DDL секции таблицы за месяц."""
+    return (
+        f'CREATE TABLE IF NOT EXISTS {partition_name(table, month)} '
+        f'PARTITION OF {table} '
+        f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+    )
+
+
+async def create_partition(
+    session: AsyncSession,
+    table: str,
+    month: date,
+) -> None:
+    """Создает секцию за месяц, забирая ее строки из секции DEFAULT.
+
+    Бронирования на даты за горизонтом секций попадают в DEFAULT,
+    и пока они там, секцию за их месяц создать нельзя. Тогда DEFAULT
+    отсоединяется, секция создается, строки месяца переносятся в нее,
+    и DEFAULT присоединяется обратно - в транзакции вызывающего.
+    """
+    name = partition_name(table, month)
+    if await session.scalar(text(f"SELECT to_regclass('{name}')")):
+        return
+    default = f'{table}_default'
+    key = PARTITIONED_TABLES[table]
+    in_month = (
+        f"{key} >= '{month}' AND {key} < '{add_months(month, 1)}'"
+    )
+    # Секции за месяц нет, значит его строки могут быть только в DEFAULT.
+    has_rows = await session.scalar(text(
+        f'SELECT EXISTS (SELECT 1 FROM {table} WHERE {in_month})',
+    ))
+    if not has_rows:
+        await session.execute(text(partition_ddl(table, month)))
+        return
+    await session.execute(text(
+        f'ALTER TABLE {table} DETACH PARTITION {default}',
+    ))
+    await session.execute(text(partition_ddl(table, month)))
+    await session.execute(text(
+        f'INSERT INTO {table} SELECT * FROM {default} WHERE {in_month}',
+    ))
+    await session.execute(text(f'DELETE FROM {default} WHERE {in_month}'))
+    await session.execute(text(
+        f'ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT',
+    ))
+    logger.info(
+        'Строки перенесены из секции DEFAULT',
+        details={'table': table, 'partition': name},
+    )
+
+
+async def ensure_partitions(
+    session: AsyncSession,
+    months_ahead: int = PARTITION_MONTHS_AHEAD,
+    today: date | None = None,
+) -> None:
+    """Создает секции на текущий и следующие месяцы.
+
+    Работает только в Postgres и только для уже секционированных таблиц,
+    в SQLite ничего не делает. Узлы сериализуются advisory-блокировкой.
+    """
+    if session.bind.dialect.name != 'postgresql':
+        return
+    await advisory_xact_lock(session, 'ensure_partitions')
+    partitioned = set(PARTITIONED_TABLES) & set(
+        await session.scalars(
+            text(
+                'SELECT c.relname FROM pg_partitioned_table p '
+                'JOIN pg_class c ON c.oid = p.partrelid',
+            ),
+        ),
+    )
+    current = month_start(today or date.today())
+    last = add_months(current, months_ahead)
+    for table in sorted(partitioned):
+        month = current
+        while month <= last:
+            await create_partition(session, table, month)
+            month = add_months(month, 1)
+    await session.commit()
+    logger.info(
+        'Проверены секции таблиц',
+        details={'tables': sorted(partitioned), 'until': last.isoformat()},
+    )
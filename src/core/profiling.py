@@ -0,0 +1,370 @@
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from types import FrameType
+from typing import Any, Optional
+
+from fastapi import HTTPException
+from greenlet import getcurrent, gettrace, settrace
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.auth import authenticate_token
+from src.core.config import settings
+from src.core.constants import PROFILE_MAX_SAMPLES, PROFILE_MAX_STACK_DEPTH
+from src.core.db import AsyncSessionLocal
+from src.core.exceptions import ResourceNotFoundError
+from src.core.logger import logger
+
+PROFILE_HEADER = 'X-Profile'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+PROFILE_SUFFIX = '.speedscope.json'
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+# Кадр, который ставится в стек, пока запрос ждет ввода-вывода.
+AWAIT_FRAME = ('<await>', '', 0)
+
+_PROFILE_ID = re.compile(r'^\d{8}T\d{6}-[0-9a-f]{8}$')
+_ROOT_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+)
+_STDLIB_DIR = os.path.dirname(os.__file__)
+
+# Текущий greenlet каждого потока: кадры внутри greenlet движка
+# не ссылаются на кадры корутины, из которой он запущен.
+_current_greenlets: dict[int, Any] = {}
+_trace_users = 0
+_previous_trace: Any = None
+
+
+def _trace_greenlets(event: str, args: Any) -> None:
+    """Запоминает greenlet, на который переключился поток."""
+    if event in ('switch', 'throw'):
+        _current_greenlets[threading.get_ident()] = args[1]
+    if _previous_trace is not None:
+        _previous_trace(event, args)
+
+
+def _acquire_greenlet_trace() -> None:
+    """Включает слежение за greenlet в потоке цикла событий."""
+    global _trace_users, _previous_trace
+    if _trace_users == 0:
+        _current_greenlets[threading.get_ident()] = getcurrent()
+        _previous_trace = gettrace()
+        settrace(_trace_greenlets)
+    _trace_users += 1
+
+
+def _release_greenlet_trace() -> None:
+    """Выключает слежение, когда профилируемых запросов не осталось."""
+    global _trace_users, _previous_trace
+    _trace_users -= 1
+    if _trace_users == 0:
+        settrace(_previous_trace)
+        _previous_trace = None
+        _current_greenlets.pop(threading.get_ident(), None)
+
+
+class RequestSampler:
+    """Профиль одного запроса по выборке стеков потока цикла событий.
+
+    Отдельный поток раз в interval секунд снимает стек потока цикла.
+    Если в стеке есть корневой кадр запроса, выборка относится к нему.
+    Иначе запрос ждет (ввода-вывода или своей очереди в цикле), и
+    выборкой становится цепочка await его задачи с кадром <await>.
+    """
+
+    def __init__(
+        self,
+        task: asyncio.Task,
+        root: FrameType,
+        interval: float,
+    ) -> None:
+        """Готовит выборку для задачи и корневого кадра запроса."""
+        self.task = task
+        self.root = root
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        self.frames: dict[tuple[str, str, int], int] = {}
+        self.samples: list[tuple[int, ...]] = []
+        self.weights: list[float] = []
+        self.started = self.finished = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name='request-sampler', daemon=True,
+        )
+
+    def start(self) -> None:
+        """Запускает поток выборки."""
+        _acquire_greenlet_trace()
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Останавливает поток выборки и ждет его завершения."""
+        self._stop.set()
+        self._thread.join()
+        self.finished = time.perf_counter()
+        _release_greenlet_trace()
+
+    def _run(self) -> None:
+        last = self.started
+        while not self._stop.wait(self.interval):
+            stack = self._running_stack() or self._waiting_stack()
+            now = time.perf_counter()
+            if stack:
+                self.samples.append(tuple(map(self._frame_index, stack)))
+                self.weights.append((now - last) * 1000)
+            last = now
+            if len(self.samples) >= PROFILE_MAX_SAMPLES:
+                return
+
+    def _running_stack(self) -> Optional[list[tuple[str, str, int]]]:
+        """Стек от корня запроса, если поток цикла сейчас выполняет его."""
+        frame = sys._current_frames().get(self.thread_id)
+        greenlet = _current_greenlets.get(self.thread_id)
+        stack = []
+        while len(stack) < PROFILE_MAX_STACK_DEPTH:
+            if frame is None:
+                parent = getattr(greenlet, 'parent', None)
+                if parent is None:
+                    return None
+                frame, greenlet = parent.gr_frame, parent
+                continue
+            stack.append(_frame_key(frame))
+            if frame is self.root:
+                return stack[::-1]
+            frame = frame.f_back
+        return None
+
+    def _waiting_stack(self) -> Optional[list[tuple[str, str, int]]]:
+        """Цепочка await задачи от корня запроса, если она ждет."""
+        coro: Any = self.task.get_coro()
+        stack: list[tuple[str, str, int]] = []
+        while coro is not None and len(stack) < PROFILE_MAX_STACK_DEPTH:
+            frame = getattr(coro, 'cr_frame', None) or getattr(
+                coro, 'gi_frame', None,
+            )
+            if frame is None:
+                break
+            if stack or frame is self.root:
+                stack.append(_frame_key(frame))
+            coro = getattr(coro, 'cr_await', None) or getattr(
+                coro, 'gi_yieldfrom', None,
+            )
+        return stack + [AWAIT_FRAME] if stack else None
+
+    def _frame_index(self, key: tuple[str, str, int]) -> int:
+        return self.frames.setdefault(key, len(self.frames))
+
+    def to_speedscope(self, name: str) -> dict[str, Any]:
+        """Профиль в формате speedscope (тип sampled, миллисекунды)."""
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': settings.app_title,
+            'activeProfileIndex': 0,
+            'shared': {
+                'frames': [
+                    {'name': func, 'file': path, 'line': line}
+                    for func, path, line in self.frames
+                ],
+            },
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'milliseconds',
+                'startValue': 0,
+                'endValue': round((self.finished - self.started) * 1000, 3),
+                'samples': [list(sample) for sample in self.samples],
+                'weights': [round(weight, 3) for weight in self.weights],
+            }],
+        }
+
+
+def _frame_key(frame: FrameType) -> tuple[str, str, int]:
+    """Функция, файл относительно проекта или пакета и строка начала."""
+    code = frame.f_code
+    path = code.co_filename
+    if 'site-packages' + os.sep in path:
+        path = path.rpartition('site-packages' + os.sep)[2]
+    elif path.startswith(_ROOT_DIR):
+        path = os.path.relpath(path, _ROOT_DIR)
+    elif path.startswith(_STDLIB_DIR):
+        path = os.path.relpath(path, _STDLIB_DIR)
+    return code.co_name, path, code.co_firstlineno
+
+
+def to_collapsed(profile: dict[str, Any]) -> str:
+    """Профиль speedscope в свернутые стеки для flamegraph.pl."""
+    frames = profile['shared']['frames']
+    counts: Counter[str] = Counter()
+    for sample in profile['profiles'][0]['samples']:
+        counts[';'.join(
+            f'{frames[index]["name"]} ({frames[index]["file"]}'
+            f':{frames[index]["line"]})'
+            for index in sample
+        )] += 1
+    return ''.join(f'{stack} {count}\n' for stack, count in counts.items())
+
+
+class ProfileStore:
+    """Кольцевой буфер профилей в каталоге: хранятся последние max_files."""
+
+    def __init__(self, directory: str, max_files: int) -> None:
+        """Запоминает каталог и размер буфера."""
+        self.directory = directory
+        self.max_files = max_files
+
+    @staticmethod
+    def new_id() -> str:
+        """ID профиля: время UTC и случайный суффикс, по порядку записи."""
+        now = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+        return f'{now}-{uuid.uuid4().hex[:8]}'
+
+    def _path(self, profile_id: str) -> str:
+        if not _PROFILE_ID.match(profile_id):
+            raise ResourceNotFoundError('Профиль')
+        return os.path.join(self.directory, profile_id + PROFILE_SUFFIX)
+
+    def _ids(self) -> list[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            name[:-len(PROFILE_SUFFIX)]
+            for name in os.listdir(self.directory)
+            if name.endswith(PROFILE_SUFFIX)
+        )
+
+    def save(self, profile_id: str, profile: dict[str, Any]) -> None:
+        """Записывает профиль и удаляет самые старые сверх max_files."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(profile_id)
+        with open(path + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump(profile, file, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+        for old_id in self._ids()[:-self.max_files]:
+            try:
+                os.remove(self._path(old_id))
+            except FileNotFoundError:
+                pass
+
+    def load(self, profile_id: str) -> dict[str, Any]:
+        """Профиль по ID в формате speedscope."""
+        try:
+            with open(self._path(profile_id), encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            raise ResourceNotFoundError('Профиль')
+
+    def list(self) -> list[dict[str, Any]]:
+        """Сведения о профилях, новые первыми."""
+        items = []
+        for profile_id in reversed(self._ids()):
+            try:
+                profile = self.load(profile_id)
+                size = os.path.getsize(self._path(profile_id))
+            except (ResourceNotFoundError, ValueError, OSError):
+                continue
+            sampled = profile['profiles'][0]
+            items.append({
+                'id': profile_id,
+                'created_at': datetime.strptime(
+                    profile_id[:15], '%Y%m%dT%H%M%S',
+                ).replace(tzinfo=timezone.utc),
+                'name': profile['name'],
+                'duration_ms': sampled['endValue'],
+                'samples': len(sampled['samples']),
+                'size': size,
+            })
+        return items
+
+
+profile_store = ProfileStore(settings.profile_dir, settings.profile_max_files)
+
+
+async def _is_admin_token(scope: Scope) -> bool:
+    """Передан ли в запросе токен активного администратора."""
+    scheme, _, token = Headers(scope=scope).get(
+        'authorization', '',
+    ).partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return False
+    async with AsyncSessionLocal() as session:
+        try:
+            user = await authenticate_token(token, session)
+        except HTTPException:
+            return False
+    return user.is_superuser
+
+
+class ProfilingMiddleware:
+    """Профилирует запрос выборкой стеков и сохраняет профиль на диск.
+
+    Профилируются запросы с заголовком X-Profile: 1 и токеном
+    администратора, а также доля profile_sample_rate остальных.
+    ID сохраненного профиля возвращается в заголовке X-Profile-Id.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Оборачивает приложение ASGI."""
+        self.app = app
+
+    async def _should_profile(self, scope: Scope) -> bool:
+        if Headers(scope=scope).get(PROFILE_HEADER) in ('1', 'true'):
+            return await _is_admin_token(scope)
+        return random.random() < settings.profile_sample_rate
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Выполняет запрос, при выборке - под профилировщиком."""
+        if scope['type'] != 'http' or not await self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        profile_id = profile_store.new_id()
+
+        async def send_with_id(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                message.setdefault('headers', []).append((
+                    PROFILE_ID_HEADER.lower().encode(),
+                    profile_id.encode(),
+                ))
+            await send(message)
+
+        sampler = RequestSampler(
+            asyncio.current_task(),
+            sys._getframe(),
+            settings.profile_interval_ms / 1000,
+        )
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            route = getattr(scope.get('route'), 'path', scope['path'])
+            name = f'{scope["method"]} {route}'
+            await run_in_threadpool(
+                profile_store.save,
+                profile_id,
+                sampler.to_speedscope(name),
+            )
+            logger.info(
+                'Сохранен профиль запроса',
+                details={
+                    'profile_id': profile_id,
+                    'route': name,
+                    'samples': len(sampler.samples),
+                },
+            )
@@ -0,0 +1,177 @@
+import os
+import sys
+import traceback
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from greenlet import getcurrent
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.constants import QUERY_BUDGET_STACK_DEPTH
+from src.core.db import engine
+from src.core.logger import logger
+
+QUERY_COUNT_HEADER = 'X-Query-Count'
+
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Запрос к API выполнил больше SQL-запросов, чем разрешено.
+
+    Нарочно не AppException: в тестах ошибка должна уронить запрос,
+    а не превратиться в ответ 400.
+    """
+
+
+class QueryStats:
+    """Счетчик SQL-запросов одного запроса к API."""
+
+    def __init__(self, scope: Scope) -> None:
+        """Создает пустой счетчик для запроса."""
+        self.scope = scope
+        self.statements = 0
+        self.loads: Counter[str] = Counter()
+        self.stack: Optional[list[str]] = None
+        self._budget: Optional[int] = None
+
+    @property
+    def route(self) -> str:
+        """Метод и шаблон пути маршрута, пока маршрут не найден - путь."""
+        route = self.scope.get('route')
+        path = getattr(route, 'path', self.scope.get('path'))
+        return f'{self.scope.get("method")} {path}'
+
+    @property
+    def budget(self) -> int:
+        """Бюджет маршрута из настроек или бюджет по умолчанию.
+
+        Маршрут известен только после роутинга, поэтому бюджет
+        вычисляется при первом обращении и запоминается.
+        """
+        if self._budget is None:
+            self._budget = settings.query_budgets.get(
+                self.route, settings.query_budget_default,
+            )
+        return self._budget
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar(
+    'query_stats', default=None,
+)
+
+
+def _stack_sample() -> list[str]:
+    """Кадры кода приложения, из которого выполнен запрос к базе.
+
+    Асинхронный движок выполняет запрос в отдельном greenlet, поэтому
+    кадры корутин приложения берутся из стека родительского greenlet.
+    """
+    parent = getcurrent().parent
+    frame = parent.gr_frame if parent is not None else sys._getframe()
+    frames = [
+        frame for frame in traceback.extract_stack(frame)
+        if frame.filename.startswith(_SRC_DIR)
+        and frame.filename != __file__
+    ]
+    return [
+        f'{os.path.relpath(frame.filename, _SRC_DIR)}:{frame.lineno} '
+        f'{frame.name}'
+        for frame in frames[-QUERY_BUDGET_STACK_DEPTH:]
+    ]
+
+
+def _on_statement(*args: Any) -> None:
+    """Считает запрос; при превышении бюджета запоминает стек."""
+    stats = _current.get()
+    if stats is None:
+        return
+    stats.statements += 1
+    if stats.statements == stats.budget + 1:
+        stats.stack = _stack_sample()
+        if settings.query_budget_mode == 'raise':
+            raise QueryBudgetExceeded(
+                f'{stats.route}: больше {stats.budget} SQL-запросов; '
+                f'загрузки связей: {dict(stats.loads.most_common(5))}; '
+                f'стек: {stats.stack}',
+            )
+
+
+def _on_orm_execute(state: ORMExecuteState) -> None:
+    """Запоминает, какая связь вызвала загрузку (lazy, selectin)."""
+    stats = _current.get()
+    if stats is None or not state.is_relationship_load:
+        return
+    # Путь чередует мапперы и связи: Mapper, связь, Mapper, связь...
+    chain = ' -> '.join(
+        str(prop) for prop in state.loader_strategy_path.path[1::2]
+    )
+    stats.loads[chain] += 1
+
+
+def install_query_budget() -> None:
+    """Подключает обработчики событий движка и сессий."""
+    if not event.contains(
+        engine.sync_engine, 'before_cursor_execute', _on_statement,
+    ):
+        event.listen(
+            engine.sync_engine, 'before_cursor_execute', _on_statement,
+        )
+        event.listen(Session, 'do_orm_execute', _on_orm_execute)
+
+
+class QueryBudgetMiddleware:
+    """Считает SQL-запросы каждого HTTP-запроса и сверяет с бюджетом.
+
+    Число запросов отдается в заголовке X-Query-Count. При превышении
+    бюджета в режиме log пишется предупреждение с загрузками связей
+    и стеком, в режиме raise запрос падает с QueryBudgetExceeded
+    в момент лишнего запроса.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Оборачивает приложение ASGI."""
+        self.app = app
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        """Выполняет запрос со своим счетчиком."""
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats(scope)
+
+        async def send_with_count(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                message.setdefault('headers', []).append((
+                    QUERY_COUNT_HEADER.lower().encode(),
+                    str(stats.statements).encode(),
+                ))
+            await send(message)
+
+        token = _current.set(stats)
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _current.reset(token)
+            if stats.statements > stats.budget:
+                logger.warning(
+                    'Превышен бюджет SQL-запросов',
+                    details={
+                        'route': stats.route,
+                        'budget': stats.budget,
+                        'statements': stats.statements,
+                        'relationship_loads': dict(
+                            stats.loads.most_common(10),
+                        ),
+                        'stack': stats.stack,
+                    },
+                )
@@ -0,0 +1,385 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.core.config import settings
+from src.core.db import engine
+from src.core.logger import logger
+
+Handler = Callable[[dict[str, Any]], None]
+ReconnectHandler = Callable[[], None]
+
+RECONNECT_DELAY_SEC = 1.0
+RECONNECT_MAX_DELAY_SEC = 30.0
+
+
+def deliver(handler: Handler, channel: str, payload: str | bytes) -> None:
+    """Передает сообщение шины обработчику.
+
+    Битое сообщение или ошибка обработчика логируются и не
+    останавливают прослушивание канала.
+    """
+    try:
+        handler(json.loads(payload))
+    except Exception as error:
+        logger.error(
+            'Ошибка обработки сообщения шины',
+            details={'channel': channel, 'error': repr(error)},
+        )
+
+
+async def reconnect(
+    channel: str,
+    connect: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Повторяет подключение к каналу с растущей паузой до успеха."""
+    delay = RECONNECT_DELAY_SEC
+    while True:
+        await asyncio.sleep(delay)
+        try:
+            result = await connect()
+        except Exception as error:
+            logger.error(
+                'Не удалось переподключиться к шине',
+                details={'channel': channel, 'error': repr(error)},
+            )
+            delay = min(delay * 2, RECONNECT_MAX_DELAY_SEC)
+            continue
+        logger.info(
+            'Восстановлено подключение к шине',
+            details={'channel': channel},
+        )
+        return result
+
+
+class Subscription:
+    """Подписка клиента на канал кафе и даты с ограниченной очередью.
+
+    Если клиент не успевает читать, накопленные события отбрасываются
+    и вместо них кладется одно событие resync: клиент должен заново
+    запросить снимок занятости.
+    """
+
+    def __init__(self, cafe_id: int, day: date, maxsize: int) -> None:
+        """Создает подписку с очередью заданного размера."""
+        self.cafe_id = cafe_id
+        self.day = day
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize)
+
+    def put(self, event: dict[str, Any]) -> None:
+        """Кладет событие, не блокируя публикацию."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.resync()
+
+    def resync(self) -> None:
+        """Заменяет накопленные события одним событием resync."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait({
+            'type': 'resync',
+            'cafe_id': self.cafe_id,
+            'date': self.day.isoformat(),
+        })
+
+    async def get(self) -> dict[str, Any]:
+        """Ждет следующее событие."""
+        return await self.queue.get()
+
+
+class LocalBus:
+    """Шина внутри одного процесса."""
+
+    def __init__(self, handler: Optional[Handler] = None) -> None:
+        """Создает шину, обработчик можно передать сразу."""
+        self._handler = handler
+
+    async def start(
+        self,
+        handler: Handler,
+        on_reconnect: Optional[ReconnectHandler] = None,
+    ) -> None:
+        """Запоминает обработчик входящих сообщений.
+
+        Локальная шина не теряет сообщений, on_reconnect не вызывается.
+        """
+        self._handler = handler
+
+    async def publish(self, message: dict[str, Any]) -> None:
+        """Сразу передает сообщение обработчику."""
+        if self._handler is not None:
+            self._handler(message)
+
+    async def stop(self) -> None:
+        """Отключает обработчик."""
+        self._handler = None
+
+
+class RedisBus:
+    """Шина между воркерами через Redis pub/sub."""
+
+    def __init__(self, url: str, channel: str) -> None:
+        """Создает клиента Redis для канала."""
+        self._redis = Redis.from_url(url)
+        self._channel = channel
+        self._task: Optional[asyncio.Task] = None
+
+    async def _subscribe(self) -> PubSub:
+        """Новая подписка на канал."""
+        pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self._channel)
+        return pubsub
+
+    async def _listen(
+        self,
+        pubsub: PubSub,
+        handler: Handler,
+        on_reconnect: Optional[ReconnectHandler],
+    ) -> None:
+        """Слушает канал и переподписывается при потере соединения.
+
+        Сообщения, опубликованные без подписки, потеряны, поэтому после
+        переподключения вызывается on_reconnect.
+        """
+        try:
+            while True:
+                try:
+                    async for message in pubsub.listen():
+                        deliver(handler, self._channel, message['data'])
+                    error = 'подписка закрыта'
+                except Exception as listen_error:
+                    error = repr(listen_error)
+                logger.error(
+                    'Потеряна подписка на канал Redis',
+                    details={'channel': self._channel, 'error': error},
+                )
+                await pubsub.aclose()
+                pubsub = await reconnect(self._channel, self._subscribe)
+                if on_reconnect is not None:
+                    on_reconnect()
+        finally:
+            await pubsub.aclose()
+
+    async def start(
+        self,
+        handler: Handler,
+        on_reconnect: Optional[ReconnectHandler] = None,
+    ) -> None:
+        """Подписывается на канал и слушает его в фоне."""
+        pubsub = await self._subscribe()
+        self._task = asyncio.create_task(
+            self._listen(pubsub, handler, on_reconnect),
+            name='realtime:redis',
+        )
+
+    async def publish(self, message: dict[str, Any]) -> None:
+        """Публикует сообщение в канал."""
+        await self._redis.publish(self._channel, json.dumps(message))
+
+    async def stop(self) -> None:
+        """Отписывается и закрывает соединение."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._redis.aclose()
+
+
+class PostgresBus:
+    """Шина между воркерами через LISTEN/NOTIFY Postgres.
+
+    Слушающее соединение берется из пула движка, но в пул не
+    возвращается: при остановке или обрыве оно закрывается.
+    """
+
+    def __init__(self, channel: str) -> None:
+        """Создает шину для канала."""
+        self._channel = channel
+        self._connection: Optional[AsyncConnection] = None
+        self._driver: Any = None
+        self._lost = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._handler: Optional[Handler] = None
+
+    def _on_notify(
+        self,
+        connection: Any,
+        pid: int,
+        channel: str,
+        payload: str,
+    ) -> None:
+        """Передает уведомление обработчику шины."""
+        deliver(self._handler, channel, payload)
+
+    def _on_terminate(self, connection: Any) -> None:
+        """Отмечает обрыв слушающего соединения."""
+        self._lost.set()
+
+    async def _listen(self) -> None:
+        """Открывает соединение и выполняет LISTEN на канал."""
+        self._lost.clear()
+        self._connection = await engine.connect()
+        raw = await self._connection.get_raw_connection()
+        self._driver = raw.driver_connection
+        self._driver.add_termination_listener(self._on_terminate)
+        await self._driver.add_listener(self._channel, self._on_notify)
+
+    async def _release(self) -> None:
+        """Снимает LISTEN и закрывает соединение, не возвращая в пул."""
+        connection, driver = self._connection, self._driver
+        self._connection = self._driver = None
+        if connection is None:
+            return
+        driver.remove_termination_listener(self._on_terminate)
+        try:
+            if not driver.is_closed():
+                await driver.remove_listener(self._channel, self._on_notify)
+        except Exception as error:
+            logger.error(
+                'Ошибка отписки от канала Postgres',
+                details={'channel': self._channel, 'error': repr(error)},
+            )
+        await connection.invalidate()
+        await connection.close()
+
+    async def _watch(self, on_reconnect: Optional[ReconnectHandler]) -> None:
+        """Переподключается при обрыве слушающего соединения."""
+        while True:
+            await self._lost.wait()
+            logger.error(
+                'Потеряно соединение LISTEN Postgres',
+                details={'channel': self._channel},
+            )
+            await self._release()
+            await reconnect(self._channel, self._listen)
+            if on_reconnect is not None:
+                on_reconnect()
+
+    async def start(
+        self,
+        handler: Handler,
+        on_reconnect: Optional[ReconnectHandler] = None,
+    ) -> None:
+        """Держит отдельное соединение asyncpg с LISTEN на канал.
+
+        Уведомления, отправленные во время обрыва, потеряны, поэтому
+        после переподключения вызывается on_reconnect.
+        """
+        self._handler = handler
+        await self._listen()
+        self._task = asyncio.create_task(
+            self._watch(on_reconnect), name='realtime:postgres',
+        )
+
+    async def publish(self, message: dict[str, Any]) -> None:
+        """Отправляет NOTIFY отдельной короткой транзакцией."""
+        async with engine.begin() as connection:
+            await connection.execute(
+                text('SELECT pg_notify(:channel, :payload)'),
+                {'channel': self._channel, 'payload': json.dumps(message)},
+            )
+
+    async def stop(self) -> None:
+        """Останавливает переподключение и закрывает соединение."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._release()
+
+
+def create_bus(channel: str) -> LocalBus | RedisBus | PostgresBus:
+    """Создает шину для канала по настройке realtime_bus."""
+    if settings.realtime_bus == 'redis':
+        return RedisBus(settings.redis_url, channel)
+    if settings.realtime_bus == 'postgres':
+        return PostgresBus(channel)
+    return LocalBus()
+
+
+class AvailabilityHub:
+    """Раздает события занятости подписчикам кафе и даты.
+
+    События публикуются в шину, каждый воркер получает их из шины
+    и раздает своим подписчикам.
+    """
+
+    def __init__(self) -> None:
+        """Создает хаб без подписчиков."""
+        self._channels: dict[tuple[int, str], set[Subscription]] = {}
+        self._bus: LocalBus | RedisBus | PostgresBus = LocalBus(self.dispatch)
+        self._started = False
+
+    async def start(self) -> None:
+        """Подключает хаб к шине из настроек."""
+        self._bus = create_bus(settings.realtime_channel)
+        await self._bus.start(self.dispatch, self.resync)
+        self._started = True
+        logger.info(
+            'Запущена шина событий занятости',
+            details={'bus': settings.realtime_bus},
+        )
+
+    async def stop(self) -> None:
+        """Отключает хаб от шины."""
+        if self._started:
+            await self._bus.stop()
+            self._bus = LocalBus(self.dispatch)
+            self._started = False
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        cafe_id: int,
+        day: date,
+    ) -> AsyncIterator[Subscription]:
+        """Подписка на события кафе за дату на время контекста."""
+        key = (cafe_id, day.isoformat())
+        subscription = Subscription(
+            cafe_id, day, settings.realtime_queue_size,
+        )
+        self._channels.setdefault(key, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._channels.get(key, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._channels.pop(key, None)
+
+    def dispatch(self, event: dict[str, Any]) -> None:
+        """Раздает событие из шины подписчикам канала."""
+        key = (event['cafe_id'], event['date'])
+        for subscription in list(self._channels.get(key, ())):
+            subscription.put(event)
+
+    def resync(self) -> None:
+        """Просит всех подписчиков запросить снимок занятости заново.
+
+        Вызывается после переподключения шины: события за время
+        обрыва потеряны.
+        """
+        for subscriptions in list(self._channels.values()):
+            for subscription in list(subscriptions):
+                subscription.resync()
+
+    async def publish(self, event: dict[str, Any]) -> None:
+        """Публикует событие, ошибки шины не ломают запрос."""
+        try:
+            await self._bus.publish(event)
+        except Exception as error:
+            logger.error(
+                'Ошибка публикации события занятости',
+                details={'error': repr(error)},
+            )
+
+
+availability_hub = AvailabilityHub()
@@ -0,0 +1,81 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from src.core.logger import logger
+
+JobFunc = Callable[[], Awaitable[None]]
+
+
+@dataclass
+class Job:
+    """Периодическая задача планировщика."""
+
+    name: str
+    func: JobFunc
+    interval: float
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+
+class Scheduler:
+    """Планировщик периодических задач внутри процесса приложения.
+
+    Заменяет отдельный брокер: каждая задача крутится в своей
+    asyncio-задаче. Задачи должны быть идемпотентны, так как на
+    нескольких узлах они выполняются параллельно.
+    """
+
+    def __init__(self) -> None:
+        """Создает пустой реестр задач."""
+        self._jobs: dict[str, Job] = {}
+
+    @property
+    def jobs(self) -> list[Job]:
+        """Зарегистрированные задачи."""
+        return list(self._jobs.values())
+
+    def add_job(self, name: str, func: JobFunc, interval: float) -> None:
+        """Регистрирует задачу, повторная регистрация заменяет прежнюю."""
+        self._jobs[name] = Job(name=name, func=func, interval=interval)
+
+    async def run_job(self, name: str) -> None:
+        """Однократно выполняет задачу по имени."""
+        await self._jobs[name].func()
+
+    async def _loop(self, job: Job) -> None:
+        """Выполняет задачу с заданным интервалом до остановки."""
+        while True:
+            try:
+                await job.func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                logger.error(
+                    'Ошибка фоновой задачи',
+                    details={'job': job.name, 'error': repr(error)},
+                )
+            await asyncio.sleep(job.interval)
+
+    def start(self) -> None:
+        """Запускает все зарегистрированные задачи."""
+        for job in self._jobs.values():
+            if job.task is None or job.task.done():
+                job.task = asyncio.create_task(
+                    self._loop(job), name=f'job:{job.name}',
+                )
+                logger.info(
+                    'Запущена фоновая задача',
+                    details={'job': job.name, 'interval': job.interval},
+                )
+
+    async def stop(self) -> None:
+        """Останавливает задачи и дожидается их завершения."""
+        tasks = [job.task for job in self._jobs.values() if job.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self._jobs.values():
+            job.task = None
+
+
+scheduler = Scheduler()
@@ -0,0 +1,159 @@
+import base64
+import binascii
+import json
+import re
+from collections import Counter
+from decimal import Decimal
+from typing import Any, Iterable, NamedTuple, Optional
+
+from src.core.constants import SEARCH_MIN_SIMILARITY, SEARCH_TS_CONFIG
+from src.core.exceptions import AppException
+
+SEARCH_COLUMNS = {
+    'cafe': ('name', 'address', 'description'),
+    'dish': ('name', 'description'),
+}
+"""Поля поиска по таблицам; порядок совпадает с индексом tsvector."""
+
+FIELD_WEIGHTS = {'name': Decimal(1), 'address': Decimal('0.6'),
+                 'description': Decimal('0.4')}
+"""Вес совпадения по полю в ранге поиска без Postgres."""
+
+RANK_PLACES = Decimal('0.000001')
+
+_WORD = re.compile(r'\w+')
+
+
+def document_sql(table: str) -> str:
+    """Выражение tsvector по полям таблицы, общее для индекса и запроса."""
+    text = " || ' ' || ".join(
+        f"coalesce({table}.{column}, '')"
+        for column in SEARCH_COLUMNS[table]
+    )
+    return f"to_tsvector('{SEARCH_TS_CONFIG}', {text})"
+
+
+def like_pattern(query: str) -> str:
+    """Шаблон ILIKE для подстроки, спецсимволы экранируются обратной косой."""
+    escaped = (
+        query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    )
+    return f'%{escaped}%'
+
+
+def normalize(text: Optional[str]) -> str:
+    """Приводит текст к нижнему регистру и заменяет ё на е."""
+    return (text or '').casefold().replace('ё', 'е')
+
+
+def trigrams(text: str) -> set[str]:
+    """Триграммы слов текста, как в pg_trgm: слово дополняется пробелами."""
+    result = set()
+    for word in _WORD.findall(text):
+        padded = f'  {word} '
+        result.update(
+            padded[index:index + 3] for index in range(len(padded) - 2)
+        )
+    return result
+
+
+def encode_cursor(rank: Decimal, kind: str, obj_id: int) -> str:
+    """Курсор keyset-пагинации по последней выданной записи."""
+    raw = json.dumps([str(rank), kind, obj_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[Decimal, str, int]:
+    """Разбирает курсор, неверный курсор - ошибка запроса."""
+    try:
+        rank, kind, obj_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return Decimal(rank), str(kind), int(obj_id)
+    except (binascii.Error, ValueError, TypeError, ArithmeticError):
+        raise AppException(detail='Неверный курсор поиска')
+
+
+class SearchDocument(NamedTuple):
+    """Документ индекса: кафе или блюдо."""
+
+    kind: str
+    id: int
+    cafe_id: int
+    name: str
+    fields: dict[str, str]
+
+
+class TrigramIndex:
+    """Инвертированный индекс триграмм в памяти процесса.
+
+    Используется вместо pg_trgm и tsvector, когда база не Postgres.
+    Индекс строится целиком и перестраивается, когда меняется
+    сигнатура данных (число строк и время последнего изменения).
+    """
+
+    def __init__(self) -> None:
+        """Создает пустой индекс."""
+        self.signature: Any = None
+        self._documents: list[SearchDocument] = []
+        self._trigrams: list[dict[str, set[str]]] = []
+        self._postings: dict[str, list[int]] = {}
+
+    def build(
+        self,
+        documents: Iterable[SearchDocument],
+        signature: Any,
+    ) -> None:
+        """Строит индекс по документам."""
+        self._documents = []
+        self._trigrams = []
+        postings: dict[str, list[int]] = {}
+        for position, document in enumerate(documents):
+            fields = {
+                name: normalize(value)
+                for name, value in document.fields.items()
+            }
+            self._documents.append(document._replace(fields=fields))
+            field_trigrams = {
+                name: trigrams(value) for name, value in fields.items()
+            }
+            self._trigrams.append(field_trigrams)
+            for trigram in set().union(*field_trigrams.values()):
+                postings.setdefault(trigram, []).append(position)
+        self._postings = postings
+        self.signature = signature
+
+    def search(self, query: str) -> list[tuple[Decimal, SearchDocument]]:
+        """Документы, похожие на запрос, с рангом.
+
+        Ранг поля - 1 при вхождении подстроки, иначе доля триграмм
+        запроса, найденных в поле. Ранг документа - лучший ранг поля
+        с учетом веса поля.
+        """
+        query = normalize(query).strip()
+        query_trigrams = trigrams(query)
+        if not query_trigrams:
+            return []
+        hits = Counter(
+            position
+            for trigram in query_trigrams
+            for position in self._postings.get(trigram, ())
+        )
+        threshold = SEARCH_MIN_SIMILARITY * len(query_trigrams)
+        results = []
+        for position, count in hits.items():
+            # Совпадений по документу не меньше, чем по любому его полю.
+            if count < threshold:
+                continue
+            document = self._documents[position]
+            scores = {
+                name: Decimal(1) if query in value else Decimal(
+                    len(query_trigrams & self._trigrams[position][name]),
+                ) / len(query_trigrams)
+                for name, value in document.fields.items()
+            }
+            if max(scores.values()) < SEARCH_MIN_SIMILARITY:
+                continue
+            rank = max(
+                FIELD_WEIGHTS[name] * score for name, score in scores.items()
+            )
+            results.append((rank.quantize(RANK_PLACES), document))
+        return results
@@ -0,0 +1,33 @@
+from http import HTTPStatus
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class FastJSONResponse(Response):
+    """JSON-ответ с уже сериализованным телом."""
+
+    media_type = 'application/json'
+
+
+def dump_json(adapter: TypeAdapter, content: Any) -> bytes:
+    """Валидирует объекты заранее собранным адаптером и отдает JSON-байты.
+
+    Валидация и сериализация выполняются одним проходом в pydantic-core,
+    без промежуточного jsonable_encoder и json.dumps из FastAPI.
+    """
+    value = adapter.validate_python(content, from_attributes=True)
+    return adapter.dump_json(value)
+
+
+def fast_json_response(
+    adapter: TypeAdapter,
+    content: Any,
+    status_code: int = HTTPStatus.OK,
+) -> FastJSONResponse:
+    """Формирует ответ, минуя повторную обработку через response_model."""
+    return FastJSONResponse(
+        content=dump_json(adapter, content),
+        status_code=status_code,
+    )
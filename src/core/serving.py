@@ -0,0 +1,23 @@
+from typing import Any
+
+from uvicorn_worker import UvicornWorker
+
+from src.core.constants import SHUTDOWN_MARGIN_SEC
+
+
+class AppWorker(UvicornWorker):
+    """Воркер uvicorn для gunicorn с ограниченным ожиданием запросов.
+
+    При остановке (SIGTERM или плавный перезапуск по SIGHUP) воркер
+    перестает принимать соединения и дожидается текущих запросов,
+    например создания бронирования, но не дольше graceful_timeout
+    за вычетом запаса. Оставшиеся запросы отменяются, и lifespan
+    успевает закрыть шины и пул до SIGKILL от gunicorn.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Настраивает uvicorn по конфигурации gunicorn."""
+        super().__init__(*args, **kwargs)
+        self.config.timeout_graceful_shutdown = max(
+            1, self.cfg.graceful_timeout - SHUTDOWN_MARGIN_SEC,
+        )
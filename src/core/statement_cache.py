@@ -0,0 +1,78 @@
+from collections import Counter
+from typing import Any
+
+from sqlalchemy import event
+
+from src.core.db import engine
+
+# Опция выполнения с именем запроса для метрик кеша компиляции:
+# session.execute(stmt, execution_options={QUERY_NAME_OPTION: 'dish.list'})
+QUERY_NAME_OPTION = 'query_name'
+UNNAMED_QUERY = 'other'
+
+
+class StatementCacheStats:
+    """Попадания запросов в кеш компиляции SQLAlchemy по именам запросов.
+
+    Статус берется из контекста выполнения: hit - готовый SQL взят
+    из кеша движка, miss - запрос скомпилирован заново, остальное -
+    запрос не кешируется (DDL, текстовый SQL). Загрузки связей
+    (selectin, lazy) наследуют опции родительского запроса и считаются
+    под его именем, запросы без имени - вместе под именем other.
+    Счетчики свои у каждого воркера.
+    """
+
+    def __init__(self) -> None:
+        """Создает пустые счетчики."""
+        self.counts: dict[str, Counter[str]] = {}
+
+    def __call__(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        """Учитывает статус кеша для запроса к базе."""
+        name = context.execution_options.get(QUERY_NAME_OPTION, UNNAMED_QUERY)
+        self.counts.setdefault(name, Counter())[context.cache_hit.name] += 1
+
+    def report(self) -> dict[str, Any]:
+        """Размер кеша движка и доля попаданий по именам запросов."""
+        cache = engine.sync_engine._compiled_cache
+        queries = []
+        for name, counts in sorted(self.counts.items()):
+            hits = counts['CACHE_HIT']
+            misses = counts['CACHE_MISS']
+            compiled = hits + misses
+            queries.append({
+                'name': name,
+                'hits': hits,
+                'misses': misses,
+                'uncached': sum(counts.values()) - compiled,
+                'hit_ratio': round(hits / compiled, 4) if compiled else None,
+            })
+        return {
+            'size': len(cache) if cache is not None else 0,
+            'capacity': cache.capacity if cache is not None else 0,
+            'queries': queries,
+        }
+
+    def reset(self) -> None:
+        """Обнуляет счетчики."""
+        self.counts.clear()
+
+
+statement_cache_stats = StatementCacheStats()
+
+
+def install_statement_cache_stats() -> None:
+    """Подключает счетчик к событию before_cursor_execute движка."""
+    if not event.contains(
+        engine.sync_engine, 'before_cursor_execute', statement_cache_stats,
+    ):
+        event.listen(
+            engine.sync_engine, 'before_cursor_execute', statement_cache_stats,
+        )
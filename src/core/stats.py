@@ -0,0 +1,178 @@
+from datetime import date, time
+from typing import Any, Sequence
+
+import numpy as np
+
+
+def _seconds(value: time) -> int:
+    """Секунды от начала суток."""
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _time(seconds: int) -> time:
+    """Время из секунд от начала суток."""
+    return time(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+
+def _day_index(values: Sequence[date], date_from: date) -> np.ndarray:
+    """Номера дней относительно начала периода."""
+    ordinals = np.fromiter(
+        map(date.toordinal, values), dtype=np.int64, count=len(values),
+    )
+    return ordinals - date_from.toordinal()
+
+
+def _time_keys(starts: Sequence[time], ends: Sequence[time]) -> np.ndarray:
+    """Ключ интервала слота: начало и конец в одном целом."""
+    seconds = {value: _seconds(value) for value in {*starts, *ends}}
+
+    def to_array(values: Sequence[time]) -> np.ndarray:
+        return np.fromiter(
+            map(seconds.__getitem__, values),
+            dtype=np.int64,
+            count=len(values),
+        )
+
+    return to_array(starts) * 86400 + to_array(ends)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Поэлементное деление с нулем там, где знаменатель нулевой."""
+    result = np.zeros(numerator.shape, dtype=np.float64)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return np.round(result, 4)
+
+
+def aggregate_cafe_stats(
+    date_from: date,
+    date_to: date,
+    daily: Sequence[Any],
+    occupancy: Sequence[Any],
+    dishes: Sequence[Any],
+    slots: Sequence[Any],
+    tables: Sequence[Any],
+) -> dict[str, Any]:
+    """Сводит агрегаты кафе за период векторными операциями NumPy.
+
+    Загрузка считается по парам (слот, стол): доля занятых пар
+    от всех пар активных слотов и активных столов. Пары слотов,
+    отключенных после бронирования, не учитываются, а пары
+    отключенных столов не входят в загрузку по дням и времени.
+    """
+    days_count = (date_to - date_from).days + 1
+    active_tables = sum(1 for table in tables if table.active)
+    slot_ids = {row.id for row in slots}
+    occupancy = [row for row in occupancy if row.slot_id in slot_ids]
+
+    day_bookings = day_guests = day_cancelled = np.zeros(days_count)
+    if daily:
+        index = _day_index([row.date for row in daily], date_from)
+        day_bookings, day_guests, day_cancelled = (
+            np.bincount(
+                index,
+                weights=[getattr(row, name) for row in daily],
+                minlength=days_count,
+            )
+            for name in ('bookings', 'guests', 'cancelled')
+        )
+
+    slot_days = _day_index([row.date for row in slots], date_from)
+    slot_keys = _time_keys(
+        [row.start_time for row in slots],
+        [row.end_time for row in slots],
+    )
+    pair_days = _day_index([row.date for row in occupancy], date_from)
+    pair_keys = _time_keys(
+        [row.start_time for row in occupancy],
+        [row.end_time for row in occupancy],
+    )
+    pair_tables = np.array(
+        [row.table_id for row in occupancy], dtype=np.int64,
+    )
+    counted = np.isin(
+        pair_tables,
+        [table.id for table in tables if table.active],
+    )
+
+    slots_per_day = np.bincount(slot_days, minlength=days_count)
+    pairs_per_day = np.bincount(pair_days[counted], minlength=days_count)
+    capacity_per_day = slots_per_day * active_tables
+
+    keys = np.union1d(slot_keys, pair_keys)
+    slots_per_key = np.bincount(
+        np.searchsorted(keys, slot_keys), minlength=len(keys),
+    )
+    pairs_per_key = np.bincount(
+        np.searchsorted(keys, pair_keys[counted]), minlength=len(keys),
+    )
+
+    table_ids = np.union1d(
+        np.array([table.id for table in tables], dtype=np.int64),
+        pair_tables,
+    )
+    pairs_per_table = np.bincount(
+        np.searchsorted(table_ids, pair_tables), minlength=len(table_ids),
+    )
+    seats = {table.id: table.seats_number for table in tables}
+
+    dish_ids, dish_index = np.unique(
+        np.array([row.dish_id for row in dishes], dtype=np.int64),
+        return_inverse=True,
+    )
+    orders = np.bincount(
+        dish_index,
+        weights=[row.orders for row in dishes],
+        minlength=len(dish_ids),
+    )
+    dish_order = np.argsort(-orders, kind='stable')
+
+    day_mask = (slots_per_day > 0) | (day_bookings > 0) | (day_cancelled > 0)
+    day_utilisation = _ratio(pairs_per_day, capacity_per_day)
+    key_utilisation = _ratio(pairs_per_key, slots_per_key * active_tables)
+    table_utilisation = _ratio(
+        pairs_per_table, np.full(len(table_ids), len(slots)),
+    )
+    return {
+        'date_from': date_from,
+        'date_to': date_to,
+        'bookings': int(day_bookings.sum()),
+        'guests': int(day_guests.sum()),
+        'cancelled': int(day_cancelled.sum()),
+        'utilisation': float(
+            _ratio(pairs_per_day.sum(), capacity_per_day.sum()),
+        ),
+        'days': [
+            {
+                'date': date.fromordinal(date_from.toordinal() + int(day)),
+                'slots': int(slots_per_day[day]),
+                'bookings': int(day_bookings[day]),
+                'guests': int(day_guests[day]),
+                'cancelled': int(day_cancelled[day]),
+                'utilisation': float(day_utilisation[day]),
+            }
+            for day in np.flatnonzero(day_mask)
+        ],
+        'tables': [
+            {
+                'table_id': int(table_id),
+                'seats_number': seats.get(int(table_id)),
+                'bookings': int(pairs_per_table[index]),
+                'utilisation': float(table_utilisation[index]),
+            }
+            for index, table_id in enumerate(table_ids)
+        ],
+        'slots': [
+            {
+                'start_time': _time(int(key) // 86400),
+                'end_time': _time(int(key) % 86400),
+                'slots': int(slots_per_key[index]),
+                'bookings': int(pairs_per_key[index]),
+                'utilisation': float(key_utilisation[index]),
+            }
+            for index, key in enumerate(keys)
+        ],
+        'dishes': [
+            {'dish_id': int(dish_ids[index]), 'orders': int(orders[index])}
+            for index in dish_order
+        ],
+    }
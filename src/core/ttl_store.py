@@ -0,0 +1,199 @@
+import heapq
+import json
+import math
+import time
+from typing import Any, Iterable, Optional
+
+from redis.asyncio import Redis
+
+from src.core.config import settings
+
+
+class MemoryTTLStore:
+    """Ограниченное хранилище ключей со сроком жизни внутри процесса.
+
+    Сроки ключей разные (ожидающий и сохраненный ответ идемпотентности,
+    удержания), поэтому порядок истечения хранится в куче по сроку.
+    Ключи, занятые через add, - это блокировки (ожидающие ключи
+    идемпотентности, пары удержаний): их потеря ведет к двойной записи,
+    поэтому они не вытесняются и не входят в maxsize. При переполнении
+    вытесняются ключи set с ближайшим сроком.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Создает хранилище на maxsize ключей set."""
+        self._maxsize = maxsize
+        self._data: dict[str, tuple[float, Any]] = {}
+        self._expiry: list[tuple[float, str]] = []
+        self._claims: set[str] = set()
+
+    def _remove(self, key: str) -> None:
+        """Удаляет ключ, запись в куче снимется по сроку."""
+        self._data.pop(key, None)
+        self._claims.discard(key)
+
+    def _put(self, key: str, value: Any, expires_at: float) -> None:
+        """Записывает значение и его срок в кучу."""
+        self._data[key] = (expires_at, value)
+        heapq.heappush(self._expiry, (expires_at, key))
+        if len(self._expiry) > 2 * len(self._data) + 1000:
+            self._expiry = [
+                (expires, key) for key, (expires, _) in self._data.items()
+            ]
+            heapq.heapify(self._expiry)
+
+    def _is_current(self, expires_at: float, key: str) -> bool:
+        """Соответствует ли запись кучи текущему сроку ключа."""
+        item = self._data.get(key)
+        return item is not None and item[0] == expires_at
+
+    def _purge(self, now: float) -> None:
+        """Удаляет просроченные ключи в порядке истечения."""
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry)
+            if self._is_current(expires_at, key):
+                self._remove(key)
+
+    def _evict(self) -> None:
+        """Вытесняет ключи set с ближайшим сроком сверх maxsize."""
+        claims = []
+        while (
+            self._expiry
+            and len(self._data) - len(self._claims) > self._maxsize
+        ):
+            expires_at, key = heapq.heappop(self._expiry)
+            if not self._is_current(expires_at, key):
+                continue
+            if key in self._claims:
+                claims.append((expires_at, key))
+            else:
+                self._remove(key)
+        for entry in claims:
+            heapq.heappush(self._expiry, entry)
+
+    def _get(self, key: str, now: float) -> Optional[Any]:
+        """Значение ключа, если он еще не истек."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= now:
+            self._remove(key)
+            return None
+        return value
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Значение ключа или None."""
+        return self._get(key, time.monotonic())
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Значения существующих ключей из списка."""
+        now = time.monotonic()
+        values = {key: self._get(key, now) for key in keys}
+        return {key: value for key, value in values.items()
+                if value is not None}
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Записывает значение на ttl секунд."""
+        now = time.monotonic()
+        self._purge(now)
+        self._claims.discard(key)
+        self._put(key, value, now + ttl)
+        self._evict()
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Занимает ключ, только если его еще нет."""
+        now = time.monotonic()
+        self._purge(now)
+        if self._get(key, now) is not None:
+            return False
+        self._claims.add(key)
+        self._put(key, value, now + ttl)
+        return True
+
+    async def extend(self, key: str, value: Any, ttl: float) -> bool:
+        """Продлевает ключ на ttl секунд, если в нем все еще value."""
+        now = time.monotonic()
+        if self._get(key, now) != value:
+            return False
+        self._put(key, value, now + ttl)
+        return True
+
+    async def delete(self, *keys: str) -> None:
+        """Удаляет ключи."""
+        for key in keys:
+            self._remove(key)
+
+
+EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class RedisTTLStore:
+    """Хранилище ключей со сроком жизни в Redis, общее для воркеров."""
+
+    def __init__(self, url: str, prefix: str) -> None:
+        """Создает клиента Redis, ключи получают префикс."""
+        self._redis = Redis.from_url(url)
+        self._prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f'{self._prefix}:{key}'
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Значение ключа или None."""
+        value = await self._redis.get(self._key(key))
+        return None if value is None else json.loads(value)
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Значения существующих ключей из списка одним MGET."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = await self._redis.mget([self._key(key) for key in keys])
+        return {key: json.loads(value) for key, value in zip(keys, values)
+                if value is not None}
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Записывает значение на ttl секунд."""
+        await self._redis.set(
+            self._key(key), json.dumps(value, default=str),
+            px=math.ceil(ttl * 1000),
+        )
+
+    async def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Записывает значение, только если ключа еще нет (SET NX)."""
+        return bool(await self._redis.set(
+            self._key(key), json.dumps(value, default=str),
+            px=math.ceil(ttl * 1000), nx=True,
+        ))
+
+    async def extend(self, key: str, value: Any, ttl: float) -> bool:
+        """Продлевает ключ на ttl секунд, если в нем все еще value.
+
+        Сравнение и продление выполняются в Redis одним скриптом.
+        """
+        return bool(await self._redis.eval(
+            EXTEND_SCRIPT, 1, self._key(key),
+            json.dumps(value, default=str), math.ceil(ttl * 1000),
+        ))
+
+    async def delete(self, *keys: str) -> None:
+        """Удаляет ключи."""
+        if keys:
+            await self._redis.delete(*(self._key(key) for key in keys))
+
+
+def create_ttl_store(prefix: str) -> MemoryTTLStore | RedisTTLStore:
+    """Создает хранилище по настройке ttl_store.
+
+    Хранилище в памяти видно только своему воркеру, при нескольких
+    воркерах нужен Redis.
+    """
+    if settings.ttl_store == 'redis':
+        return RedisTTLStore(settings.redis_url, prefix)
+    return MemoryTTLStore(settings.ttl_store_max_items)
@@ -0,0 +1,87 @@
+import asyncio
+import importlib
+import time
+from datetime import date
+from datetime import time as time_type
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.auth import get_user_with_cafes
+from src.core.db import AsyncSessionLocal, engine
+from src.core.logger import logger
+from src.crud.booking import booking_crud
+from src.crud.cafe import cafe_crud
+from src.crud.slot import time_slot_crud
+from src.crud.table import table_crud
+
+# Модули, которые не импортируются при старте и грузятся при первом
+# запросе; прогрев загружает их до того, как воркер станет готов.
+DEFERRED_MODULES = ('src.core.stats',)
+
+
+async def warm_pool(connections: int) -> int:
+    """Открывает соединения пула заранее и возвращает их в пул.
+
+    Соединения открываются одновременно, поэтому это разные
+    соединения. Больше размера пула держать нет смысла: лишние
+    закрываются при возврате.
+    """
+    pool_size = getattr(engine.sync_engine.pool, 'size', None)
+    if callable(pool_size):
+        connections = min(connections, pool_size())
+    if connections < 1:
+        return 0
+    opened = await asyncio.gather(
+        *(engine.connect().start() for _ in range(connections)),
+    )
+    try:
+        await asyncio.gather(
+            *(conn.execute(text('SELECT 1')) for conn in opened),
+        )
+    finally:
+        await asyncio.gather(*(conn.close() for conn in opened))
+    return connections
+
+
+async def warm_statements(session: AsyncSession) -> None:
+    """Выполняет горячие запросы чтения с несуществующими ID.
+
+    Строк не находится, но SQLAlchemy компилирует запросы и кладет
+    их в кеш движка, а драйвер готовит их на соединении.
+    """
+    today = date.today()
+    await get_user_with_cafes(session, 0)
+    await cafe_crud.get_with_managers(0, session)
+    await table_crud.get_multi_by_cafe(session, 0)
+    await time_slot_crud.get_multi_by_cafe_and_date(0, today, session)
+    await time_slot_crud.check_time_conflict(
+        0, today, time_type.min, time_type.max, session,
+    )
+    await booking_crud.check_booking_conflicts(session, 0, [0], [0], today)
+    await booking_crud.get_occupied_pairs(session, 0, today)
+    await booking_crud.get_with_relations(0, session)
+
+
+async def warm_up(connections: int, statements: bool) -> dict[str, Any]:
+    """Прогревает воркер до приема трафика и пишет время в лог."""
+    started = time.perf_counter()
+    for name in DEFERRED_MODULES:
+        importlib.import_module(name)
+    modules_done = time.perf_counter()
+    opened = await warm_pool(connections)
+    pool_done = time.perf_counter()
+    if statements:
+        async with AsyncSessionLocal() as session:
+            await warm_statements(session)
+    report = {
+        'connections': opened,
+        'modules_ms': round((modules_done - started) * 1000, 1),
+        'pool_ms': round((pool_done - modules_done) * 1000, 1),
+        'statements_ms': round(
+            (time.perf_counter() - pool_done) * 1000, 1,
+        ),
+    }
+    logger.info('Воркер прогрет', details=report)
+    return report
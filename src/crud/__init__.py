@@ -3,6 +3,11 @@ from .user import user_crud  # noqa
 from .table import table_crud  # noqa
 from .dish import dish_crud  # noqa
 from .slot import time_slot_crud  # noqa
+from .slot_template import slot_template_crud  # noqa
 from .action import action_crud  # noqa
+from .archive import archive_crud  # noqa
+from .stats import stats_crud  # noqa
+from .hold import hold_crud  # noqa
+from .search import search_crud  # noqa
 
 from .booking import booking_crud # noqa
\ No newline at end of file
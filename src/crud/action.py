@@ -1,10 +1,12 @@
 from typing import Optional
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from src.models import Action, Cafe, User
+from src.core.access import AccessScope
+from src.core.statement_cache import QUERY_NAME_OPTION
+from src.models import Action, Cafe
 from src.schemas.action import ActionCreate, ActionUpdate
 
 
@@ -67,34 +69,31 @@ class ActionCRUD:
         session: AsyncSession,
         cafe: Cafe | None,
         active_only: bool,
-        current_user: User,
+        scope: AccessScope,
     ) -> list[Action]:
-        """Получаем список акций с фильтрацией доступа."""
-        query = select(Action).options(
-            selectinload(Action.cafe).selectinload(Cafe.managers),
+        """Получаем список акций с фильтрацией доступа.
+
+        Запрос собирается через lambda_stmt, как список блюд.
+        """
+        stmt = lambda_stmt(
+            lambda: select(Action).options(
+                selectinload(Action.cafe).selectinload(Cafe.managers),
+            ),
         )
 
         if cafe is not None:
-            query = query.where(Action.cafe_id == cafe.id)
+            cafe_id = cafe.id
+            stmt += lambda s: s.where(Action.cafe_id == cafe_id)
         if active_only:
-            query = query.where(
-                Action.active.is_(True),
-            )
-        else:
-            if current_user.is_superuser:
-                pass
-            elif current_user.managed_cafe_ids:
-                query = query.where(
-                    or_(
-                        Action.active.is_(True),
-                        and_(
-                            Action.active.is_(False),
-                            Action.cafe_id.in_(current_user.managed_cafe_ids),
-                        ),
-                    ),
-                )
+            stmt += lambda s: s.where(Action.active.is_(True))
+        elif not scope.is_admin:
+            visible = scope.visible(Action.cafe_id, Action.active)
+            stmt += lambda s: s.where(visible)
 
-        result = await session.execute(query)
+        result = await session.execute(
+            stmt,
+            execution_options={QUERY_NAME_OPTION: 'action.list'},
+        )
         return list(result.scalars().all())
 
 
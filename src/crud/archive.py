@@ -0,0 +1,175 @@
+from datetime import date
+from typing import Any
+
+from sqlalchemy import Table, delete, exists, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.constants import ARCHIVE_BATCH_SIZE
+from src.core.logger import logger
+from src.models.archive import (
+    booking_dishes_archive_table,
+    booking_slots_archive_table,
+    booking_tables_archive_table,
+    bookingmodel_archive_table,
+    time_slots_archive_table,
+)
+from src.models.booking import (
+    BookingModel,
+    BookingStatus,
+    booking_dishes_table,
+    booking_slots_table,
+    booking_tables_table,
+)
+from src.models.slot import TimeSlot
+
+BOOKING_RELATIONS = (
+    (booking_tables_table, booking_tables_archive_table, 'table_id', 'tables'),
+    (booking_slots_table, booking_slots_archive_table, 'slot_id', 'slots'),
+    (booking_dishes_table, booking_dishes_archive_table, 'dish_id', 'menu'),
+)
+"""Связи бронирования: горячая таблица, архив, колонка, поле схемы."""
+
+
+class CRUDArchive:
+    """Перенос старых бронирований и слотов в архивные таблицы."""
+
+    @staticmethod
+    async def _move(
+        session: AsyncSession,
+        source: Table,
+        target: Table,
+        key: Any,
+        ids: list[int],
+    ) -> None:
+        """Копирует строки в архив через INSERT ... SELECT и удаляет их."""
+        columns = [target.c[column.name] for column in source.columns]
+        await session.execute(
+            insert(target).from_select(
+                columns,
+                select(*source.columns).where(key.in_(ids)),
+            ),
+        )
+        await session.execute(delete(source).where(key.in_(ids)))
+
+    async def _lock_batch(
+        self,
+        session: AsyncSession,
+        stmt: Any,
+        batch_size: int,
+    ) -> list[int]:
+        """Выбирает и блокирует пачку ID, пропуская занятые другим узлом."""
+        result = await session.execute(
+            stmt.order_by('id')
+            .limit(batch_size)
+            .with_for_update(skip_locked=True),
+        )
+        return list(result.scalars().all())
+
+    async def archive_bookings(
+        self,
+        session: AsyncSession,
+        before: date,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+    ) -> int:
+        """Переносит в архив бронирования до даты вместе со связями.
+
+        Переносятся завершенные, отмененные и неактивные бронирования.
+        Каждая пачка переносится отдельной транзакцией.
+        """
+        stmt = select(BookingModel.id).where(
+            BookingModel.booking_date < before,
+            (
+                BookingModel.status.in_(
+                    [BookingStatus.COMPLETED, BookingStatus.CANCELLED],
+                )
+                | BookingModel.active.is_(False)
+            ),
+        )
+        total = 0
+        while ids := await self._lock_batch(session, stmt, batch_size):
+            for source, target, _, _ in BOOKING_RELATIONS:
+                await self._move(
+                    session, source, target, source.c.booking_id, ids,
+                )
+            await self._move(
+                session,
+                BookingModel.__table__,
+                bookingmodel_archive_table,
+                BookingModel.id,
+                ids,
+            )
+            await session.commit()
+            total += len(ids)
+            if len(ids) < batch_size:
+                break
+        if total:
+            logger.info(
+                'Бронирования перенесены в архив',
+                details={'count': total, 'before': before.isoformat()},
+            )
+        return total
+
+    async def archive_time_slots(
+        self,
+        session: AsyncSession,
+        before: date,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+    ) -> int:
+        """Переносит в архив прошедшие слоты без горячих бронирований."""
+        stmt = select(TimeSlot.id).where(
+            TimeSlot.date < before,
+            ~exists().where(booking_slots_table.c.slot_id == TimeSlot.id),
+        )
+        total = 0
+        while ids := await self._lock_batch(session, stmt, batch_size):
+            await self._move(
+                session,
+                TimeSlot.__table__,
+                time_slots_archive_table,
+                TimeSlot.id,
+                ids,
+            )
+            await session.commit()
+            total += len(ids)
+            if len(ids) < batch_size:
+                break
+        if total:
+            logger.info(
+                'Слоты перенесены в архив',
+                details={'count': total, 'before': before.isoformat()},
+            )
+        return total
+
+    async def get_bookings(
+        self,
+        session: AsyncSession,
+        *criteria: Any,
+    ) -> list[dict[str, Any]]:
+        """Возвращает архивные бронирования с ID связанных объектов.
+
+        Связи подгружаются тремя запросами на всю выборку.
+        """
+        archive = bookingmodel_archive_table
+        result = await session.execute(
+            select(archive)
+            .where(*criteria)
+            .order_by(archive.c.booking_date, archive.c.id),
+        )
+        bookings = {row['id']: dict(row) for row in result.mappings()}
+        if not bookings:
+            return []
+        for booking in bookings.values():
+            for _, _, _, field in BOOKING_RELATIONS:
+                booking[field] = []
+        for _, target, column, field in BOOKING_RELATIONS:
+            rows = await session.execute(
+                select(target.c.booking_id, target.c[column]).where(
+                    target.c.booking_id.in_(list(bookings)),
+                ),
+            )
+            for booking_id, item_id in rows.all():
+                bookings[booking_id][field].append(item_id)
+        return list(bookings.values())
+
+
+archive_crud = CRUDArchive()
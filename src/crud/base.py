@@ -1,19 +1,192 @@
-from typing import Any, Iterable
+from collections import defaultdict
+from typing import Any, Iterable, NamedTuple, get_args, get_origin
 
-from sqlalchemy import select
+from pydantic import BaseModel
+from sqlalchemy import Column, Select, bindparam, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload, undefer
+from sqlalchemy.orm import (
+    MANYTOMANY,
+    MANYTOONE,
+    RelationshipProperty,
+    selectinload,
+    undefer,
+)
 
 from src.core.logger import logger
+from src.core.statement_cache import QUERY_NAME_OPTION
 from src.models import Cafe
 
 
+class Projection(NamedTuple):
+    """Колонки таблицы и связи модели, которые нужны схеме ответа."""
+
+    columns: list[Column]
+    relations: list[tuple[str, RelationshipProperty, type[BaseModel]]]
+
+
+_projections: dict[tuple[type, type[BaseModel]], Projection] = {}
+
+
+def _nested_schema(annotation: Any) -> type[BaseModel] | None:
+    """Схема внутри аннотации поля: CafeShort, List[Dish] и т.п."""
+    if get_origin(annotation) is None:
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return annotation
+        return None
+    for arg in get_args(annotation):
+        schema = _nested_schema(arg)
+        if schema is not None:
+            return schema
+    return None
+
+
+def _key_columns(
+    model: type,
+    relations: list[tuple[str, RelationshipProperty, type[BaseModel]]],
+) -> list[Column]:
+    """Первичный ключ и внешние ключи, по которым загружаются связи."""
+    keys = {column.key: column for column in inspect(model).primary_key}
+    for _, relation, _ in relations:
+        if relation.direction is MANYTOONE:
+            for local, _ in relation.local_remote_pairs:
+                keys.setdefault(local.key, local)
+    return list(keys.values())
+
+
+def get_projection(model: type, schema: type[BaseModel]) -> Projection:
+    """Разбирает схему ответа на колонки таблицы model и ее связи.
+
+    Поля-связи с вложенной схемой (многие-к-одному и многие-ко-многим)
+    загружаются отдельными запросами, для этого к колонкам добавляются
+    первичный ключ и внешние ключи связей. Для остальных обязательных
+    полей вне таблицы выбрасывается ValueError.
+    """
+    key = (model, schema)
+    projection = _projections.get(key)
+    if projection is not None:
+        return projection
+    table_columns = model.__table__.columns
+    relationships = inspect(model).relationships
+    columns, relations, missing = [], [], []
+    for name, field in schema.model_fields.items():
+        nested = _nested_schema(field.annotation)
+        if name in table_columns:
+            columns.append(table_columns[name])
+        elif (
+            name in relationships
+            and nested is not None
+            and relationships[name].direction in (MANYTOONE, MANYTOMANY)
+        ):
+            relations.append((name, relationships[name], nested))
+        elif field.is_required():
+            missing.append(name)
+    if missing:
+        raise ValueError(
+            f'Схема {schema.__name__} требует полей вне таблицы '
+            f'{model.__tablename__}: {missing}',
+        )
+    if relations:
+        selected = {column.key for column in columns}
+        columns.extend(
+            column for column in _key_columns(model, relations)
+            if column.key not in selected
+        )
+    projection = Projection(columns, relations)
+    _projections[key] = projection
+    return projection
+
+
+async def _load_targets(
+    session: AsyncSession,
+    model: type,
+    schema: type[BaseModel],
+    key: Column,
+    ids: set[Any],
+    loaded: dict[tuple[type, type[BaseModel]], dict[Any, dict[str, Any]]],
+) -> dict[Any, dict[str, Any]]:
+    """Строки проекции model по значениям колонки key.
+
+    Объекты, уже загруженные с той же схемой в этом запросе (кафе
+    бронирования и кафе его столов), повторно не выбираются.
+    """
+    cache = loaded.setdefault((model, schema), {})
+    missing = sorted(ids - cache.keys() - {None})
+    if not missing:
+        return cache
+    columns = get_projection(model, schema).columns
+    if all(column is not key for column in columns):
+        columns = [*columns, key]
+    result = await session.execute(
+        select(*columns).where(key.in_(missing)),
+        execution_options={
+            QUERY_NAME_OPTION: f'{model.__name__}.projection',
+        },
+    )
+    rows = [dict(row) for row in result.mappings()]
+    await load_projected_relations(session, model, schema, rows, loaded)
+    cache.update((row[key.key], row) for row in rows)
+    return cache
+
+
+async def load_projected_relations(
+    session: AsyncSession,
+    model: type,
+    schema: type[BaseModel],
+    rows: list[dict[str, Any]],
+    loaded: dict | None = None,
+) -> list[dict[str, Any]]:
+    """Дополняет строки проекции вложенными схемами связей.
+
+    Как selectinload, каждая связь выбирается одним запросом по ID
+    всех строк, но тоже только колонками вложенной схемы.
+    """
+    if loaded is None:
+        loaded = {}
+    for name, relation, nested in get_projection(model, schema).relations:
+        target_model = relation.mapper.class_
+        if relation.direction is MANYTOONE:
+            ((local, remote),) = relation.local_remote_pairs
+            targets = await _load_targets(
+                session, target_model, nested, remote,
+                {row[local.key] for row in rows}, loaded,
+            )
+            for row in rows:
+                row[name] = targets.get(row[local.key])
+            continue
+        ((parent, parent_fk),) = relation.synchronize_pairs
+        ((target, target_fk),) = relation.secondary_synchronize_pairs
+        parent_ids = sorted({row[parent.key] for row in rows})
+        links = []
+        if parent_ids:
+            result = await session.execute(
+                select(parent_fk, target_fk)
+                .where(parent_fk.in_(parent_ids))
+                .order_by(parent_fk, target_fk),
+                execution_options={
+                    QUERY_NAME_OPTION: f'{model.__name__}.{name}',
+                },
+            )
+            links = result.all()
+        targets = await _load_targets(
+            session, target_model, nested, target,
+            {target_id for _, target_id in links}, loaded,
+        )
+        grouped = defaultdict(list)
+        for parent_id, target_id in links:
+            if target_id in targets:
+                grouped[parent_id].append(targets[target_id])
+        for row in rows:
+            row[name] = grouped.get(row[parent.key], [])
+    return rows
+
+
 class CRUDBase:
     """Базовый CRUD для SQLAlchemy-моделей."""
 
     def __init__(self, model: type) -> None:
         """Инициализация с моделью."""
         self.model = model
+        self._by_field: dict[tuple[tuple[str, ...], bool], Select] = {}
 
     async def get(self, obj_id: int, session: AsyncSession) -> Any:
         """Возвращает объект по ID."""
@@ -21,14 +194,63 @@ class CRUDBase:
         logger.info(f'Получен объект {self.model.__name__} id={obj_id}')
         return obj
 
-    async def get_multi(self, session: AsyncSession) -> list[Any]:
-        """Возвращает все объекты модели."""
+    async def get_multi(
+        self,
+        session: AsyncSession,
+        projection: type[BaseModel] | None = None,
+    ) -> list[Any]:
+        """Возвращает все объекты модели.
+
+        Если передана схема projection, выбираются только ее колонки
+        и возвращаются словари вместо ORM-объектов.
+        """
+        if projection is not None:
+            return await self.get_multi_projected(session, projection)
         stmt = select(self.model)
         res = await session.execute(stmt)
         objs = list(res.scalars())
         logger.info(f'Получено {len(objs)} объектов {self.model.__name__}')
         return objs
 
+    def get_projection_columns(
+        self,
+        schema: type[BaseModel],
+    ) -> list[Column]:
+        """Возвращает колонки таблицы, которые нужны схеме ответа."""
+        return get_projection(self.model, schema).columns
+
+    async def load_projected_relations(
+        self,
+        session: AsyncSession,
+        schema: type[BaseModel],
+        rows: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Дополняет строки проекции связями из вложенных схем."""
+        return await load_projected_relations(
+            session, self.model, schema, rows,
+        )
+
+    async def get_multi_projected(
+        self,
+        session: AsyncSession,
+        schema: type[BaseModel],
+        *criteria: Any,
+    ) -> list[dict[str, Any]]:
+        """Возвращает строки только с колонками схемы, без ORM-объектов.
+
+        Строки не попадают в identity map, связи из вложенных схем
+        догружаются отдельными запросами тоже проекцией.
+        """
+        stmt = select(*self.get_projection_columns(schema)).where(*criteria)
+        res = await session.execute(stmt)
+        rows = [dict(row) for row in res.mappings()]
+        await self.load_projected_relations(session, schema, rows)
+        logger.info(
+            f'Получено {len(rows)} строк {self.model.__name__} '
+            f'(проекция {schema.__name__})',
+        )
+        return rows
+
     async def create(
         self,
         obj_in: Any,
@@ -80,22 +302,50 @@ class CRUDBase:
         )
         return db_obj
 
-    async def get_by_field(
+    def get_by_field_stmt(
         self,
-        session: AsyncSession,
-        many: bool = False,
-        extra_uploading: bool = False,
-        **kwargs: Any,
-    ) -> Any:
-        """Возвращает объекты по указанным полям."""
-        stmt = select(self.model).filter_by(**kwargs)
+        fields: tuple[str, ...],
+        extra_uploading: bool,
+    ) -> Select:
+        """Возвращает запрос по колонкам fields с параметрами вместо значений.
+
+        Запрос строится один раз на набор полей и переиспользуется:
+        ключ кеша SQLAlchemy вычисляется для него один раз, а компиляция
+        происходит одна на процесс. Значения передаются при выполнении.
+        """
+        key = (fields, extra_uploading)
+        stmt = self._by_field.get(key)
+        if stmt is not None:
+            return stmt
+        stmt = select(self.model).where(*(
+            getattr(self.model, field) == bindparam(field)
+            for field in fields
+        ))
         if self.model != Cafe and extra_uploading:
             stmt = stmt.options(
                 selectinload(self.model.cafe).selectinload(Cafe.managers),
                 undefer(self.model.updated_at),
                 undefer(self.model.created_at),
             )
-        result = await session.execute(stmt)
+        self._by_field[key] = stmt
+        return stmt
+
+    async def get_by_field(
+        self,
+        session: AsyncSession,
+        many: bool = False,
+        extra_uploading: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        """Возвращает объекты по значениям колонок."""
+        stmt = self.get_by_field_stmt(tuple(sorted(kwargs)), extra_uploading)
+        result = await session.execute(
+            stmt,
+            kwargs,
+            execution_options={
+                QUERY_NAME_OPTION: f'{self.model.__name__}.get_by_field',
+            },
+        )
         scalars = result.scalars()
         objs = scalars.all() if many else scalars.first()
         logger.info(
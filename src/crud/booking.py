@@ -1,11 +1,30 @@
-from datetime import date
-from typing import Any, List, Optional
+from datetime import date, datetime, time
+from typing import Any, AsyncIterator, List, Optional
 
-from sqlalchemy import Table, select
+from sqlalchemy import (
+    Table,
+    and_,
+    exists,
+    func,
+    insert,
+    lambda_stmt,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.core.access import AccessScope
+from src.core.constants import (
+    EXPORT_BATCH_SIZE,
+    STATUS_TRANSITION_BATCH_SIZE,
+)
+from src.core.realtime import availability_hub
+from src.core.statement_cache import QUERY_NAME_OPTION
 from src.crud.base import CRUDBase
+from src.crud.stats import stats_crud
 from src.models.booking import (
     BookingModel,
     BookingStatus,
@@ -13,8 +32,10 @@ from src.models.booking import (
     booking_slots_table,
     booking_tables_table,
 )
+from src.models.dish import Dish
 from src.models.slot import TimeSlot
 from src.models.table import TableModel
+from src.schemas.booking import Booking, BookingExport
 
 
 class CRUDBooking(CRUDBase):
@@ -24,6 +45,41 @@ class CRUDBooking(CRUDBase):
         """Инициализатор CRUDBooking."""
         super().__init__(BookingModel)
 
+    @staticmethod
+    def _occupancy(booking: BookingModel) -> dict[date, set[tuple[int, int]]]:
+        """Пары (слот, стол), которые бронирование занимает в свою дату."""
+        if not booking.active or booking.status not in (
+            BookingStatus.BOOKED, BookingStatus.ACTIVE,
+        ):
+            return {}
+        return {
+            booking.booking_date: {
+                (slot.id, table.id)
+                for slot in booking.slots
+                for table in booking.tables
+            },
+        }
+
+    async def _publish_occupancy(
+        self,
+        booking: BookingModel,
+        before: dict[date, set[tuple[int, int]]],
+    ) -> None:
+        """Публикует изменения занятости по датам бронирования."""
+        after = self._occupancy(booking)
+        for day in before.keys() | after.keys():
+            old, new = before.get(day, set()), after.get(day, set())
+            if old == new:
+                continue
+            await availability_hub.publish({
+                'type': 'occupancy',
+                'cafe_id': booking.cafe_id,
+                'date': day.isoformat(),
+                'booking_id': booking.id,
+                'occupied': sorted(new - old),
+                'released': sorted(old - new),
+            })
+
     async def get_with_relations(
         self,
         booking_id: int,
@@ -60,12 +116,17 @@ class CRUDBooking(CRUDBase):
         booking = await super().create(obj_in, session,
                                        exclude_fields=exclude_fields,
                                        **extra_fields)
+        await stats_crud.mark_days(
+            session, booking.cafe_id, [booking.booking_date],
+        )
 
         await self._add_booking_relations(session, booking.id,
                                           tables_ids,
                                           slots_ids, menu_ids)
 
-        return await self.get_with_relations(booking.id, session)
+        booking = await self.get_with_relations(booking.id, session)
+        await self._publish_occupancy(booking, {})
+        return booking
 
     async def _add_booking_relations(
         self,
@@ -103,10 +164,20 @@ class CRUDBooking(CRUDBase):
     ) -> BookingModel:
         """Обновляет бронирование и его связи."""
         update_data = obj_in.model_dump(exclude_unset=True)
+        history = sa_inspect(db_obj).attrs.booking_date.history
+        dates = {db_obj.booking_date, *history.deleted}
+        before = {
+            (history.deleted or [db_obj.booking_date])[0]: pairs
+            for pairs in self._occupancy(db_obj).values()
+        }
 
         for field, value in update_data.items():
-            if field not in ['tables', 'slots', 'menu']:
+            if field not in ['tables', 'slots', 'menu', 'version']:
                 setattr(db_obj, field, value)
+        if update_data.keys() & {'tables', 'slots', 'menu'}:
+            # Связи пишутся напрямую в таблицы, а версия растет только
+            # при UPDATE самой строки бронирования.
+            db_obj.updated_at = func.now()
 
         if 'tables' in update_data:
             await self._update_booking_relations(
@@ -129,8 +200,12 @@ class CRUDBooking(CRUDBase):
                 update_data['menu'],
             )
 
+        await stats_crud.mark_days(
+            session, db_obj.cafe_id, {*dates, db_obj.booking_date},
+        )
         await session.commit()
         await session.refresh(db_obj)
+        await self._publish_occupancy(db_obj, before)
         return db_obj
 
     async def _update_booking_relations(
@@ -166,6 +241,40 @@ class CRUDBooking(CRUDBase):
         result = await session.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_multi_filtered(
+        self,
+        session: AsyncSession,
+        scope: AccessScope,
+        cafe_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        active_only: bool = True,
+    ) -> list[dict[str, Any]]:
+        """Бронирования кафе из области доступа scope со связями.
+
+        Выбираются только колонки схемы Booking, связи догружаются
+        проекцией по ID, ORM-объекты не создаются. Запрос собирается
+        через lambda_stmt: для каждого набора фильтров SQLAlchemy один
+        раз строит ключ кеша и компилирует запрос. Кафе менеджера
+        ограничиваются подзапросом, а не списком ID.
+        """
+        columns = self.get_projection_columns(Booking)
+        stmt = lambda_stmt(lambda: select(*columns))
+        if not scope.is_admin:
+            managed = scope.manages(BookingModel.cafe_id)
+            stmt += lambda s: s.where(managed)
+        if cafe_id is not None:
+            stmt += lambda s: s.where(BookingModel.cafe_id == cafe_id)
+        if user_id is not None:
+            stmt += lambda s: s.where(BookingModel.user_id == user_id)
+        if active_only:
+            stmt += lambda s: s.where(BookingModel.active.is_(True))
+        result = await session.execute(
+            stmt,
+            execution_options={QUERY_NAME_OPTION: 'booking.list'},
+        )
+        rows = [dict(row) for row in result.mappings()]
+        return await self.load_projected_relations(session, Booking, rows)
+
     async def check_booking_conflicts(
         self,
         session: AsyncSession,
@@ -182,6 +291,7 @@ class CRUDBooking(CRUDBase):
             .join(BookingModel.tables)
             .where(
                 BookingModel.cafe_id == cafe_id,
+                BookingModel.booking_date == booking_date,
                 TimeSlot.date == booking_date,
                 BookingModel.active.is_(True),
                 BookingModel.status.in_(
@@ -199,6 +309,37 @@ class CRUDBooking(CRUDBase):
         existing_bookings = result.scalars().all()
         return len(existing_bookings) > 0
 
+    async def stream_for_export(
+        self,
+        session: AsyncSession,
+        cafe_id: int,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        active_only: bool = True,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Отдает бронирования кафе пачками через серверный курсор.
+
+        В памяти держится не больше одной пачки строк, ORM-объекты
+        и связи не создаются.
+        """
+        stmt = (
+            select(*self.get_projection_columns(BookingExport))
+            .where(BookingModel.cafe_id == cafe_id)
+            .order_by(BookingModel.booking_date, BookingModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if date_from is not None:
+            stmt = stmt.where(BookingModel.booking_date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(BookingModel.booking_date <= date_to)
+        if active_only:
+            stmt = stmt.where(BookingModel.active.is_(True))
+
+        result = await session.stream(stmt)
+        async for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
     async def update_status(
         self,
         session: AsyncSession,
@@ -208,10 +349,320 @@ class CRUDBooking(CRUDBase):
         """Обновляет статус бронирования."""
         booking = await self.get(booking_id, session)
         if booking:
+            before = self._occupancy(booking)
             booking.status = status
+            await stats_crud.mark_days(
+                session, booking.cafe_id, [booking.booking_date],
+            )
             await session.commit()
             await session.refresh(booking)
+            await self._publish_occupancy(booking, before)
         return booking
 
+    @staticmethod
+    def _slot_exists(*criteria: Any) -> Any:
+        """EXISTS по слотам бронирования с дополнительными условиями."""
+        return exists().where(
+            booking_slots_table.c.booking_id == BookingModel.id,
+            TimeSlot.id == booking_slots_table.c.slot_id,
+            *criteria,
+        )
+
+    async def _transition_batches(
+        self,
+        session: AsyncSession,
+        from_statuses: list[BookingStatus],
+        to_status: BookingStatus,
+        criteria: list[Any],
+        batch_size: int,
+    ) -> int:
+        """Переводит подходящие бронирования в статус пачками.
+
+        Каждая пачка выбирается с FOR UPDATE SKIP LOCKED и фиксируется
+        отдельной транзакцией, поэтому параллельные узлы не ждут друг
+        друга. Повторная проверка статуса в UPDATE делает шаг
+        идемпотентным.
+        """
+        guard = [
+            BookingModel.active.is_(True),
+            BookingModel.status.in_(from_statuses),
+            *criteria,
+        ]
+        ids = (
+            select(BookingModel.id)
+            .where(*guard)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True, of=BookingModel)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(BookingModel)
+            .where(BookingModel.id.in_(ids), *guard)
+            .values(status=to_status, version=BookingModel.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        total = 0
+        while True:
+            result = await session.execute(stmt)
+            await session.commit()
+            total += result.rowcount
+            if result.rowcount < batch_size:
+                return total
+
+    async def transition_statuses(
+        self,
+        session: AsyncSession,
+        now: datetime | None = None,
+        batch_size: int = STATUS_TRANSITION_BATCH_SIZE,
+    ) -> dict[BookingStatus, int]:
+        """Переводит бронирования по времени слотов.
+
+        BOOKED и ACTIVE становятся COMPLETED, когда закончились все слоты,
+        BOOKED становится ACTIVE, когда начался хотя бы один слот.
+        """
+        now = now or datetime.now()
+        today, current_time = now.date(), now.time()
+        started_by_today = BookingModel.booking_date <= today
+        completed = await self._transition_batches(
+            session,
+            [BookingStatus.BOOKED, BookingStatus.ACTIVE],
+            BookingStatus.COMPLETED,
+            [
+                started_by_today,
+                self._slot_exists(),
+                ~self._slot_exists(
+                    or_(
+                        TimeSlot.date > today,
+                        and_(
+                            TimeSlot.date == today,
+                            TimeSlot.end_time > current_time,
+                        ),
+                    ),
+                ),
+            ],
+            batch_size,
+        )
+        activated = await self._transition_batches(
+            session,
+            [BookingStatus.BOOKED],
+            BookingStatus.ACTIVE,
+            [
+                started_by_today,
+                self._slot_exists(
+                    or_(
+                        TimeSlot.date < today,
+                        and_(
+                            TimeSlot.date == today,
+                            TimeSlot.start_time <= current_time,
+                        ),
+                    ),
+                ),
+            ],
+            batch_size,
+        )
+        return {
+            BookingStatus.COMPLETED: completed,
+            BookingStatus.ACTIVE: activated,
+        }
+
+    @staticmethod
+    def _occupied_pairs_stmt(cafe_id: int, *criteria: Any) -> Any:
+        """Запрос пар (слот, стол), занятых действующими бронированиями."""
+        return (
+            select(
+                booking_slots_table.c.slot_id,
+                booking_tables_table.c.table_id,
+            )
+            .select_from(BookingModel)
+            .join(
+                booking_slots_table,
+                booking_slots_table.c.booking_id == BookingModel.id,
+            )
+            .join(
+                booking_tables_table,
+                booking_tables_table.c.booking_id == BookingModel.id,
+            )
+            .where(
+                BookingModel.cafe_id == cafe_id,
+                BookingModel.active.is_(True),
+                BookingModel.status.in_(
+                    [BookingStatus.BOOKED, BookingStatus.ACTIVE],
+                ),
+                *criteria,
+            )
+            .distinct()
+        )
+
+    async def get_occupied_pairs(
+        self,
+        session: AsyncSession,
+        cafe_id: int,
+        day: date,
+    ) -> list[tuple[int, int]]:
+        """Занятые пары (слот, стол) кафе за дату."""
+        result = await session.execute(
+            self._occupied_pairs_stmt(
+                cafe_id, BookingModel.booking_date == day,
+            ).order_by(
+                booking_slots_table.c.slot_id,
+                booking_tables_table.c.table_id,
+            ),
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def get_taken_pairs(
+        self,
+        session: AsyncSession,
+        cafe_id: int,
+        dates: set[date],
+        table_ids: set[int],
+        slot_ids: set[int],
+    ) -> set[tuple[int, int]]:
+        """Занятые пары (слот, стол) среди заданных столов и слотов."""
+        if not (dates and table_ids and slot_ids):
+            return set()
+        result = await session.execute(
+            self._occupied_pairs_stmt(
+                cafe_id,
+                BookingModel.booking_date.in_(dates),
+                booking_slots_table.c.slot_id.in_(slot_ids),
+                booking_tables_table.c.table_id.in_(table_ids),
+            ),
+        )
+        return {tuple(row) for row in result.all()}
+
+    async def get_cafes_with_free_tables(
+        self,
+        session: AsyncSession,
+        cafe_ids: list[int],
+        day: date,
+        guests: int = 1,
+        time_from: Optional[time] = None,
+        time_to: Optional[time] = None,
+    ) -> set[int]:
+        """Кафе из списка, где на дату есть свободный стол на guests мест.
+
+        Подходит слот, который начинается не раньше time_from и
+        заканчивается не позже time_to. Одним запросом на все кафе.
+        """
+        if not cafe_ids:
+            return set()
+        occupied = self._occupied_pairs_stmt(
+            TimeSlot.cafe_id,
+            BookingModel.booking_date == day,
+            booking_slots_table.c.slot_id == TimeSlot.id,
+            booking_tables_table.c.table_id == TableModel.id,
+        ).exists()
+        stmt = (
+            select(TimeSlot.cafe_id)
+            .join(TableModel, TableModel.cafe_id == TimeSlot.cafe_id)
+            .where(
+                TimeSlot.cafe_id.in_(cafe_ids),
+                TimeSlot.date == day,
+                TimeSlot.active.is_(True),
+                TableModel.active.is_(True),
+                TableModel.seats_number >= guests,
+                ~occupied,
+            )
+            .distinct()
+        )
+        if time_from is not None:
+            stmt = stmt.where(TimeSlot.start_time >= time_from)
+        if time_to is not None:
+            stmt = stmt.where(TimeSlot.end_time <= time_to)
+        return set((await session.execute(stmt)).scalars())
+
+    async def get_batch_refs(
+        self,
+        session: AsyncSession,
+        cafe_id: int,
+        table_ids: set[int],
+        slot_ids: set[int],
+        dish_ids: set[int],
+    ) -> tuple[dict[int, int], dict[int, date], set[int]]:
+        """Активные столы, слоты и блюда кафе для пакета бронирований.
+
+        Три запроса на весь пакет: вместимость столов, даты слотов
+        и ID блюд.
+        """
+        tables = await session.execute(
+            select(TableModel.id, TableModel.seats_number).where(
+                TableModel.id.in_(table_ids),
+                TableModel.cafe_id == cafe_id,
+                TableModel.active.is_(True),
+            ),
+        )
+        slots = await session.execute(
+            select(TimeSlot.id, TimeSlot.date).where(
+                TimeSlot.id.in_(slot_ids),
+                TimeSlot.cafe_id == cafe_id,
+                TimeSlot.active.is_(True),
+            ),
+        )
+        dishes = await session.scalars(
+            select(Dish.id).where(
+                Dish.id.in_(dish_ids),
+                Dish.cafe_id == cafe_id,
+                Dish.active.is_(True),
+            ),
+        )
+        return dict(tables.all()), dict(slots.all()), set(dishes)
+
+    async def create_many(
+        self,
+        session: AsyncSession,
+        rows: list[dict[str, Any]],
+    ) -> list[BookingModel]:
+        """Создает пакет бронирований одной транзакцией.
+
+        Бронирования и каждая из связей вставляются одним
+        executemany, дни пакета ставятся в очередь пересчета статистики.
+        """
+        if not rows:
+            return []
+        relations = [
+            {
+                booking_tables_table: ('table_id', row.pop('tables')),
+                booking_slots_table: ('slot_id', row.pop('slots')),
+                booking_dishes_table: ('dish_id', row.pop('menu')),
+            }
+            for row in rows
+        ]
+        booking_ids = list(await session.scalars(
+            insert(BookingModel).returning(
+                BookingModel.id, sort_by_parameter_order=True,
+            ),
+            rows,
+        ))
+        for table in (
+            booking_tables_table, booking_slots_table, booking_dishes_table,
+        ):
+            values = []
+            for booking_id, relation in zip(booking_ids, relations):
+                column, item_ids = relation[table]
+                values.extend(
+                    {'booking_id': booking_id, column: item_id}
+                    for item_id in dict.fromkeys(item_ids)
+                )
+            if values:
+                await session.execute(insert(table), values)
+        await stats_crud.mark_days(
+            session, rows[0]['cafe_id'], [row['booking_date'] for row in rows],
+        )
+        await session.commit()
+
+        result = await session.scalars(
+            select(BookingModel)
+            .options(
+                selectinload(BookingModel.slots),
+                selectinload(BookingModel.tables),
+            )
+            .where(BookingModel.id.in_(booking_ids)),
+        )
+        bookings = {booking.id: booking for booking in result}
+        for booking in bookings.values():
+            await self._publish_occupancy(booking, {})
+        return [bookings[booking_id] for booking_id in booking_ids]
+
 
 booking_crud = CRUDBooking()
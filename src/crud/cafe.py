@@ -1,10 +1,18 @@
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import attributes, selectinload
 
+from src.core.cache import (
+    GEO_CACHE,
+    SEARCH_CACHE,
+    Revalidation,
+    cache_invalidation,
+)
+from src.core.db import has_extension
 from src.core.exceptions import ResourceNotFoundError
+from src.core.geo import LOCATION_SQL, GeoIndex
 from src.core.logger import logger
 from src.crud.base import CRUDBase
 from src.models.cafe import Cafe
@@ -15,6 +23,14 @@ from src.schemas.cafe import CafeCreate, CafeUpdate
 class CRUDCafe(CRUDBase):
     """CRUD для работы с моделью Cafe."""
 
+    def __init__(self, model: type) -> None:
+        """Создает пустой пространственный индекс в памяти."""
+        super().__init__(model)
+        self._geo_index = GeoIndex()
+        self._geo_revalidation = Revalidation()
+        self._has_postgis: Optional[bool] = None
+        cache_invalidation.register(GEO_CACHE, self._geo_revalidation.reset)
+
     async def get_multi_filtered(
         self,
         session: AsyncSession,
@@ -63,6 +79,7 @@ class CRUDCafe(CRUDBase):
 
         await session.flush()
         await session.commit()
+        await cache_invalidation.invalidate(SEARCH_CACHE, GEO_CACHE)
 
         res = await session.execute(
             select(Cafe)
@@ -100,7 +117,8 @@ class CRUDCafe(CRUDBase):
 
         # Обновляем только скалярные поля модели
         updatable = {
-            "name", "address", "phone", "description", "photo", "active"}
+            "name", "address", "phone", "description", "photo", "active",
+            "latitude", "longitude"}
         await self.update(cafe, data, session, updatable_fields=updatable)
 
         if payload.managers is not None:
@@ -127,6 +145,7 @@ class CRUDCafe(CRUDBase):
 
         await session.flush()
         await session.commit()
+        await cache_invalidation.invalidate(SEARCH_CACHE, GEO_CACHE)
 
         res = await session.execute(
             select(Cafe)
@@ -156,5 +175,86 @@ class CRUDCafe(CRUDBase):
         result = await session.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_many_with_managers(
+        self,
+        cafe_ids: list[int],
+        session: AsyncSession,
+    ) -> dict[int, Cafe]:
+        """Кафе по списку ID с менеджерами."""
+        result = await session.execute(
+            select(Cafe)
+            .options(selectinload(Cafe.managers))
+            .where(Cafe.id.in_(cafe_ids)),
+        )
+        return {cafe.id: cafe for cafe in result.scalars()}
+
+    async def get_nearby(
+        self,
+        session: AsyncSession,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: Optional[int] = None,
+    ) -> list[tuple[float, int]]:
+        """Активные кафе в радиусе как (расстояние в км, id кафе).
+
+        Ближайшие первыми. В Postgres с PostGIS поиск идет по индексу
+        GiST, иначе - по k-d дереву в памяти процесса.
+        """
+        if self._has_postgis is None:
+            self._has_postgis = await has_extension(session, 'postgis')
+        if self._has_postgis:
+            return await self._get_nearby_postgis(
+                session, latitude, longitude, radius_km, limit,
+            )
+        if self._geo_revalidation.due():
+            signature = (await session.execute(
+                select(
+                    func.count(Cafe.id),
+                    func.max(Cafe.updated_at),
+                    func.sum(Cafe.version),
+                ),
+            )).one()
+            if tuple(signature) != self._geo_index.signature:
+                points = await session.execute(
+                    select(Cafe.id, Cafe.latitude, Cafe.longitude).where(
+                        Cafe.active.is_(True),
+                        Cafe.latitude.is_not(None),
+                        Cafe.longitude.is_not(None),
+                    ),
+                )
+                self._geo_index.build(points.all(), tuple(signature))
+            self._geo_revalidation.checked()
+        return self._geo_index.within(latitude, longitude, radius_km, limit)
+
+    @staticmethod
+    async def _get_nearby_postgis(
+        session: AsyncSession,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: Optional[int],
+    ) -> list[tuple[float, int]]:
+        """Кафе в радиусе по индексу GiST PostGIS."""
+        point = 'geography(ST_SetSRID(ST_MakePoint(:lon, :lat), 4326))'
+        result = await session.execute(
+            text(
+                f'SELECT ST_Distance({LOCATION_SQL}, {point}) / 1000, cafe.id '
+                'FROM cafe '
+                'WHERE cafe.active AND cafe.latitude IS NOT NULL '
+                'AND cafe.longitude IS NOT NULL '
+                f'AND ST_DWithin({LOCATION_SQL}, {point}, :radius) '
+                f'ORDER BY {LOCATION_SQL} <-> {point}, cafe.id '
+                'LIMIT :limit',
+            ),
+            {
+                'lat': latitude,
+                'lon': longitude,
+                'radius': radius_km * 1000,
+                'limit': limit,
+            },
+        )
+        return [tuple(row) for row in result.all()]
+
 
 cafe_crud = CRUDCafe(Cafe)
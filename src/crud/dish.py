@@ -1,12 +1,17 @@
 from typing import Any, Dict, Iterable, Optional, Union
 
-from sqlalchemy import and_, or_, select
+from sqlalchemy import insert, lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.core.access import AccessScope
+from src.core.cache import SEARCH_CACHE, cache_invalidation
+from src.core.importing import batched
 from src.core.logger import logger
+from src.core.statement_cache import QUERY_NAME_OPTION
 from src.crud.base import CRUDBase
-from src.models import Cafe, Dish, User
+from src.models import Cafe, Dish
+from src.schemas.dish import Dish as DishSchema
 from src.schemas.dish import DishCreate, DishUpdate
 
 
@@ -36,6 +41,7 @@ class CRUDDish(CRUDBase):
         db_obj: Dish = self.model(**data)
         session.add(db_obj)
         await session.commit()
+        await cache_invalidation.invalidate(SEARCH_CACHE)
         await session.refresh(db_obj)
 
         # Подгружаем связи
@@ -57,7 +63,7 @@ class CRUDDish(CRUDBase):
     ) -> Dish:
         """Обновляет блюдо и подгружает связи с кафе и менеджерами."""
         data = (
-            obj_in.model_dump(exclude_unset=True)
+            obj_in.model_dump(exclude_unset=True, exclude={'version'})
             if hasattr(obj_in, 'model_dump')
             else dict(obj_in)
         )
@@ -72,6 +78,7 @@ class CRUDDish(CRUDBase):
 
         session.add(db_obj)
         await session.commit()
+        await cache_invalidation.invalidate(SEARCH_CACHE)
         await session.refresh(db_obj)
 
         # Подгружаем связи
@@ -89,35 +96,62 @@ class CRUDDish(CRUDBase):
         session: AsyncSession,
         cafe: Cafe | None,
         active_only: bool,
-        current_user: User,
-    ) -> list[Dish]:
-        """Получаем список блюд с фильтрацией доступа."""
-        query = select(Dish).options(
-            selectinload(Dish.cafe).selectinload(Cafe.managers),
-        )
+        scope: AccessScope,
+    ) -> list[dict[str, Any]]:
+        """Получаем список блюд с фильтрацией доступа.
+
+        Выбираются только колонки схемы ответа, кафе догружается
+        проекцией. Запрос собирается через lambda_stmt: построение
+        и компиляция кешируются для каждого набора фильтров. Неактивные
+        блюда видны в пределах области доступа scope.
+        """
+        columns = self.get_projection_columns(DishSchema)
+        stmt = lambda_stmt(lambda: select(*columns))
 
         if cafe is not None:
-            query = query.where(Dish.cafe_id == cafe.id)
+            cafe_id = cafe.id
+            stmt += lambda s: s.where(Dish.cafe_id == cafe_id)
         if active_only:
-            query = query.where(
-                Dish.active.is_(True),
-            )
-        else:
-            if current_user.is_superuser:
-                pass
-            elif current_user.managed_cafe_ids:
-                query = query.where(
-                    or_(
-                        Dish.active.is_(True),
-                        and_(
-                            Dish.active.is_(False),
-                            Dish.cafe_id.in_(current_user.managed_cafe_ids),
-                        ),
-                    ),
-                )
-
-        result = await session.execute(query)
-        return list(result.scalars().all())
+            stmt += lambda s: s.where(Dish.active.is_(True))
+        elif not scope.is_admin:
+            visible = scope.visible(Dish.cafe_id, Dish.active)
+            stmt += lambda s: s.where(visible)
+
+        result = await session.execute(
+            stmt,
+            execution_options={QUERY_NAME_OPTION: 'dish.list'},
+        )
+        rows = [dict(row) for row in result.mappings()]
+        return await self.load_projected_relations(session, DishSchema, rows)
+
+    async def get_existing_names(
+        self,
+        session: AsyncSession,
+        cafe_id: int,
+        names: Iterable[str],
+    ) -> set[str]:
+        """Возвращает названия из переданных, уже занятые в кафе."""
+        result = await session.execute(
+            select(Dish.name).where(
+                Dish.cafe_id == cafe_id,
+                Dish.name.in_(set(names)),
+            ),
+        )
+        return set(result.scalars().all())
+
+    async def bulk_create(
+        self,
+        session: AsyncSession,
+        objs_in: list[DishCreate],
+    ) -> int:
+        """Создаёт блюда пачками многострочных INSERT одной транзакцией."""
+        rows = [obj_in.model_dump() for obj_in in objs_in]
+        for batch in batched(rows):
+            await session.execute(insert(Dish), batch)
+        await session.commit()
+        await cache_invalidation.invalidate(SEARCH_CACHE)
+        logger.info(f'Импортировано {len(rows)} блюд')
+        return len(rows)
 
 
 dish_crud: CRUDDish = CRUDDish(Dish)
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+from itertools import product
+from typing import Any, Callable, Iterable, Optional
+from uuid import uuid4
+
+from src.core.config import settings
+from src.core.ttl_store import create_ttl_store
+
+
+class CRUDHold:
+    """Временные удержания пар (слот, стол) до оформления бронирования.
+
+    Удержания живут только в хранилище со сроком жизни и истекают сами.
+    Каждая пара удерживается отдельным ключом, занятым через add,
+    поэтому одну пару не могут удержать двое.
+    """
+
+    def __init__(self) -> None:
+        """Создает хранилище удержаний."""
+        self._store = create_ttl_store('hold')
+
+    @staticmethod
+    def _pair_keys(
+        table_ids: Iterable[int],
+        slot_ids: Iterable[int],
+    ) -> dict[str, tuple[int, int]]:
+        """Ключи пар (слот, стол)."""
+        return {
+            f'pair:{slot_id}:{table_id}': (slot_id, table_id)
+            for slot_id, table_id in product(set(slot_ids), set(table_ids))
+        }
+
+    async def create(
+        self,
+        cafe_id: int,
+        user_id: int,
+        table_ids: list[int],
+        slot_ids: list[int],
+        ttl: Optional[int] = None,
+    ) -> Optional[dict[str, Any]]:
+        """Удерживает все пары или ни одной.
+
+        Возвращает None, если хотя бы одна пара уже удержана.
+        """
+        ttl = ttl or settings.booking_hold_ttl_sec
+        hold_id = uuid4().hex
+        owner = {'hold_id': hold_id, 'user_id': user_id}
+        claimed = []
+        for key in self._pair_keys(table_ids, slot_ids):
+            if not await self._store.add(key, owner, ttl):
+                await self._store.delete(*claimed)
+                return None
+            claimed.append(key)
+        hold = {
+            'id': hold_id,
+            'cafe_id': cafe_id,
+            'user_id': user_id,
+            'tables': sorted(set(table_ids)),
+            'slots': sorted(set(slot_ids)),
+            'expires_at': (
+                datetime.now(tz=timezone.utc) + timedelta(seconds=ttl)
+            ).isoformat(),
+        }
+        await self._store.set(f'hold:{hold_id}', hold, ttl)
+        return hold
+
+    async def get(self, hold_id: str) -> Optional[dict[str, Any]]:
+        """Удержание по ID, если оно еще не истекло."""
+        return await self._store.get(f'hold:{hold_id}')
+
+    async def _release_pairs(
+        self,
+        keys: Iterable[str],
+        owned: Callable[[dict[str, Any]], bool],
+    ) -> None:
+        """Снимает пары, удержанные владельцем по условию owned."""
+        holders = await self._store.get_many(keys)
+        await self._store.delete(
+            *(key for key, holder in holders.items() if owned(holder)),
+        )
+
+    async def remove(self, hold: dict[str, Any]) -> None:
+        """Снимает удержание и все его пары."""
+        await self._release_pairs(
+            self._pair_keys(hold['tables'], hold['slots']),
+            lambda holder: holder['hold_id'] == hold['id'],
+        )
+        await self._store.delete(f'hold:{hold["id"]}')
+
+    async def get_held_pairs(
+        self,
+        user_id: int,
+        table_ids: Iterable[int],
+        slot_ids: Iterable[int],
+    ) -> set[tuple[int, int]]:
+        """Пары (слот, стол), удержанные другими пользователями.
+
+        Одно обращение к хранилищу без запросов к базе.
+        """
+        keys = self._pair_keys(table_ids, slot_ids)
+        holders = await self._store.get_many(keys)
+        return {
+            keys[key] for key, holder in holders.items()
+            if holder['user_id'] != user_id
+        }
+
+    async def held_by_others(
+        self,
+        user_id: int,
+        table_ids: list[int],
+        slot_ids: list[int],
+    ) -> bool:
+        """Удержана ли хотя бы одна пара другим пользователем."""
+        return bool(
+            await self.get_held_pairs(user_id, table_ids, slot_ids),
+        )
+
+    async def release_user_pairs(
+        self,
+        user_id: int,
+        table_ids: Iterable[int],
+        slot_ids: Iterable[int],
+    ) -> None:
+        """Снимает удержания пользователя с пар, которые он забронировал."""
+        await self._release_pairs(
+            self._pair_keys(table_ids, slot_ids),
+            lambda holder: holder['user_id'] == user_id,
+        )
+
+
+hold_crud = CRUDHold()
@@ -0,0 +1,229 @@
+from decimal import Decimal
+from typing import Any, Optional
+
+from sqlalchemy import (
+    Numeric,
+    and_,
+    case,
+    cast,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import SEARCH_CACHE, Revalidation, cache_invalidation
+from src.core.constants import SEARCH_TS_CONFIG
+from src.core.db import has_extension
+from src.core.search import (
+    SEARCH_COLUMNS,
+    SearchDocument,
+    TrigramIndex,
+    document_sql,
+    like_pattern,
+)
+from src.models.cafe import Cafe
+from src.models.dish import Dish
+
+Cursor = tuple[Decimal, str, int]
+
+
+class CRUDSearch:
+    """Поиск по кафе и блюдам с рангом и keyset-пагинацией.
+
+    В Postgres поиск идет по индексам tsvector и, если установлено
+    расширение pg_trgm, по триграммам названий. В остальных базах -
+    по инвертированному индексу триграмм в памяти процесса.
+    Ищутся только активные кафе и активные блюда активных кафе.
+    """
+
+    def __init__(self) -> None:
+        """Создает пустой индекс в памяти."""
+        self._index = TrigramIndex()
+        self._revalidation = Revalidation()
+        self._has_trgm: Optional[bool] = None
+        cache_invalidation.register(SEARCH_CACHE, self._revalidation.reset)
+
+    async def search(
+        self,
+        session: AsyncSession,
+        query: str,
+        limit: int,
+        after: Optional[Cursor] = None,
+    ) -> list[dict[str, Any]]:
+        """До limit + 1 результатов после курсора, лучшие первыми.
+
+        Лишний результат показывает, что есть следующая страница.
+        """
+        if session.bind.dialect.name == 'postgresql':
+            return await self._search_postgres(session, query, limit, after)
+        return await self._search_memory(session, query, limit, after)
+
+    async def _trgm_installed(self, session: AsyncSession) -> bool:
+        """Установлено ли расширение pg_trgm."""
+        if self._has_trgm is None:
+            self._has_trgm = await has_extension(session, 'pg_trgm')
+        return self._has_trgm
+
+    @staticmethod
+    def _postgres_select(
+        model: type[Cafe] | type[Dish],
+        kind: str,
+        query: str,
+        trgm: bool,
+    ) -> Any:
+        """Совпадения по одной таблице с рангом.
+
+        Ранг - ts_rank документа плюс бонус за подстроку в названии
+        и, с pg_trgm, похожесть названия на запрос.
+        """
+        pattern = like_pattern(query)
+        document = literal_column(document_sql(kind))
+        ts_query = func.websearch_to_tsquery(
+            cast(SEARCH_TS_CONFIG, REGCONFIG), query,
+        )
+        name_match = model.name.ilike(pattern, escape='\\')
+        matches = [
+            document.op('@@')(ts_query),
+            *(
+                getattr(model, column).ilike(pattern, escape='\\')
+                for column in SEARCH_COLUMNS[kind]
+            ),
+        ]
+        rank = func.ts_rank(document, ts_query) + case(
+            (name_match, 1), else_=0,
+        )
+        if trgm:
+            matches.append(model.name.op('%')(query))
+            rank = rank + func.similarity(model.name, query)
+        stmt = select(
+            literal(kind).label('type'),
+            model.id.label('id'),
+            (model.id if model is Cafe else model.cafe_id).label('cafe_id'),
+            model.name.label('name'),
+            func.round(cast(rank, Numeric), 6).label('rank'),
+        ).where(model.active.is_(True), or_(*matches))
+        if model is Dish:
+            stmt = stmt.join(Cafe, Cafe.id == Dish.cafe_id).where(
+                Cafe.active.is_(True),
+            )
+        return stmt
+
+    async def _search_postgres(
+        self,
+        session: AsyncSession,
+        query: str,
+        limit: int,
+        after: Optional[Cursor],
+    ) -> list[dict[str, Any]]:
+        """Поиск по индексам Postgres, keyset по (rank, type, id)."""
+        trgm = await self._trgm_installed(session)
+        found = union_all(
+            self._postgres_select(Cafe, 'cafe', query, trgm),
+            self._postgres_select(Dish, 'dish', query, trgm),
+        ).subquery()
+        stmt = select(found).order_by(
+            found.c.rank.desc(), found.c.type, found.c.id,
+        ).limit(limit + 1)
+        if after is not None:
+            rank, kind, obj_id = after
+            stmt = stmt.where(or_(
+                found.c.rank < rank,
+                and_(
+                    found.c.rank == rank,
+                    tuple_(found.c.type, found.c.id) > tuple_(kind, obj_id),
+                ),
+            ))
+        result = await session.execute(stmt)
+        return [dict(row) for row in result.mappings()]
+
+    @staticmethod
+    async def _signature(session: AsyncSession) -> tuple[Any, ...]:
+        """Сигнатура данных поиска: меняется при любом изменении строк."""
+        stmt = select(*(
+            select(aggregate).scalar_subquery()
+            for model in (Cafe, Dish)
+            for aggregate in (
+                func.count(model.id),
+                func.max(model.updated_at),
+                func.sum(model.version),
+            )
+        ))
+        return tuple((await session.execute(stmt)).one())
+
+    @staticmethod
+    async def _load_documents(
+        session: AsyncSession,
+    ) -> list[SearchDocument]:
+        """Документы индекса: активные кафе и их активные блюда."""
+        cafes = await session.execute(
+            select(
+                Cafe.id, Cafe.name, Cafe.address, Cafe.description,
+            ).where(Cafe.active.is_(True)),
+        )
+        dishes = await session.execute(
+            select(Dish.id, Dish.cafe_id, Dish.name, Dish.description)
+            .join(Cafe, Cafe.id == Dish.cafe_id)
+            .where(Dish.active.is_(True), Cafe.active.is_(True)),
+        )
+        return [
+            *(
+                SearchDocument('cafe', row.id, row.id, row.name, {
+                    'name': row.name,
+                    'address': row.address,
+                    'description': row.description,
+                })
+                for row in cafes
+            ),
+            *(
+                SearchDocument('dish', row.id, row.cafe_id, row.name, {
+                    'name': row.name,
+                    'description': row.description,
+                })
+                for row in dishes
+            ),
+        ]
+
+    async def _search_memory(
+        self,
+        session: AsyncSession,
+        query: str,
+        limit: int,
+        after: Optional[Cursor],
+    ) -> list[dict[str, Any]]:
+        """Поиск по индексу в памяти, перестроенному при изменениях."""
+        if self._revalidation.due():
+            signature = await self._signature(session)
+            if signature != self._index.signature:
+                self._index.build(
+                    await self._load_documents(session), signature,
+                )
+            self._revalidation.checked()
+        found = sorted(
+            self._index.search(query),
+            key=lambda hit: (-hit[0], hit[1].kind, hit[1].id),
+        )
+        if after is not None:
+            rank, kind, obj_id = after
+            found = [
+                hit for hit in found
+                if (-hit[0], hit[1].kind, hit[1].id) > (-rank, kind, obj_id)
+            ]
+        return [
+            {
+                'type': document.kind,
+                'id': document.id,
+                'cafe_id': document.cafe_id,
+                'name': document.name,
+                'rank': rank,
+            }
+            for rank, document in found[:limit + 1]
+        ]
+
+
+search_crud = CRUDSearch()
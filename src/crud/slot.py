@@ -1,14 +1,34 @@
-from datetime import date, time
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Iterable
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.core.logger import logger
 from src.crud.base import CRUDBase
-from src.models import BookingModel, BookingStatus, Cafe, TimeSlot
+from src.models import (
+    BookingModel,
+    BookingStatus,
+    Cafe,
+    SlotTemplate,
+    TimeSlot,
+)
 from src.schemas.slot import TimeSlotCreate, TimeSlotUpdate
 
 
+def overlaps(
+    intervals: Iterable[tuple[time, time]],
+    start_time: time,
+    end_time: time,
+) -> bool:
+    """Пересекается ли интервал start_time-end_time с одним из intervals."""
+    return any(
+        start < end_time and end > start_time for start, end in intervals
+    )
+
+
 class CRUDTimeSlot(CRUDBase):
     """CRUD операции для временных слотов."""
 
@@ -75,6 +95,26 @@ class CRUDTimeSlot(CRUDBase):
         result = await session.execute(stmt)
         return list(result.scalars())
 
+    async def get_ids_by_time(
+        self,
+        session: AsyncSession,
+        cafe_id: int,
+        dates: list[date],
+        start_time: time,
+        end_time: time,
+    ) -> dict[date, int]:
+        """ID активных слотов кафе с заданным временем по датам."""
+        result = await session.execute(
+            select(TimeSlot.date, TimeSlot.id).where(
+                TimeSlot.cafe_id == cafe_id,
+                TimeSlot.date.in_(dates),
+                TimeSlot.start_time == start_time,
+                TimeSlot.end_time == end_time,
+                TimeSlot.active.is_(True),
+            ),
+        )
+        return dict(result.all())
+
     async def get_with_cafe(
         self,
         slot_id: int,
@@ -120,7 +160,9 @@ class CRUDTimeSlot(CRUDBase):
         И возвращает обновлённый объект с загруженными связями.
         """
         await self._check_no_active_bookings(db_obj.id, session)
-        update_data = obj_in.model_dump(exclude_unset=True)
+        update_data = obj_in.model_dump(
+            exclude_unset=True, exclude={'version'},
+        )
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         session.add(db_obj)
@@ -133,5 +175,74 @@ class CRUDTimeSlot(CRUDBase):
 
         return result.scalar_one()
 
+    async def create_from_templates(
+        self,
+        cafe_id: int,
+        templates: list[SlotTemplate],
+        date_from: date,
+        date_to: date,
+        session: AsyncSession,
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """Создает слоты по шаблонам расписания за период.
+
+        Существующие слоты периода читаются одним запросом, пересечения
+        проверяются в памяти, новые слоты пишутся одной многострочной
+        вставкой. Возвращает число созданных слотов и пропущенные.
+        """
+        result = await session.execute(
+            select(TimeSlot.date, TimeSlot.start_time, TimeSlot.end_time)
+            .where(
+                TimeSlot.cafe_id == cafe_id,
+                TimeSlot.date.between(date_from, date_to),
+            ),
+        )
+        busy: dict[date, list[tuple[time, time]]] = defaultdict(list)
+        for slot_date, start_time, end_time in result:
+            busy[slot_date].append((start_time, end_time))
+
+        by_weekday: dict[int, list[SlotTemplate]] = defaultdict(list)
+        for template in templates:
+            by_weekday[template.weekday].append(template)
+
+        now = datetime.now()
+        rows: list[dict[str, Any]] = []
+        skipped: list[dict[str, Any]] = []
+        day = date_from
+        while day <= date_to:
+            for template in by_weekday.get(day.weekday(), ()):
+                start_time, end_time = template.start_time, template.end_time
+                reason = None
+                if datetime.combine(day, start_time) < now:
+                    reason = 'Слот в прошлом'
+                elif overlaps(busy[day], start_time, end_time):
+                    reason = 'Пересекается с существующим слотом'
+                if reason:
+                    skipped.append({
+                        'date': day,
+                        'start_time': start_time,
+                        'end_time': end_time,
+                        'reason': reason,
+                    })
+                    continue
+                busy[day].append((start_time, end_time))
+                rows.append({
+                    'cafe_id': cafe_id,
+                    'date': day,
+                    'start_time': start_time,
+                    'end_time': end_time,
+                    'description': template.description,
+                    'active': True,
+                })
+            day += timedelta(days=1)
+
+        if rows:
+            await session.execute(insert(TimeSlot), rows)
+            await session.commit()
+        logger.info(
+            f'Создано {len(rows)} слотов по шаблонам в кафе id={cafe_id}, '
+            f'пропущено {len(skipped)}',
+        )
+        return len(rows), skipped
+
 
 time_slot_crud = CRUDTimeSlot(TimeSlot)
@@ -0,0 +1,131 @@
+from datetime import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.exceptions import AppException
+from src.core.logger import logger
+from src.crud.base import CRUDBase
+from src.crud.slot import overlaps
+from src.models import SlotTemplate
+from src.schemas.slot import SlotTemplateCreate, SlotTemplateUpdate
+
+
+class CRUDSlotTemplate(CRUDBase):
+    """CRUD операции для шаблонов расписания слотов."""
+
+    async def get_multi_by_cafe(
+        self,
+        cafe_id: int,
+        session: AsyncSession,
+        include_inactive: bool = False,
+    ) -> list[SlotTemplate]:
+        """Возвращает шаблоны кафе, упорядоченные по дню и времени."""
+        stmt = (
+            select(SlotTemplate)
+            .where(SlotTemplate.cafe_id == cafe_id)
+            .order_by(SlotTemplate.weekday, SlotTemplate.start_time)
+        )
+        if not include_inactive:
+            stmt = stmt.where(SlotTemplate.active.is_(True))
+        result = await session.execute(stmt)
+        return list(result.scalars())
+
+    async def get_with_cafe(
+        self,
+        template_id: int,
+        cafe_id: int,
+        session: AsyncSession,
+    ) -> SlotTemplate | None:
+        """Возвращает шаблон по ID с проверкой принадлежности к кафе."""
+        result = await session.execute(
+            select(SlotTemplate).where(
+                SlotTemplate.id == template_id,
+                SlotTemplate.cafe_id == cafe_id,
+            ),
+        )
+        return result.scalar_one_or_none()
+
+    async def check_overlaps(
+        self,
+        cafe_id: int,
+        weekday: int,
+        start_time: time,
+        end_time: time,
+        session: AsyncSession,
+        exclude_template_id: int | None = None,
+    ) -> None:
+        """Не дает активным шаблонам одного дня недели пересекаться.
+
+        Интервалы проверяются в памяти так же, как при генерации слотов,
+        которая иначе молча пропускала бы вхождения второго шаблона.
+        """
+        stmt = select(SlotTemplate.start_time, SlotTemplate.end_time).where(
+            SlotTemplate.cafe_id == cafe_id,
+            SlotTemplate.weekday == weekday,
+            SlotTemplate.active.is_(True),
+        )
+        if exclude_template_id is not None:
+            stmt = stmt.where(SlotTemplate.id != exclude_template_id)
+        result = await session.execute(stmt)
+        if overlaps(result.all(), start_time, end_time):
+            raise AppException(
+                detail='Шаблон расписания пересекается с существующим!',
+            )
+
+    async def create_for_cafe(
+        self,
+        cafe_id: int,
+        obj_in: SlotTemplateCreate,
+        session: AsyncSession,
+    ) -> SlotTemplate:
+        """Создает шаблон расписания для кафе."""
+        if obj_in.active:
+            await self.check_overlaps(
+                cafe_id,
+                obj_in.weekday,
+                obj_in.start_time,
+                obj_in.end_time,
+                session,
+            )
+        template = await self.create(obj_in, session, cafe_id=cafe_id)
+        await session.commit()
+        await session.refresh(template)
+        return template
+
+    async def update_template(
+        self,
+        db_obj: SlotTemplate,
+        obj_in: SlotTemplateUpdate,
+        session: AsyncSession,
+    ) -> SlotTemplate:
+        """Обновляет шаблон расписания."""
+        data = obj_in.model_dump(exclude_unset=True)
+        merged = {
+            field: data.get(field, getattr(db_obj, field))
+            for field in ('weekday', 'start_time', 'end_time', 'active')
+        }
+        if merged['active']:
+            await self.check_overlaps(
+                db_obj.cafe_id,
+                merged['weekday'],
+                merged['start_time'],
+                merged['end_time'],
+                session,
+                exclude_template_id=db_obj.id,
+            )
+        template = await self.update(
+            db_obj,
+            obj_in,
+            session,
+            updatable_fields={
+                'weekday', 'start_time', 'end_time', 'description', 'active',
+            },
+        )
+        await session.commit()
+        await session.refresh(template)
+        logger.info(f'Обновлен шаблон расписания id={template.id}')
+        return template
+
+
+slot_template_crud = CRUDSlotTemplate(SlotTemplate)
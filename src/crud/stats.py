@@ -0,0 +1,266 @@
+from collections import defaultdict
+from datetime import date
+from typing import Any, Iterable
+
+from sqlalchemy import Row, case, delete, func, insert, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db import advisory_xact_lock
+from src.models.archive import time_slots_archive_table
+from src.models.booking import (
+    BookingModel,
+    BookingStatus,
+    booking_dishes_table,
+    booking_slots_table,
+    booking_tables_table,
+)
+from src.models.dish import Dish
+from src.models.slot import TimeSlot
+from src.models.stats import (
+    ROLLUP_TABLES,
+    booking_daily_rollup_table,
+    booking_occupancy_rollup_table,
+    dish_preorder_rollup_table,
+    stats_pending_days_table,
+)
+from src.models.table import TableModel
+
+
+class CRUDStats:
+    """Агрегаты бронирований по дням кафе и чтение статистики."""
+
+    @staticmethod
+    def _rollup_selects(*criteria: Any) -> dict[Any, Any]:
+        """INSERT ... SELECT для каждой таблицы агрегатов."""
+        booked = BookingModel.status != BookingStatus.CANCELLED
+        base = [BookingModel.active.is_(True), *criteria]
+        key = [BookingModel.cafe_id, BookingModel.booking_date]
+        daily = select(
+            *key,
+            func.sum(case((booked, 1), else_=0)),
+            func.sum(case((booked, BookingModel.guests_number), else_=0)),
+            func.sum(case((booked, 0), else_=1)),
+        ).where(*base).group_by(*key)
+        occupancy_key = [
+            *key,
+            booking_slots_table.c.slot_id,
+            booking_tables_table.c.table_id,
+            TimeSlot.start_time,
+            TimeSlot.end_time,
+        ]
+        occupancy = (
+            select(*occupancy_key, func.count())
+            .select_from(BookingModel)
+            .join(
+                booking_slots_table,
+                booking_slots_table.c.booking_id == BookingModel.id,
+            )
+            .join(TimeSlot, TimeSlot.id == booking_slots_table.c.slot_id)
+            .join(
+                booking_tables_table,
+                booking_tables_table.c.booking_id == BookingModel.id,
+            )
+            .where(booked, *base)
+            .group_by(*occupancy_key)
+        )
+        dish_key = [*key, booking_dishes_table.c.dish_id]
+        dishes = (
+            select(*dish_key, func.count())
+            .select_from(BookingModel)
+            .join(
+                booking_dishes_table,
+                booking_dishes_table.c.booking_id == BookingModel.id,
+            )
+            .where(booked, *base)
+            .group_by(*dish_key)
+        )
+        return {
+            booking_daily_rollup_table: daily,
+            booking_occupancy_rollup_table: occupancy,
+            dish_preorder_rollup_table: dishes,
+        }
+
+    @staticmethod
+    def _days(
+        column: Any,
+        date_from: date | None,
+        dates: list[date] | None,
+    ) -> Any:
+        """Условие на дни пересчета: список дней или все начиная с даты."""
+        if dates is not None:
+            return column.in_(dates)
+        return column >= date_from
+
+    async def _rebuild_cafe(
+        self,
+        session: AsyncSession,
+        cafe_id: int,
+        date_from: date | None = None,
+        dates: list[date] | None = None,
+    ) -> None:
+        """Пересчитывает агрегаты кафе за выбранные дни и фиксирует."""
+        await advisory_xact_lock(session, f'stats:{cafe_id}')
+        selects = self._rollup_selects(
+            BookingModel.cafe_id == cafe_id,
+            self._days(BookingModel.booking_date, date_from, dates),
+        )
+        for table, stmt in selects.items():
+            await session.execute(
+                delete(table).where(
+                    table.c.cafe_id == cafe_id,
+                    self._days(table.c.date, date_from, dates),
+                ),
+            )
+            await session.execute(
+                insert(table).from_select(
+                    [column.name for column in table.columns],
+                    stmt,
+                ),
+            )
+        await session.commit()
+
+    async def mark_days(
+        self,
+        session: AsyncSession,
+        cafe_id: int,
+        dates: Iterable[date],
+    ) -> None:
+        """Ставит дни кафе, затронутые изменением, в очередь пересчета.
+
+        Вызывается до фиксации изменения бронирования и фиксируется
+        вместе с ним. Блокировок и пересчета в запросе нет: агрегаты
+        обновляет задача refresh_pending.
+        """
+        await session.execute(
+            insert(stats_pending_days_table),
+            [{'cafe_id': cafe_id, 'date': day} for day in set(dates)],
+        )
+
+    async def refresh_pending(self, session: AsyncSession) -> int:
+        """Пересчитывает агрегаты дней из очереди и очищает ее.
+
+        Берутся строки, записанные до начала пересчета. Дни кафе
+        пересчитываются и удаляются из очереди одной транзакцией.
+        """
+        queue = stats_pending_days_table
+        last_id = await session.scalar(select(func.max(queue.c.id)))
+        if last_id is None:
+            return 0
+        result = await session.execute(
+            select(queue.c.cafe_id, queue.c.date)
+            .where(queue.c.id <= last_id)
+            .distinct(),
+        )
+        days: dict[int, list[date]] = defaultdict(list)
+        for cafe_id, day in result:
+            days[cafe_id].append(day)
+        for cafe_id, dates in days.items():
+            await session.execute(
+                delete(queue).where(
+                    queue.c.cafe_id == cafe_id,
+                    queue.c.id <= last_id,
+                ),
+            )
+            await self._rebuild_cafe(session, cafe_id, dates=dates)
+        return len(days)
+
+    async def rebuild(self, session: AsyncSession, date_from: date) -> int:
+        """Пересчитывает агрегаты всех кафе начиная с даты.
+
+        Каждое кафе пересчитывается отдельной транзакцией. Более ранние
+        дни не трогаются: их бронирования могут быть уже в архиве.
+        """
+        cafes = await session.scalars(
+            union(
+                select(BookingModel.cafe_id).where(
+                    BookingModel.booking_date >= date_from,
+                ),
+                *[
+                    select(table.c.cafe_id).where(table.c.date >= date_from)
+                    for table in ROLLUP_TABLES
+                ],
+            ),
+        )
+        cafe_ids = list(cafes)
+        for cafe_id in cafe_ids:
+            await self._rebuild_cafe(session, cafe_id, date_from=date_from)
+        return len(cafe_ids)
+
+    async def get_rows(
+        self,
+        session: AsyncSession,
+        table: Any,
+        cafe_id: int,
+        date_from: date,
+        date_to: date,
+    ) -> list[Row]:
+        """Строки агрегата кафе за период."""
+        result = await session.execute(
+            select(table).where(
+                table.c.cafe_id == cafe_id,
+                table.c.date.between(date_from, date_to),
+            ),
+        )
+        return list(result.all())
+
+    async def get_slot_times(
+        self,
+        session: AsyncSession,
+        cafe_id: int,
+        date_from: date,
+        date_to: date,
+    ) -> list[Row]:
+        """Даты и время всех слотов кафе за период, включая архив."""
+        archive = time_slots_archive_table
+        result = await session.execute(
+            union(
+                select(
+                    TimeSlot.id,
+                    TimeSlot.date,
+                    TimeSlot.start_time,
+                    TimeSlot.end_time,
+                ).where(
+                    TimeSlot.cafe_id == cafe_id,
+                    TimeSlot.active.is_(True),
+                    TimeSlot.date.between(date_from, date_to),
+                ),
+                select(
+                    archive.c.id,
+                    archive.c.date,
+                    archive.c.start_time,
+                    archive.c.end_time,
+                ).where(
+                    archive.c.cafe_id == cafe_id,
+                    archive.c.active.is_(True),
+                    archive.c.date.between(date_from, date_to),
+                ),
+            ),
+        )
+        return list(result.all())
+
+    async def get_tables(
+        self,
+        session: AsyncSession,
+        cafe_id: int,
+    ) -> list[Row]:
+        """ID и вместимость столов кафе."""
+        result = await session.execute(
+            select(TableModel.id, TableModel.seats_number, TableModel.active)
+            .where(TableModel.cafe_id == cafe_id)
+            .order_by(TableModel.id),
+        )
+        return list(result.all())
+
+    async def get_dish_names(
+        self,
+        session: AsyncSession,
+        dish_ids: list[int],
+    ) -> dict[int, str]:
+        """Названия блюд по ID."""
+        result = await session.execute(
+            select(Dish.id, Dish.name).where(Dish.id.in_(dish_ids)),
+        )
+        return dict(result.all())
+
+
+stats_crud = CRUDStats()
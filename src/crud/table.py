@@ -1,12 +1,15 @@
-from typing import List, Optional
+from typing import Any, List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import and_, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.core.access import AccessScope
+from src.core.importing import batched
 from src.core.logger import logger
+from src.crud.base import get_projection, load_projected_relations
 from src.models import Cafe, TableModel
-from src.schemas import TableCreate, TableUpdate
+from src.schemas import Table, TableCreate, TableUpdate
 
 
 class TableCRUD:
@@ -16,35 +19,44 @@ class TableCRUD:
         self,
         cafe_id: int,
         table_id: Optional[int] = None,
-        include_inactive: bool = False,
+        scope: Optional[AccessScope] = None,
+        query: Optional[select] = None,
     ) -> select:
-        """Формирует запрос с фильтрацией по кафе и активности."""
-        query = (
-            select(TableModel)
-            .options(selectinload(TableModel.cafe).selectinload(Cafe.managers))
-            .where(TableModel.cafe_id == cafe_id)
-        )
+        """Формирует запрос с фильтрацией по кафе и активности.
+
+        Без scope - только активные столы активного кафе, со scope -
+        также неактивные в кафе под управлением пользователя. Без query
+        выбираются объекты TableModel с кафе и менеджерами.
+        """
+        if query is None:
+            query = select(TableModel).options(
+                selectinload(TableModel.cafe).selectinload(Cafe.managers),
+            )
+        query = query.where(TableModel.cafe_id == cafe_id)
         if table_id is not None:
             query = query.where(TableModel.id == table_id)
-        if not include_inactive:
-            query = query.join(Cafe, TableModel.cafe_id == Cafe.id).where(
-                TableModel.active.is_(True),
-                Cafe.active.is_(True),
+        if scope is None:
+            visible = and_(TableModel.active.is_(True), Cafe.active.is_(True))
+        elif scope.is_admin:
+            return query
+        else:
+            visible = scope.visible(
+                TableModel.cafe_id, TableModel.active, Cafe.active,
             )
-        return query
+        return query.join(Cafe, TableModel.cafe_id == Cafe.id).where(visible)
 
     async def get_by_id_and_cafe(
         self,
         session: AsyncSession,
         table_id: int,
         cafe_id: int,
-        include_inactive: bool = False,
+        scope: Optional[AccessScope] = None,
     ) -> Optional[TableModel]:
         """Возвращает стол по ID, привязанный к кафе."""
         query = self._build_query(
             cafe_id=cafe_id,
             table_id=table_id,
-            include_inactive=include_inactive,
+            scope=scope,
         )
         result = await session.execute(query)
         table = result.scalars().first()
@@ -56,15 +68,25 @@ class TableCRUD:
         self,
         session: AsyncSession,
         cafe_id: int,
-        include_inactive: bool = False,
-    ) -> List[TableModel]:
-        """Возвращает все столы кафе (активные по умолчанию)."""
+        scope: Optional[AccessScope] = None,
+    ) -> list[dict[str, Any]]:
+        """Возвращает столы кафе, видимые в области доступа scope.
+
+        Выбираются только колонки схемы Table, кафе с менеджерами
+        догружается проекцией.
+        """
         query = self._build_query(
             cafe_id=cafe_id,
-            include_inactive=include_inactive,
+            scope=scope,
+            query=select(*get_projection(TableModel, Table).columns),
         )
         result = await session.execute(query)
-        tables = result.scalars().all()
+        tables = await load_projected_relations(
+            session,
+            TableModel,
+            Table,
+            [dict(row) for row in result.mappings()],
+        )
         logger.info(f'Найдено {len(tables)} столов в кафе id={cafe_id}')
         return tables
 
@@ -94,7 +116,9 @@ class TableCRUD:
         obj_in: TableUpdate,
     ) -> TableModel:
         """Обновляет стол и возвращает объект с загруженными связями."""
-        update_data = obj_in.model_dump(exclude_unset=True)
+        update_data = obj_in.model_dump(
+            exclude_unset=True, exclude={'version'},
+        )
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         session.add(db_obj)
@@ -108,5 +132,21 @@ class TableCRUD:
         logger.info(f'Обновлён стол id={table.id} в кафе id={table.cafe_id}')
         return table
 
+    async def bulk_create(
+        self,
+        session: AsyncSession,
+        cafe_id: int,
+        objs_in: List[TableCreate],
+    ) -> int:
+        """Создаёт столы пачками многострочных INSERT одной транзакцией."""
+        rows = [
+            {**obj_in.model_dump(), 'cafe_id': cafe_id} for obj_in in objs_in
+        ]
+        for batch in batched(rows):
+            await session.execute(insert(TableModel), batch)
+        await session.commit()
+        logger.info(f'Импортировано {len(rows)} столов в кафе id={cafe_id}')
+        return len(rows)
+
 
 table_crud = TableCRUD()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any, Optional
 
+from pydantic import BaseModel
 from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -112,8 +113,17 @@ class CRUDUser(CRUDBase):
         session: AsyncSession,
         *,
         only_active: bool = True,
-    ) -> list[User]:
-        """Возвращает всех пользователей, можно фильтровать только активные."""
+        projection: type[BaseModel] | None = None,
+    ) -> list[User] | list[dict[str, Any]]:
+        """Возвращает всех пользователей, можно фильтровать только активные.
+
+        С projection возвращаются словари только с колонками схемы.
+        """
+        if projection is not None:
+            criteria = [User.active.is_(True)] if only_active else []
+            return await self.get_multi_projected(
+                session, projection, *criteria,
+            )
         stmt = select(self.model)
         if only_active:
             stmt = stmt.where(User.active.is_(True))
@@ -0,0 +1,38 @@
+from src.core.config import settings
+from src.core.scheduler import scheduler
+from src.jobs.booking import (
+    archive_bookings,
+    create_partitions,
+    rebuild_stats,
+    refresh_pending_stats,
+    transition_booking_statuses,
+)
+
+
+def register_jobs() -> None:
+    """Регистрирует периодические задачи приложения в планировщике."""
+    scheduler.add_job(
+        'booking_statuses',
+        transition_booking_statuses,
+        settings.booking_status_interval_sec,
+    )
+    scheduler.add_job(
+        'booking_archive',
+        archive_bookings,
+        settings.archive_interval_sec,
+    )
+    scheduler.add_job(
+        'partitions',
+        create_partitions,
+        settings.partition_interval_sec,
+    )
+    scheduler.add_job(
+        'stats_pending',
+        refresh_pending_stats,
+        settings.stats_pending_interval_sec,
+    )
+    scheduler.add_job(
+        'stats_rebuild',
+        rebuild_stats,
+        settings.stats_interval_sec,
+    )
@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+
+from src.core.config import settings
+from src.core.db import AsyncSessionLocal
+from src.core.logger import logger
+from src.core.partitions import ensure_partitions
+from src.crud.archive import archive_crud
+from src.crud.booking import booking_crud
+from src.crud.stats import stats_crud
+
+
+async def transition_booking_statuses() -> None:
+    """Переводит бронирования в ACTIVE и COMPLETED по времени слотов."""
+    async with AsyncSessionLocal() as session:
+        changed = await booking_crud.transition_statuses(session)
+    if any(changed.values()):
+        logger.info(
+            'Обновлены статусы бронирований',
+            details={status.name: count for status, count in changed.items()},
+        )
+
+
+async def archive_bookings() -> None:
+    """Переносит в архив бронирования и слоты старше срока хранения."""
+    before = date.today() - timedelta(days=settings.archive_retention_days)
+    async with AsyncSessionLocal() as session:
+        await archive_crud.archive_bookings(session, before)
+        await archive_crud.archive_time_slots(session, before)
+
+
+async def create_partitions() -> None:
+    """Заранее создает помесячные секции бронирований и слотов."""
+    async with AsyncSessionLocal() as session:
+        await ensure_partitions(session)
+
+
+async def rebuild_stats() -> None:
+    """Сверяет агрегаты статистики за последние дни с бронированиями."""
+    date_from = date.today() - timedelta(days=settings.stats_rebuild_days)
+    async with AsyncSessionLocal() as session:
+        await stats_crud.rebuild(session, date_from)
+
+
+async def refresh_pending_stats() -> None:
+    """Пересчитывает агрегаты дней, измененных бронированиями."""
+    async with AsyncSessionLocal() as session:
+        cafes = await stats_crud.refresh_pending(session)
+    if cafes:
+        logger.info(
+            'Пересчитаны агрегаты статистики',
+            details={'cafes': cafes},
+        )
@@ -1,30 +1,147 @@
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+from typing import Any, AsyncIterator
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
-from src.api.routers import main_router
-from src.core.config import settings
-from src.core.exceptions import AppException
-from src.core.init_db import create_first_superuser
-
-app = FastAPI(title=settings.app_title)
-
-app.include_router(main_router, prefix="/api/v1")
-
+from src.core.config import Settings, get_settings
+from src.core.logger import logger
 
-@app.on_event('startup')
-async def startup() -> None:
-    """Функция запускается при старте приложения, создает суперпользователя."""
-    if settings.db_dialect == "sqlite":
-        await create_first_superuser()
-    else:
-        pass
 
-
-@app.exception_handler(AppException)
-async def handle_app_exception(request: Request, exc: AppException,
+async def handle_app_exception(request: Request, exc: Exception,
                                ) -> JSONResponse:
     """Обработчик кастомных исключений приложения."""
     return JSONResponse(
         status_code=exc.status_code,
         content={'detail': exc.detail},
     )
+
+
+async def handle_stale_data(request: Request, exc: Exception,
+                            ) -> JSONResponse:
+    """Строку изменили между чтением и записью: версия не совпала."""
+    return JSONResponse(
+        status_code=HTTPStatus.CONFLICT,
+        content={
+            'detail': 'Объект изменен другим запросом, '
+                      'повторите с актуальной версией',
+        },
+    )
+
+
+def check_shared_state(app_settings: Settings) -> None:
+    """Предупреждает о состоянии, которое не делится между воркерами.
+
+    Удержания столов и ключи идемпотентности в памяти, события
+    занятости и сбросы кешей по локальной шине видит только свой воркер.
+    """
+    for name, value in (
+        ('ttl_store', app_settings.ttl_store),
+        ('realtime_bus', app_settings.realtime_bus),
+    ):
+        if value in ('memory', 'local'):
+            logger.warning(
+                'Состояние воркера не разделяется между воркерами',
+                details={
+                    'setting': name,
+                    'value': value,
+                    'workers': app_settings.web_concurrency,
+                },
+            )
+
+
+def create_app() -> FastAPI:
+    """Создает приложение: роутеры, middleware, обработчики и события.
+
+    Эндпоинты, CRUD, модели и фоновые задачи импортируются здесь,
+    а настройки читаются из окружения при первом вызове, поэтому
+    импорт src.main дешевый. Движок БД, хранилища и шины событий -
+    общие для процесса и строятся из тех же get_settings().
+    """
+    from sqlalchemy.orm.exc import StaleDataError
+
+    from src.api.endpoints import health_router
+    from src.api.routers import get_routers
+    from src.core.cache import cache_invalidation
+    from src.core.db import engine
+    from src.core.exceptions import AppException
+    from src.core.init_db import create_first_superuser
+    from src.core.realtime import availability_hub
+    from src.core.scheduler import scheduler
+    from src.core.warmup import warm_up
+    from src.jobs import register_jobs
+
+    app_settings = get_settings()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        """Старт, прогрев и остановка воркера.
+
+        /health/ready отвечает 200 только после прогрева пула
+        и горячих запросов и снова 503 с начала остановки.
+        """
+        app.state.ready = False
+        if app_settings.web_concurrency > 1:
+            check_shared_state(app_settings)
+        if app_settings.db_dialect == "sqlite":
+            await create_first_superuser()
+        await availability_hub.start()
+        await cache_invalidation.start()
+        if app_settings.scheduler_enabled:
+            register_jobs()
+            scheduler.start()
+        await warm_up(
+            app_settings.warmup_connections,
+            app_settings.warmup_statements,
+        )
+        app.state.ready = True
+        try:
+            yield
+        finally:
+            app.state.ready = False
+            await scheduler.stop()
+            await cache_invalidation.stop()
+            await availability_hub.stop()
+            # Соединения сразу возвращаются серверу для новых воркеров.
+            await engine.dispose()
+
+    app = FastAPI(title=app_settings.app_title, lifespan=lifespan)
+    app.include_router(health_router)
+    # Роутеры подключаются к приложению напрямую: без промежуточного
+    # APIRouter маршруты не копируются дважды.
+    for router in get_routers():
+        app.include_router(router, prefix="/api/v1")
+
+    if app_settings.query_budget_mode != 'off':
+        from src.core.query_budget import (
+            QueryBudgetMiddleware,
+            install_query_budget,
+        )
+
+        install_query_budget()
+        app.add_middleware(QueryBudgetMiddleware)
+
+    if app_settings.statement_cache_stats:
+        from src.core.statement_cache import install_statement_cache_stats
+
+        install_statement_cache_stats()
+
+    if app_settings.profiling_enabled:
+        from src.core.profiling import ProfilingMiddleware
+
+        app.add_middleware(ProfilingMiddleware)
+
+    app.add_exception_handler(AppException, handle_app_exception)
+    app.add_exception_handler(StaleDataError, handle_stale_data)
+
+    return app
+
+
+def __getattr__(name: str) -> Any:
+    """Приложение для `uvicorn src.main:app` создается при обращении."""
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -6,4 +6,7 @@ from .table import TableModel as TableModel # noqa
 from .user import User as User # noqa
 from .slot import TimeSlot as TimeSlot # noqa
 from .booking import BookingModel as BookingModel # noqa
-from .booking import BookingStatus as BookingStatus # noqa
\ No newline at end of file
+from .booking import BookingStatus as BookingStatus # noqa
+from .slot_template import SlotTemplate as SlotTemplate # noqa
+from .archive import ARCHIVE_TABLES as ARCHIVE_TABLES # noqa
+from .stats import ROLLUP_TABLES as ROLLUP_TABLES # noqa
@@ -0,0 +1,113 @@
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    Time,
+    func,
+)
+from sqlalchemy import Enum as SQLEnum
+
+from src.core.db import Base
+from src.models.booking import BookingStatus
+
+
+def _archived_at() -> Column:
+    """Колонка с моментом переноса строки в архив."""
+    return Column(
+        'archived_at',
+        DateTime,
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
+bookingmodel_archive_table = Table(
+    'bookingmodel_archive',
+    Base.metadata,
+    Column('id', Integer, primary_key=True, autoincrement=False),
+    Column('user_id', Integer, nullable=False, index=True),
+    Column('cafe_id', Integer, nullable=False),
+    Column('booking_date', Date, nullable=False),
+    Column('guests_number', Integer, nullable=False),
+    Column('status', SQLEnum(BookingStatus), nullable=False),
+    Column('note', Text, nullable=True),
+    Column('active', Boolean, nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False),
+    Column('version', Integer, server_default='1', nullable=False),
+    _archived_at(),
+    Index(
+        'ix_bookingmodel_archive_cafe_id_booking_date',
+        'cafe_id',
+        'booking_date',
+    ),
+)
+"""Архив завершенных и отмененных бронирований.
+
+Внешних ключей нет: архив переживает удаление связанных записей.
+"""
+
+
+booking_tables_archive_table = Table(
+    'booking_tables_archive',
+    Base.metadata,
+    Column('booking_id', Integer, primary_key=True),
+    Column('table_id', Integer, primary_key=True),
+    _archived_at(),
+)
+"""Архив связей бронирований и столов."""
+
+
+booking_slots_archive_table = Table(
+    'booking_slots_archive',
+    Base.metadata,
+    Column('booking_id', Integer, primary_key=True),
+    Column('slot_id', Integer, primary_key=True),
+    _archived_at(),
+)
+"""Архив связей бронирований и временных слотов."""
+
+
+booking_dishes_archive_table = Table(
+    'booking_dishes_archive',
+    Base.metadata,
+    Column('booking_id', Integer, primary_key=True),
+    Column('dish_id', Integer, primary_key=True),
+    _archived_at(),
+)
+"""Архив связей бронирований и блюд."""
+
+
+time_slots_archive_table = Table(
+    'time_slots_archive',
+    Base.metadata,
+    Column('id', Integer, primary_key=True, autoincrement=False),
+    Column('cafe_id', Integer, nullable=False),
+    Column('date', Date, nullable=False),
+    Column('start_time', Time, nullable=False),
+    Column('end_time', Time, nullable=False),
+    Column('description', String, nullable=True),
+    Column('active', Boolean, nullable=False),
+    Column('created_at', DateTime, nullable=False),
+    Column('updated_at', DateTime, nullable=False),
+    Column('version', Integer, server_default='1', nullable=False),
+    _archived_at(),
+    Index('ix_time_slots_archive_cafe_id_date', 'cafe_id', 'date'),
+)
+"""Архив прошедших временных слотов без активных бронирований."""
+
+
+ARCHIVE_TABLES = {
+    'bookingmodel': bookingmodel_archive_table,
+    'booking_tables': booking_tables_archive_table,
+    'booking_slots': booking_slots_archive_table,
+    'booking_dishes': booking_dishes_archive_table,
+    'time_slots': time_slots_archive_table,
+}
+"""Соответствие горячих таблиц архивным."""
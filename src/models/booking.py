@@ -1,11 +1,11 @@
 from datetime import date
 from enum import IntEnum
 
-from sqlalchemy import Column, Date, ForeignKey, Table, Text
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, Table, Text
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.core.db import ActiveMixin, Base, TimestampMixin
+from src.core.db import ActiveMixin, Base, TimestampMixin, VersionMixin
 
 
 class BookingStatus(IntEnum):
@@ -14,13 +14,17 @@ class BookingStatus(IntEnum):
     BOOKED = 0
     CANCELLED = 1
     ACTIVE = 2
+    COMPLETED = 3
 
 
+# В Postgres bookingmodel и time_slots секционированы по дате и id
+# в них не уникален, поэтому внешних ключей на них у ассоциативных
+# таблиц нет: условия связей заданы явно, строки ассоциаций удаляют
+# CRUD и архивирование.
 booking_tables_table = Table(
     'booking_tables',
     Base.metadata,
-    Column('booking_id', ForeignKey('bookingmodel.id', ondelete='CASCADE'),
-           primary_key=True),
+    Column('booking_id', Integer, primary_key=True),
     Column('table_id', ForeignKey('tables.id', ondelete='CASCADE'),
            primary_key=True),
 )
@@ -30,10 +34,8 @@ booking_tables_table = Table(
 booking_slots_table = Table(
     'booking_slots',
     Base.metadata,
-    Column('booking_id', ForeignKey('bookingmodel.id', ondelete='CASCADE'),
-           primary_key=True),
-    Column('slot_id', ForeignKey('time_slots.id', ondelete='CASCADE'),
-           primary_key=True),
+    Column('booking_id', Integer, primary_key=True),
+    Column('slot_id', Integer, primary_key=True),
 )
 """Ассоциативная таблица для связи бронирований и временных слотов."""
 
@@ -41,15 +43,14 @@ booking_slots_table = Table(
 booking_dishes_table = Table(
     'booking_dishes',
     Base.metadata,
-    Column('booking_id', ForeignKey('bookingmodel.id', ondelete='CASCADE'),
-           primary_key=True),
+    Column('booking_id', Integer, primary_key=True),
     Column('dish_id', ForeignKey('dish.id', ondelete='CASCADE'),
            primary_key=True),
 )
 """Ассоциативная таблица для связи бронирований и блюд."""
 
 
-class BookingModel(Base, TimestampMixin, ActiveMixin):
+class BookingModel(Base, TimestampMixin, ActiveMixin, VersionMixin):
     """Модель бронирования столов в кафе.
 
     Attributes:
@@ -84,6 +85,14 @@ class BookingModel(Base, TimestampMixin, ActiveMixin):
     )
     note: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    __table_args__ = (
+        Index(
+            'ix_bookingmodel_cafe_id_booking_date',
+            'cafe_id',
+            'booking_date',
+        ),
+    )
+
     user: Mapped['User'] = relationship(
         'User',
         back_populates='bookings',
@@ -97,18 +106,24 @@ class BookingModel(Base, TimestampMixin, ActiveMixin):
     tables: Mapped[list['TableModel']] = relationship(
         'TableModel',
         secondary=booking_tables_table,
+        primaryjoin='BookingModel.id == foreign(booking_tables.c.booking_id)',
+        secondaryjoin='TableModel.id == foreign(booking_tables.c.table_id)',
         back_populates='bookings',
         lazy='selectin',
     )
     slots: Mapped[list['TimeSlot']] = relationship(
         'TimeSlot',
         secondary=booking_slots_table,
+        primaryjoin='BookingModel.id == foreign(booking_slots.c.booking_id)',
+        secondaryjoin='TimeSlot.id == foreign(booking_slots.c.slot_id)',
         back_populates='bookings',
         lazy='selectin',
     )
     menu: Mapped[list['Dish']] = relationship(
         'Dish',
         secondary=booking_dishes_table,
+        primaryjoin='BookingModel.id == foreign(booking_dishes.c.booking_id)',
+        secondaryjoin='Dish.id == foreign(booking_dishes.c.dish_id)',
         back_populates='bookings',
         lazy='selectin',
     )
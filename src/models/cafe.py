@@ -2,10 +2,18 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, ForeignKey, Integer, String, Table, Text
+from sqlalchemy import (
+    Column,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Table,
+    Text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.core.db import ActiveMixin, Base, TimestampMixin
+from src.core.db import ActiveMixin, Base, TimestampMixin, VersionMixin
 from src.models.booking import BookingModel
 
 if TYPE_CHECKING:
@@ -21,7 +29,7 @@ cafe_managers_table = Table(
 )
 
 
-class Cafe(Base, TimestampMixin, ActiveMixin):
+class Cafe(Base, TimestampMixin, ActiveMixin, VersionMixin):
     """Модель кафе с менеджерами, блюдами и столами."""
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -43,6 +51,8 @@ class Cafe(Base, TimestampMixin, ActiveMixin):
     )
     description: Mapped[str | None] = mapped_column(Text)
     photo: Mapped[str | None] = mapped_column(Text)
+    latitude: Mapped[float | None] = mapped_column(Float)
+    longitude: Mapped[float | None] = mapped_column(Float)
 
     managers: Mapped[list['User']] = relationship(
         'User',
@@ -8,12 +8,12 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.core.db import ActiveMixin, Base, TimestampMixin
+from src.core.db import ActiveMixin, Base, TimestampMixin, VersionMixin
 from src.models.booking import BookingModel
 from src.models.cafe import Cafe
 
 
-class Dish(Base, TimestampMixin, ActiveMixin):
+class Dish(Base, TimestampMixin, ActiveMixin, VersionMixin):
     """Модель блюда."""
 
     cafe_id: Mapped[int] = mapped_column(
@@ -32,6 +32,10 @@ class Dish(Base, TimestampMixin, ActiveMixin):
     bookings: Mapped[list['BookingModel']] = relationship(
         'BookingModel',
         secondary='booking_dishes',
+        primaryjoin='Dish.id == foreign(booking_dishes.c.dish_id)',
+        secondaryjoin=(
+            'BookingModel.id == foreign(booking_dishes.c.booking_id)'
+        ),
         back_populates='menu',
         lazy='selectin',
     )
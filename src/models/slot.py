@@ -4,11 +4,11 @@ from datetime import time
 from sqlalchemy import Date, ForeignKey, String, Time
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.core.db import ActiveMixin, Base, TimestampMixin
+from src.core.db import ActiveMixin, Base, TimestampMixin, VersionMixin
 from src.models.booking import BookingModel
 
 
-class TimeSlot(Base, TimestampMixin, ActiveMixin):
+class TimeSlot(Base, TimestampMixin, ActiveMixin, VersionMixin):
     """Модель временных слотов для бронирования в кафе.
 
     Attributes:
@@ -36,6 +36,8 @@ class TimeSlot(Base, TimestampMixin, ActiveMixin):
     bookings: Mapped[list['BookingModel']] = relationship(
         'BookingModel',
         secondary='booking_slots',
+        primaryjoin='TimeSlot.id == foreign(booking_slots.c.slot_id)',
+        secondaryjoin='BookingModel.id == foreign(booking_slots.c.booking_id)',
         back_populates='slots',
         lazy='selectin',
     )
@@ -0,0 +1,35 @@
+from datetime import time
+
+from sqlalchemy import CheckConstraint, ForeignKey, SmallInteger, String, Time
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.db import ActiveMixin, Base, TimestampMixin
+
+
+class SlotTemplate(Base, TimestampMixin, ActiveMixin):
+    """Шаблон недельного расписания слотов кафе.
+
+    Attributes:
+        cafe_id: ID кафе, к которому относится шаблон
+        weekday: День недели (0 - понедельник, 6 - воскресенье)
+        start_time: Время начала слота
+        end_time: Время окончания слота
+        description: Описание создаваемых слотов (опционально)
+
+    """
+
+    __tablename__ = 'slot_templates'
+
+    cafe_id: Mapped[int] = mapped_column(ForeignKey('cafe.id'),
+                                         nullable=False, index=True)
+    weekday: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    start_time: Mapped[time] = mapped_column(Time, nullable=False)
+    end_time: Mapped[time] = mapped_column(Time, nullable=False)
+    description: Mapped[str | None] = mapped_column(String,
+                                                    nullable=True,
+                                                    default=None)
+
+    __table_args__ = (
+        CheckConstraint('weekday BETWEEN 0 AND 6', name='weekday_range'),
+        CheckConstraint('end_time > start_time', name='time_order'),
+    )
@@ -0,0 +1,65 @@
+from sqlalchemy import Column, Date, Integer, Table, Time
+
+from src.core.db import Base
+
+booking_daily_rollup_table = Table(
+    'booking_daily_rollup',
+    Base.metadata,
+    Column('cafe_id', Integer, primary_key=True),
+    Column('date', Date, primary_key=True),
+    Column('bookings', Integer, nullable=False),
+    Column('guests', Integer, nullable=False),
+    Column('cancelled', Integer, nullable=False),
+)
+"""Число бронирований и гостей кафе за день."""
+
+
+booking_occupancy_rollup_table = Table(
+    'booking_occupancy_rollup',
+    Base.metadata,
+    Column('cafe_id', Integer, primary_key=True),
+    Column('date', Date, primary_key=True),
+    Column('slot_id', Integer, primary_key=True),
+    Column('table_id', Integer, primary_key=True),
+    Column('start_time', Time, nullable=False),
+    Column('end_time', Time, nullable=False),
+    Column('bookings', Integer, nullable=False),
+)
+"""Занятость пар (слот, стол) кафе за день.
+
+Время слота копируется, чтобы статистика не зависела от архивирования
+слотов.
+"""
+
+
+dish_preorder_rollup_table = Table(
+    'dish_preorder_rollup',
+    Base.metadata,
+    Column('cafe_id', Integer, primary_key=True),
+    Column('date', Date, primary_key=True),
+    Column('dish_id', Integer, primary_key=True),
+    Column('orders', Integer, nullable=False),
+)
+"""Число предзаказов блюд кафе за день."""
+
+
+ROLLUP_TABLES = (
+    booking_daily_rollup_table,
+    booking_occupancy_rollup_table,
+    dish_preorder_rollup_table,
+)
+"""Таблицы агрегатов, пересчитываемые по дням кафе."""
+
+
+stats_pending_days_table = Table(
+    'stats_pending_days',
+    Base.metadata,
+    Column('id', Integer, primary_key=True),
+    Column('cafe_id', Integer, nullable=False),
+    Column('date', Date, nullable=False),
+)
+"""Очередь дней кафе, агрегаты которых нужно пересчитать.
+
+Строки пишутся вместе с изменением бронирования без блокировок,
+повторы допустимы: задача пересчета берет уникальные пары.
+"""
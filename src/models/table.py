@@ -3,13 +3,13 @@ from typing import TYPE_CHECKING
 from sqlalchemy import CheckConstraint, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.core.db import ActiveMixin, Base, TimestampMixin
+from src.core.db import ActiveMixin, Base, TimestampMixin, VersionMixin
 
 if TYPE_CHECKING:
     from src.models import BookingModel, Cafe
 
 
-class TableModel(Base, TimestampMixin, ActiveMixin):
+class TableModel(Base, TimestampMixin, ActiveMixin, VersionMixin):
     """Модель стола в кафе с количеством мест и описанием."""
 
     __tablename__ = 'tables'
@@ -33,6 +33,10 @@ class TableModel(Base, TimestampMixin, ActiveMixin):
     bookings: Mapped[list['BookingModel']] = relationship(
         'BookingModel',
         secondary='booking_tables',
+        primaryjoin='TableModel.id == foreign(booking_tables.c.table_id)',
+        secondaryjoin=(
+            'BookingModel.id == foreign(booking_tables.c.booking_id)'
+        ),
         back_populates='tables',
         lazy='selectin',
     )
@@ -1,9 +1,16 @@
-from datetime import datetime
+from datetime import date, datetime, time
 from enum import IntEnum
-from typing import List, Optional
+from typing import List, Optional, Self
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    TypeAdapter,
+    model_validator,
+)
 
+from src.core.constants import MAX_BATCH_BOOKINGS
 from src.schemas.cafe import CafeShort
 from src.schemas.dish import Dish
 from src.schemas.slot import TimeSlotShort
@@ -17,6 +24,7 @@ class BookingStatus(IntEnum):
     BOOKED = 0
     CANCELLED = 1
     ACTIVE = 2
+    COMPLETED = 3
 
 
 class BookingBase(BaseModel):
@@ -49,6 +57,8 @@ class BookingUpdate(BaseModel):
         None, description='Статус бронирования')
     note: Optional[str] = Field(None, description='Примечание к бронированию')
     active: Optional[bool] = Field(None, description='Активно ли бронирование')
+    version: Optional[int] = Field(
+        None, description='Ожидаемая версия объекта')
 
 
 class BookingShort(BaseModel):
@@ -74,5 +84,129 @@ class Booking(BookingShort):
     note: Optional[str] = Field(None, description='Комментарий к бронированию')
     created_at: datetime = Field(..., description='Дата создания')
     updated_at: datetime = Field(..., description='Дата обновления')
+    version: int = Field(..., description='Версия объекта')
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class BookingBatchItem(BaseModel):
+    """Элемент пакета бронирований."""
+
+    guests_number: int = Field(..., ge=1, description='Количество гостей')
+    tables: List[int] = Field(..., description='Бронируемые столы')
+    slots: List[int] = Field(..., description='Слоты бронирования')
+    menu: List[int] = Field(
+        [], description='Блюда для предварительного заказа')
+    note: Optional[str] = Field(None, description='Примечание к бронированию')
+
+
+class BookingRecurrence(BaseModel):
+    """Правило повторения: одни и те же столы в одно время раз в N дней.
+
+    Для каждой даты берется активный слот кафе с указанным временем.
+    """
+
+    start_date: date = Field(..., description='Дата первого бронирования')
+    count: int = Field(
+        ..., ge=1, le=MAX_BATCH_BOOKINGS, description='Число повторений')
+    interval_days: int = Field(
+        7, ge=1, description='Интервал между повторениями в днях')
+    start_time: time = Field(..., description='Время начала слота')
+    end_time: time = Field(..., description='Время окончания слота')
+    guests_number: int = Field(..., ge=1, description='Количество гостей')
+    tables: List[int] = Field(..., description='Бронируемые столы')
+    menu: List[int] = Field(
+        [], description='Блюда для предварительного заказа')
+    note: Optional[str] = Field(None, description='Примечание к бронированию')
+
+
+class BookingBatchCreate(BaseModel):
+    """Пакет бронирований: список элементов или правило повторения."""
+
+    cafe_id: int = Field(..., description='ID кафе')
+    items: Optional[List[BookingBatchItem]] = Field(
+        None,
+        min_length=1,
+        max_length=MAX_BATCH_BOOKINGS,
+        description='Бронирования пакета',
+    )
+    recurrence: Optional[BookingRecurrence] = Field(
+        None, description='Правило повторения')
+    atomic: bool = Field(
+        False,
+        description='Создать все бронирования или ни одного',
+    )
+
+    @model_validator(mode='after')
+    def validate_source(self) -> Self:
+        """Проверяет, что задан ровно один из items и recurrence."""
+        if (self.items is None) == (self.recurrence is None):
+            raise ValueError('Нужно передать либо items, либо recurrence')
+        return self
+
+
+class BookingBatchItemResult(BaseModel):
+    """Результат по элементу пакета."""
+
+    index: int = Field(..., description='Номер элемента в пакете')
+    status_code: int = Field(..., description='HTTP-статус элемента')
+    booking_id: Optional[int] = Field(None, description='ID бронирования')
+    booking_date: Optional[date] = Field(
+        None, description='Дата бронирования')
+    detail: Optional[str] = Field(None, description='Причина отказа')
+
+
+class BookingBatchResult(BaseModel):
+    """Результат пакетного создания бронирований."""
+
+    created: int = Field(..., description='Создано бронирований')
+    failed: int = Field(..., description='Не создано бронирований')
+    items: List[BookingBatchItemResult] = Field(
+        ..., description='Результаты по элементам')
+
+
+class BookingHoldCreate(BaseModel):
+    """Схема для удержания столов и слотов перед бронированием."""
+
+    cafe_id: int = Field(..., description='ID кафе')
+    guests_number: int = Field(1, ge=1, description='Количество гостей')
+    tables: List[int] = Field(..., description='Удерживаемые столы')
+    slots: List[int] = Field(..., description='Удерживаемые слоты')
+
+
+class BookingHold(BaseModel):
+    """Удержание столов и слотов."""
+
+    id: str = Field(..., description='ID удержания')
+    cafe_id: int = Field(..., description='ID кафе')
+    tables: List[int] = Field(..., description='Удержанные столы')
+    slots: List[int] = Field(..., description='Удержанные слоты')
+    expires_at: datetime = Field(..., description='Удержание истекает')
+
+
+class BookingExport(BaseModel):
+    """Плоская схема бронирования для выгрузки."""
+
+    id: int
+    user_id: int
+    cafe_id: int
+    booking_date: date
+    guests_number: int
+    status: BookingStatus
+    note: Optional[str] = None
+    active: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+class BookingArchived(BookingExport):
+    """Бронирование из архива с ID связанных объектов."""
+
+    tables: List[int] = Field(..., description='ID забронированных столов')
+    slots: List[int] = Field(..., description='ID временных слотов')
+    menu: List[int] = Field(..., description='ID блюд предзаказа')
+    archived_at: datetime = Field(..., description='Дата переноса в архив')
+
+
+BookingListAdapter = TypeAdapter(List[Booking])
+"""Заранее собранный адаптер для быстрой сериализации списков."""
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from src.core.custom_types import PhoneNumber
 from src.schemas.user import UserShort
@@ -17,8 +17,17 @@ class CafeCreate(BaseModel):
     phone: PhoneNumber  # type: ignore
     description: Optional[str] = None
     photo: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     managers: List[int] = []
 
+    @model_validator(mode='after')
+    def check_coordinates(self) -> 'CafeCreate':
+        """Широта и долгота задаются вместе."""
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError('Широта и долгота задаются вместе')
+        return self
+
 
 class CafeRead(BaseModel):
     """Схема для выдачи данных кафе наружу."""
@@ -29,10 +38,13 @@ class CafeRead(BaseModel):
     phone: PhoneNumber  # type: ignore
     description: Optional[str] = None
     photo: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     active: bool
     managers: List[UserShort]
     created_at: datetime
     updated_at: datetime
+    version: int
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -44,8 +56,11 @@ class CafeUpdate(BaseModel):
     phone: Optional[PhoneNumber] = None          # у тебя может быть regex
     description: Optional[str] = None
     photo: Optional[str] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     managers: Optional[List[int]] = None
     active: Optional[bool] = None
+    version: Optional[int] = None
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -58,6 +73,14 @@ class CafeShort(BaseModel):
     phone: PhoneNumber  # type: ignore
     description: Optional[str] = None
     photo: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     active: bool
     managers: List[UserShort]
     model_config = ConfigDict(from_attributes=True)
+
+
+class CafeNearby(CafeShort):
+    """Кафе рядом с точкой и расстояние до него."""
+
+    distance_km: float = Field(..., description='Расстояние, км')
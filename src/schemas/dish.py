@@ -41,6 +41,7 @@ class Dish(DishCreate):
     active: bool
     created_at: datetime
     updated_at: datetime
+    version: int
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -54,6 +55,7 @@ class DishUpdate(DishCreate):
     price: PositiveInt | None = None
     photo: str | None = None
     active: bool | None = None
+    version: int | None = None
 
     @field_validator('name', mode='before')
     def validate_name(cls, name: str | None) -> str | None:  # noqa: N805
@@ -0,0 +1,8 @@
+from pydantic import BaseModel, Field
+
+
+class HealthStatus(BaseModel):
+    """Состояние воркера для балансировщика."""
+
+    status: str = Field(..., description='ok, ready, not_ready или '
+                                         'database_unavailable')
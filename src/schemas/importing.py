@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+
+
+class ImportRowError(BaseModel):
+    """Строка, пропущенная при импорте."""
+
+    row: int = Field(..., description='Номер строки')
+    reason: str = Field(..., description='Причина пропуска')
+
+
+class ImportSummary(BaseModel):
+    """Итог массового импорта."""
+
+    created: int = Field(..., description='Создано записей')
+    skipped: list[ImportRowError] = Field(
+        ..., description='Пропущенные строки',
+    )
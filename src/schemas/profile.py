@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class ProfileInfo(BaseModel):
+    """Сохраненный профиль запроса."""
+
+    id: str = Field(..., description='ID профиля')
+    created_at: datetime = Field(..., description='Время записи, UTC')
+    name: str = Field(..., description='Метод и маршрут запроса')
+    duration_ms: float = Field(..., description='Длительность запроса, мс')
+    samples: int = Field(..., description='Количество выборок стека')
+    size: int = Field(..., description='Размер файла, байт')
@@ -0,0 +1,23 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SearchHit(BaseModel):
+    """Найденное кафе или блюдо."""
+
+    type: Literal['cafe', 'dish'] = Field(..., description='Тип объекта')
+    id: int = Field(..., description='ID кафе или блюда')
+    cafe_id: int = Field(..., description='ID кафе')
+    name: str = Field(..., description='Название')
+    rank: float = Field(..., description='Ранг совпадения')
+
+
+class SearchResult(BaseModel):
+    """Страница результатов поиска."""
+
+    items: List[SearchHit] = Field(..., description='Результаты')
+    next_cursor: Optional[str] = Field(
+        None,
+        description='Курсор следующей страницы',
+    )
@@ -10,17 +10,15 @@ from pydantic import (
     model_validator,
 )
 
+from src.core.constants import MAX_SLOT_GENERATE_DAYS
 from src.schemas.cafe import CafeShort
 
 
-class TimeSlotInputBase(BaseModel):
-    """Базовая схема для ввода слотов."""
+class TimeRangeBase(BaseModel):
+    """Базовая схема интервала времени для слотов и шаблонов."""
 
-    date: Optional[date_type] = Field(None, description='Дата слота')
     start_time: Optional[time] = Field(None, description='Время начала')
     end_time: Optional[time] = Field(None, description='Время окончания')
-    description: Optional[str] = Field(None, description='Описание слота')
-    active: Optional[bool] = Field(None, description='Активен ли слот')
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -67,6 +65,14 @@ class TimeSlotInputBase(BaseModel):
         return self
 
 
+class TimeSlotInputBase(TimeRangeBase):
+    """Базовая схема для ввода слотов."""
+
+    date: Optional[date_type] = Field(None, description='Дата слота')
+    description: Optional[str] = Field(None, description='Описание слота')
+    active: Optional[bool] = Field(None, description='Активен ли слот')
+
+
 class TimeSlotCreate(TimeSlotInputBase):
     """Схема создания слота."""
 
@@ -94,6 +100,9 @@ class TimeSlotCreate(TimeSlotInputBase):
 class TimeSlotUpdate(TimeSlotInputBase):
     """Схема обновления слота."""
 
+    version: Optional[int] = Field(
+        None, description='Ожидаемая версия объекта')
+
 
 class TimeSlotShort(BaseModel):
     """Короткая схема слотов для связи."""
@@ -114,3 +123,88 @@ class TimeSlotRead(TimeSlotShort):
 
     created_at: datetime
     updated_at: datetime
+    version: int
+
+
+class SlotTemplateBase(TimeRangeBase):
+    """Базовая схема шаблона расписания слотов."""
+
+    weekday: Optional[int] = Field(
+        None, ge=0, le=6, description='День недели (0 - понедельник)',
+    )
+    description: Optional[str] = Field(None, description='Описание слота')
+    active: Optional[bool] = Field(None, description='Активен ли шаблон')
+
+
+class SlotTemplateCreate(SlotTemplateBase):
+    """Схема создания шаблона расписания."""
+
+    weekday: int = Field(
+        ..., ge=0, le=6, description='День недели (0 - понедельник)',
+    )
+    start_time: time = Field(..., description='Время начала')
+    end_time: time = Field(..., description='Время окончания')
+    active: bool = Field(True, description='Активен ли шаблон')
+
+
+class SlotTemplateUpdate(SlotTemplateBase):
+    """Схема обновления шаблона расписания."""
+
+
+class SlotTemplateRead(BaseModel):
+    """Схема для чтения шаблона расписания."""
+
+    id: int
+    cafe_id: int
+    weekday: int = Field(..., description='День недели (0 - понедельник)')
+    start_time: time = Field(..., description='Время начала')
+    end_time: time = Field(..., description='Время окончания')
+    description: Optional[str] = Field(None, description='Описание слота')
+    active: bool = Field(..., description='Активен ли шаблон')
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TimeSlotGenerate(BaseModel):
+    """Схема генерации слотов по шаблонам за период."""
+
+    date_from: date_type = Field(..., description='Первая дата периода')
+    date_to: date_type = Field(..., description='Последняя дата периода')
+
+    @model_validator(mode='after')
+    def validate_period(self) -> Self:
+        """Проверяет границы периода генерации.
+
+        Raises:
+            ValueError: Если период в прошлом, перевернут или слишком длинный
+
+        """
+        if self.date_from < date_type.today():
+            raise ValueError('Нельзя создавать слоты в прошлом')
+        if self.date_to < self.date_from:
+            raise ValueError('Дата окончания раньше даты начала')
+        if (self.date_to - self.date_from).days >= MAX_SLOT_GENERATE_DAYS:
+            raise ValueError(
+                f'Период не может быть длиннее {MAX_SLOT_GENERATE_DAYS} дней',
+            )
+        return self
+
+
+class SkippedTimeSlot(BaseModel):
+    """Слот, пропущенный при генерации."""
+
+    date: date_type = Field(..., description='Дата слота')
+    start_time: time = Field(..., description='Время начала')
+    end_time: time = Field(..., description='Время окончания')
+    reason: str = Field(..., description='Причина пропуска')
+
+
+class TimeSlotGenerateResult(BaseModel):
+    """Итог генерации слотов по шаблонам."""
+
+    created: int = Field(..., description='Создано слотов')
+    skipped: list[SkippedTimeSlot] = Field(
+        ..., description='Пропущенные слоты',
+    )
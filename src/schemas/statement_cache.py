@@ -0,0 +1,24 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class StatementCacheQuery(BaseModel):
+    """Попадания запроса в кеш компиляции SQLAlchemy."""
+
+    name: str = Field(..., description='Имя запроса, other - без имени')
+    hits: int = Field(..., description='Готовый SQL взят из кеша')
+    misses: int = Field(..., description='Запрос скомпилирован заново')
+    uncached: int = Field(..., description='Запрос не кешируется')
+    hit_ratio: Optional[float] = Field(
+        None,
+        description='Доля попаданий среди кешируемых выполнений',
+    )
+
+
+class StatementCacheReport(BaseModel):
+    """Кеш скомпилированных запросов воркера."""
+
+    size: int = Field(..., description='Запросов в кеше движка')
+    capacity: int = Field(..., description='Размер кеша движка')
+    queries: List[StatementCacheQuery]
@@ -0,0 +1,59 @@
+from datetime import date as date_type
+from datetime import time
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class DayStats(BaseModel):
+    """Статистика кафе за день."""
+
+    date: date_type = Field(..., description='Дата')
+    slots: int = Field(..., description='Количество слотов')
+    bookings: int = Field(..., description='Количество бронирований')
+    guests: int = Field(..., description='Количество гостей')
+    cancelled: int = Field(..., description='Отменено бронирований')
+    utilisation: float = Field(..., description='Загрузка столов, доля')
+
+
+class TableStats(BaseModel):
+    """Статистика стола за период."""
+
+    table_id: int = Field(..., description='ID стола')
+    seats_number: Optional[int] = Field(None, description='Количество мест')
+    bookings: int = Field(..., description='Занято слотов')
+    utilisation: float = Field(..., description='Загрузка стола, доля')
+
+
+class SlotStats(BaseModel):
+    """Статистика интервала слотов за период."""
+
+    start_time: time = Field(..., description='Время начала')
+    end_time: time = Field(..., description='Время окончания')
+    slots: int = Field(..., description='Количество слотов с этим временем')
+    bookings: int = Field(..., description='Занято столов')
+    utilisation: float = Field(..., description='Загрузка столов, доля')
+
+
+class DishStats(BaseModel):
+    """Предзаказы блюда за период."""
+
+    dish_id: int = Field(..., description='ID блюда')
+    name: Optional[str] = Field(None, description='Название блюда')
+    orders: int = Field(..., description='Количество предзаказов')
+
+
+class CafeStats(BaseModel):
+    """Статистика кафе за период."""
+
+    cafe_id: int = Field(..., description='ID кафе')
+    date_from: date_type = Field(..., description='Начало периода')
+    date_to: date_type = Field(..., description='Конец периода')
+    bookings: int = Field(..., description='Количество бронирований')
+    guests: int = Field(..., description='Количество гостей')
+    cancelled: int = Field(..., description='Отменено бронирований')
+    utilisation: float = Field(..., description='Загрузка столов, доля')
+    days: List[DayStats] = Field(..., description='По дням')
+    tables: List[TableStats] = Field(..., description='По столам')
+    slots: List[SlotStats] = Field(..., description='По времени слотов')
+    dishes: List[DishStats] = Field(..., description='Предзаказы блюд')
@@ -27,6 +27,7 @@ class TableUpdate(BaseModel):
     )
     description: str | None = Field(None, description='Описание столика')
     active: bool | None = Field(None, description='Объект активен?')
+    version: int | None = Field(None, description='Ожидаемая версия объекта')
 
 
 class TableShort(TableBase):
@@ -44,5 +45,6 @@ class Table(TableShort):
 
     created_at: datetime = Field(..., description='Дата создания')
     updated_at: datetime = Field(..., description='Дата обновления')
+    version: int = Field(..., description='Версия объекта')
 
     model_config = ConfigDict(from_attributes=True)
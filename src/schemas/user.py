@@ -4,7 +4,7 @@ from typing import Any, Optional
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
-from src.core.custom_types import PhoneNumber
+from src.core.custom_types import PhoneNumber, StoredEmail
 
 
 # Короткая версия для отдачи наружу
@@ -15,7 +15,7 @@ class UserShort(BaseModel):
     username: str  # required
     phone: str  # required
     active: bool  # required
-    email: EmailStr | None = None
+    email: StoredEmail | None = None
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -35,7 +35,7 @@ class UserRead(BaseModel):
     id: int
     username: str
     phone: str
-    email: Optional[EmailStr] = None
+    email: Optional[StoredEmail] = None
     tg_id: Optional[str] = None
     active: bool
     created_at: datetime
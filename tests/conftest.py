@@ -0,0 +1,145 @@
+"""Общие фикстуры тестов.
+
+Тесты с меткой postgres запускаются только с DATABASE_URL базы
+Postgres, к которой применены миграции:
+DATABASE_URL=postgresql+asyncpg://... pytest -m postgres
+"""
+import os
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+from typing import AsyncIterator
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+os.environ.setdefault('DATABASE_URL', 'sqlite+aiosqlite:///./test.db')
+os.environ.setdefault('SECRET', 'test')
+os.environ.setdefault('JWT_ALGORITHM', 'HS256')
+os.environ.setdefault('BCRYPT_ROUNDS', '4')
+os.environ.setdefault('WARMUP_CONNECTIONS', '0')
+
+from src.core import idempotency  # noqa: E402
+from src.core.db import AsyncSessionLocal, Base, engine  # noqa: E402
+from src.core.security import create_access_token  # noqa: E402
+from src.core.ttl_store import MemoryTTLStore  # noqa: E402
+from src.crud.hold import hold_crud  # noqa: E402
+from src.models import Cafe, TableModel, User  # noqa: E402
+from src.models.slot import TimeSlot  # noqa: E402
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Регистрирует метки тестов."""
+    config.addinivalue_line(
+        'markers', 'postgres: тест планов запросов на базе Postgres',
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config,
+    items: list[pytest.Item],
+) -> None:
+    """Пропускает тесты postgres на других базах."""
+    if engine.dialect.name == 'postgresql':
+        return
+    skip = pytest.mark.skip(reason='нужна база Postgres в DATABASE_URL')
+    for item in items:
+        if 'postgres' in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    """Асинхронные тесты выполняются на asyncio."""
+    return 'asyncio'
+
+
+@pytest.fixture
+async def session() -> AsyncIterator[AsyncSession]:
+    """Сессия базы данных с откатом после теста.
+
+    Соединения пула привязаны к циклу событий теста, поэтому после
+    теста пул закрывается.
+    """
+    async with AsyncSessionLocal() as session:
+        yield session
+        await session.rollback()
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncIterator[AsyncClient]:
+    """Клиент API запущенного приложения.
+
+    На SQLite схема создается заново, удержания и ключи идемпотентности
+    у каждого теста свои.
+    """
+    from src.main import create_app
+
+    if engine.dialect.name == 'sqlite':
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(hold_crud, '_store', MemoryTTLStore(1000))
+    monkeypatch.setattr(
+        idempotency, 'idempotency_store', MemoryTTLStore(1000),
+    )
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(
+            transport=ASGITransport(app),
+            base_url='http://test/api/v1',
+        ) as client:
+            yield client
+
+
+@pytest.fixture
+async def cafe(client: AsyncClient) -> SimpleNamespace:
+    """Кафе с двумя столами и двумя слотами на завтра.
+
+    headers - заголовки авторизации гостей alice, bob
+    и администратора admin.
+    """
+    suffix = uuid4().hex[:8]
+    tomorrow = date.today() + timedelta(days=1)
+    async with AsyncSessionLocal() as session:
+        users = {
+            name: User(
+                username=f'{name}_{suffix}',
+                phone=f'+79{index}{uuid4().int % 10 ** 8:08d}',
+                hashed_password='-',
+                is_superuser=name == 'admin',
+            )
+            for index, name in enumerate(('alice', 'bob', 'admin'))
+        }
+        cafe = Cafe(
+            name=f'Кафе {suffix}',
+            address='Улица',
+            phone=f'+7903{uuid4().int % 10 ** 7:07d}',
+            tables=[TableModel(seats_number=4) for _ in range(2)],
+            time_slots=[
+                TimeSlot(
+                    date=tomorrow,
+                    start_time=time(hour),
+                    end_time=time(hour + 1),
+                )
+                for hour in (10, 11)
+            ],
+        )
+        session.add_all([*users.values(), cafe])
+        await session.commit()
+        return SimpleNamespace(
+            id=cafe.id,
+            date=tomorrow,
+            tables=[table.id for table in cafe.tables],
+            slots=[slot.id for slot in cafe.time_slots],
+            headers={
+                name: {
+                    'Authorization': f'Bearer {create_access_token(user.id)}',
+                }
+                for name, user in users.items()
+            },
+        )
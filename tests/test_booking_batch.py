@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+
+pytestmark = pytest.mark.anyio
+
+
+def batch(cafe: SimpleNamespace, atomic: bool) -> dict[str, Any]:
+    """Пакет из трех бронирований, второе занимает пару первого."""
+    pairs = [(0, 0), (0, 0), (1, 1)]
+    return {
+        'cafe_id': cafe.id,
+        'atomic': atomic,
+        'items': [
+            {
+                'guests_number': 2,
+                'tables': [cafe.tables[table]],
+                'slots': [cafe.slots[slot]],
+            }
+            for table, slot in pairs
+        ],
+    }
+
+
+async def bookings_count(client: AsyncClient, cafe: SimpleNamespace) -> int:
+    """Число бронирований в кафе."""
+    response = await client.get(
+        '/booking',
+        params={'cafe_id': cafe.id},
+        headers=cafe.headers['admin'],
+    )
+    assert response.status_code == 200
+    return len(response.json())
+
+
+@pytest.mark.parametrize(
+    ('atomic', 'statuses', 'created'),
+    [
+        (False, [201, 409, 201], 2),
+        (True, [424, 409, 424], 0),
+    ],
+)
+async def test_batch_modes(
+    client: AsyncClient,
+    cafe: SimpleNamespace,
+    atomic: bool,
+    statuses: list[int],
+    created: int,
+) -> None:
+    """Частичный пакет создает годные элементы, атомарный - ни одного."""
+    response = await client.post(
+        '/booking/batch',
+        json=batch(cafe, atomic),
+        headers=cafe.headers['alice'],
+    )
+    assert response.status_code == 200
+    result = response.json()
+    assert [item['status_code'] for item in result['items']] == statuses
+    assert (result['created'], result['failed']) == (created, 3 - created)
+    assert await bookings_count(client, cafe) == created
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_stale_version_rejected(
+    client: AsyncClient,
+    cafe: SimpleNamespace,
+) -> None:
+    """Устаревшая версия в If-Match - 412, в теле запроса - 409."""
+    alice = cafe.headers['alice']
+    response = await client.post(
+        '/booking',
+        json={
+            'cafe_id': cafe.id,
+            'guests_number': 2,
+            'tables': cafe.tables[:1],
+            'slots': cafe.slots[:1],
+        },
+        headers=alice,
+    )
+    booking = response.json()
+    assert booking['version'] == 1
+    url = f'/booking/{booking["id"]}'
+
+    response = await client.patch(url, json={'note': 'a'},
+                                  headers={**alice, 'If-Match': '"1"'})
+    assert response.status_code == 200
+    assert response.json()['version'] == 2
+
+    response = await client.patch(url, json={'note': 'b'},
+                                  headers={**alice, 'If-Match': '"1"'})
+    assert response.status_code == 412
+    response = await client.patch(url, json={'note': 'b', 'version': 1},
+                                  headers=alice)
+    assert response.status_code == 409
+    response = await client.get(url, headers=alice)
+    assert (response.json()['note'], response.json()['version']) == ('a', 2)
+
+    response = await client.patch(url, json={'note': 'b', 'version': 2},
+                                  headers=alice)
+    assert response.status_code == 200
+    assert response.json()['version'] == 3
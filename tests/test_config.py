@@ -0,0 +1,12 @@
+import pytest
+from pydantic import ValidationError
+
+from src.core.config import Settings
+
+
+@pytest.mark.parametrize('field', ['realtime_bus', 'ttl_store'])
+def test_redis_requires_url(field: str) -> None:
+    """Redis в настройках без REDIS_URL - ошибка при запуске."""
+    with pytest.raises(ValidationError, match='REDIS_URL'):
+        Settings(**{field: 'redis', 'redis_url': None})
+    Settings(**{field: 'redis', 'redis_url': 'redis://localhost'})
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+
+pytestmark = pytest.mark.anyio
+
+
+def pair(cafe: SimpleNamespace, **extra: Any) -> dict[str, Any]:
+    """Тело запроса на первый стол в первый слот кафе."""
+    return {
+        'cafe_id': cafe.id,
+        'tables': cafe.tables[:1],
+        'slots': cafe.slots[:1],
+        **extra,
+    }
+
+
+async def test_hold_conflicts_until_released(
+    client: AsyncClient,
+    cafe: SimpleNamespace,
+) -> None:
+    """Удержанную пару не удержать и не забронировать другому гостю."""
+    alice, bob = cafe.headers['alice'], cafe.headers['bob']
+    response = await client.post('/booking/holds', json=pair(cafe),
+                                 headers=alice)
+    assert response.status_code == 201
+    hold = response.json()
+    assert (hold['tables'], hold['slots']) == (cafe.tables[:1], cafe.slots[:1])
+
+    response = await client.post('/booking/holds', json=pair(cafe),
+                                 headers=bob)
+    assert response.status_code == 409
+    response = await client.post(
+        '/booking', json=pair(cafe, guests_number=2), headers=bob,
+    )
+    assert response.status_code == 409
+    other = {**pair(cafe), 'tables': cafe.tables[1:]}
+    response = await client.post('/booking/holds', json=other, headers=bob)
+    assert response.status_code == 201
+
+    response = await client.delete(f'/booking/holds/{hold["id"]}',
+                                   headers=bob)
+    assert response.status_code == 403
+    response = await client.delete(f'/booking/holds/{hold["id"]}',
+                                   headers=alice)
+    assert response.status_code == 204
+    response = await client.post('/booking/holds', json=pair(cafe),
+                                 headers=bob)
+    assert response.status_code == 201
+
+
+async def test_booking_releases_own_hold(
+    client: AsyncClient,
+    cafe: SimpleNamespace,
+) -> None:
+    """Гость бронирует удержанную им пару, удержание снимается."""
+    alice, bob = cafe.headers['alice'], cafe.headers['bob']
+    response = await client.post('/booking/holds', json=pair(cafe),
+                                 headers=alice)
+    assert response.status_code == 201
+    response = await client.post(
+        '/booking', json=pair(cafe, guests_number=2), headers=alice,
+    )
+    assert response.status_code == 201
+
+    response = await client.post('/booking/holds', json=pair(cafe),
+                                 headers=bob)
+    assert response.status_code == 409
+    assert response.json()['detail'] == (
+        'Выбранные столы или время уже заняты'
+    )
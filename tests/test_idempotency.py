@@ -0,0 +1,87 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from pydantic import BaseModel
+
+from src.core import idempotency
+from src.core.config import get_settings
+from src.core.exceptions import ConflictError
+from src.core.idempotency import run_idempotent
+from src.core.ttl_store import MemoryTTLStore
+
+pytestmark = pytest.mark.anyio
+
+
+class Payload(BaseModel):
+    """Тело запроса."""
+
+    value: int
+
+
+async def test_pending_conflict_outlives_pending_ttl(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Повтор во время долгого обработчика получает 409, потом ответ."""
+    monkeypatch.setattr(
+        idempotency, 'idempotency_store', MemoryTTLStore(10),
+    )
+    monkeypatch.setattr(get_settings(), 'idempotency_pending_ttl_sec', 0.02)
+    release = asyncio.Event()
+    calls = []
+
+    async def handler() -> Payload:
+        calls.append(1)
+        await release.wait()
+        return Payload(value=1)
+
+    first = asyncio.create_task(
+        run_idempotent('key', 'test', Payload(value=1), handler, Payload),
+    )
+    await asyncio.sleep(0.1)
+    with pytest.raises(ConflictError):
+        await asyncio.wait_for(
+            run_idempotent('key', 'test', Payload(value=1), handler,
+                           Payload),
+            1,
+        )
+    release.set()
+    assert await first == Payload(value=1)
+    replay = await run_idempotent('key', 'test', Payload(value=1), handler,
+                                  Payload)
+    assert replay.headers['Idempotent-Replayed'] == 'true'
+    assert calls == [1]
+
+
+async def test_booking_replay(
+    client: AsyncClient,
+    cafe: SimpleNamespace,
+) -> None:
+    """Повтор создания с тем же ключом возвращает то же бронирование."""
+    headers = {**cafe.headers['alice'], 'Idempotency-Key': 'booking-1'}
+    body = {
+        'cafe_id': cafe.id,
+        'guests_number': 2,
+        'tables': cafe.tables[:1],
+        'slots': cafe.slots[:1],
+    }
+    created = await client.post('/booking', json=body, headers=headers)
+    assert created.status_code == 201
+    replayed = await client.post('/booking', json=body, headers=headers)
+    assert replayed.status_code == 201
+    assert replayed.headers['Idempotent-Replayed'] == 'true'
+    assert replayed.json()['id'] == created.json()['id']
+
+    response = await client.post(
+        '/booking', json={**body, 'guests_number': 3}, headers=headers,
+    )
+    assert response.status_code == 422
+    response = await client.get(
+        '/booking',
+        params={'cafe_id': cafe.id},
+        headers=cafe.headers['admin'],
+    )
+    assert [booking['id'] for booking in response.json()] == [
+        created.json()['id'],
+    ]
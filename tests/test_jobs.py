@@ -0,0 +1,16 @@
+from src.core.config import settings
+from src.core.scheduler import scheduler
+from src.jobs import register_jobs
+
+
+def test_register_jobs() -> None:
+    """Все фоновые задачи регистрируются со своими интервалами."""
+    register_jobs()
+    intervals = {job.name: job.interval for job in scheduler.jobs}
+    assert intervals == {
+        'booking_statuses': settings.booking_status_interval_sec,
+        'booking_archive': settings.archive_interval_sec,
+        'partitions': settings.partition_interval_sec,
+        'stats_pending': settings.stats_pending_interval_sec,
+        'stats_rebuild': settings.stats_interval_sec,
+    }
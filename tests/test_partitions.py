@@ -0,0 +1,82 @@
+import re
+from contextlib import contextmanager
+from datetime import date
+from typing import Any, Iterator
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db import engine
+from src.crud.booking import booking_crud
+from src.crud.slot import time_slot_crud
+
+pytestmark = [pytest.mark.postgres, pytest.mark.anyio]
+
+
+@contextmanager
+def captured_statements() -> Iterator[list[tuple[str, Any]]]:
+    """Собирает SQL и параметры запросов, отправленных в базу."""
+    statements: list[tuple[str, Any]] = []
+
+    def capture(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', capture)
+
+
+async def scanned_partitions(
+    session: AsyncSession,
+    statement: str,
+    parameters: Any,
+    table: str,
+) -> set[str]:
+    """Секции таблицы table в плане запроса."""
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(
+        f'EXPLAIN {statement}', parameters,
+    )
+    plan = '\n'.join(result.scalars())
+    return set(re.findall(rf'\b{table}_(?:p\d{{4}}_\d{{2}}|default)\b', plan))
+
+
+async def test_slots_by_date_scan_one_partition(
+    session: AsyncSession,
+) -> None:
+    """Слоты кафе на дату читаются из одной секции time_slots."""
+    with captured_statements() as statements:
+        await time_slot_crud.get_multi_by_cafe_and_date(
+            0, date.today(), session,
+        )
+    statement, parameters = statements[0]
+    partitions = await scanned_partitions(
+        session, statement, parameters, 'time_slots',
+    )
+    assert len(partitions) == 1, partitions
+
+
+async def test_booking_conflicts_scan_one_partition(
+    session: AsyncSession,
+) -> None:
+    """Проверка конфликтов читает по одной секции броней и слотов."""
+    with captured_statements() as statements:
+        await booking_crud.check_booking_conflicts(
+            session, 0, [0], [0], date.today(),
+        )
+    statement, parameters = statements[0]
+    for table in ('bookingmodel', 'time_slots'):
+        partitions = await scanned_partitions(
+            session, statement, parameters, table,
+        )
+        assert len(partitions) == 1, (table, partitions)
@@ -0,0 +1,67 @@
+import asyncio
+from datetime import date
+from typing import Any
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import realtime
+from src.core.realtime import AvailabilityHub, PostgresBus
+
+pytestmark = pytest.mark.anyio
+
+CHANNEL = 'test_realtime'
+
+
+async def test_hub_resync() -> None:
+    """После переподключения шины подписчики получают resync."""
+    hub = AvailabilityHub()
+    async with hub.subscribe(1, date(2025, 1, 1)) as subscription:
+        hub.dispatch({'type': 'booking', 'cafe_id': 1, 'date': '2025-01-01'})
+        hub.resync()
+        assert subscription.queue.qsize() == 1
+        assert (await subscription.get())['type'] == 'resync'
+
+
+async def listeners(session: AsyncSession) -> list[int]:
+    """PID соединений, слушающих канал теста."""
+    await session.execute(text('SELECT pg_stat_clear_snapshot()'))
+    result = await session.execute(
+        text(
+            'SELECT pid FROM pg_stat_activity '
+            'WHERE query = :query AND pid <> pg_backend_pid()',
+        ),
+        {'query': f'LISTEN "{CHANNEL}"'},
+    )
+    return list(result.scalars())
+
+
+@pytest.mark.postgres
+async def test_postgres_bus_reconnects(
+    session: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Шина переподключается после обрыва и закрывает соединение."""
+    monkeypatch.setattr(realtime, 'RECONNECT_DELAY_SEC', 0.01)
+    received: list[dict[str, Any]] = []
+    delivered, reconnected = asyncio.Event(), asyncio.Event()
+
+    def handler(message: dict[str, Any]) -> None:
+        received.append(message)
+        delivered.set()
+
+    bus = PostgresBus(CHANNEL)
+    await bus.start(handler, reconnected.set)
+    try:
+        (pid,) = await listeners(session)
+        await session.execute(
+            text('SELECT pg_terminate_backend(:pid)'), {'pid': pid},
+        )
+        await asyncio.wait_for(reconnected.wait(), 5)
+        await bus.publish({'value': 1})
+        await asyncio.wait_for(delivered.wait(), 5)
+        assert received == [{'value': 1}]
+    finally:
+        await bus.stop()
+    assert await listeners(session) == []
@@ -0,0 +1,36 @@
+from datetime import date, time
+from types import SimpleNamespace
+
+from src.core.stats import aggregate_cafe_stats
+
+DAY = date(2025, 1, 1)
+
+
+def test_utilisation_ignores_inactive_slots_and_tables() -> None:
+    """Пары отключенных слотов и столов не превышают вместимость."""
+    slots = [
+        SimpleNamespace(
+            id=1, date=DAY, start_time=time(10), end_time=time(11),
+        ),
+    ]
+    tables = [
+        SimpleNamespace(id=1, seats_number=2, active=True),
+        SimpleNamespace(id=2, seats_number=4, active=False),
+    ]
+    occupancy = [
+        SimpleNamespace(
+            date=DAY,
+            slot_id=slot_id,
+            table_id=table_id,
+            start_time=time(10 + slot_id - 1),
+            end_time=time(11 + slot_id - 1),
+        )
+        for slot_id, table_id in ((1, 1), (1, 2), (2, 1))
+    ]
+    stats = aggregate_cafe_stats(DAY, DAY, [], occupancy, [], slots, tables)
+    assert stats['utilisation'] == 1.0
+    assert [day['utilisation'] for day in stats['days']] == [1.0]
+    assert [
+        (slot['start_time'], slot['bookings']) for slot in stats['slots']
+    ] == [(time(10), 1)]
+    assert [table['bookings'] for table in stats['tables']] == [1, 1]
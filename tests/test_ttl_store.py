@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from src.core.ttl_store import MemoryTTLStore
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_expiry_order_with_mixed_ttl() -> None:
+    """Короткий срок истекает раньше длинного, записанного до него."""
+    store = MemoryTTLStore(10)
+    await store.set('done', 1, 60)
+    await store.set('pending', 2, 0.01)
+    await asyncio.sleep(0.02)
+    await store.set('other', 3, 60)
+    assert await store.get_many(['done', 'pending', 'other']) == {
+        'done': 1, 'other': 3,
+    }
+
+
+async def test_overflow_keeps_claims() -> None:
+    """Переполнение вытесняет ключи set с ближайшим сроком, не add."""
+    store = MemoryTTLStore(2)
+    assert await store.add('claim', 'pending', 1)
+    await store.set('soon', 1, 10)
+    await store.set('late', 2, 100)
+    await store.set('later', 3, 1000)
+    assert await store.get_many(['claim', 'soon', 'late', 'later']) == {
+        'claim': 'pending', 'late': 2, 'later': 3,
+    }
+    assert not await store.add('claim', 'other', 1)
+
+
+async def test_extend_only_own_value() -> None:
+    """Ключ продлевается, только если значение не сменилось."""
+    store = MemoryTTLStore(10)
+    assert await store.add('key', {'token': 'a'}, 0.05)
+    assert not await store.extend('key', {'token': 'b'}, 60)
+    assert await store.extend('key', {'token': 'a'}, 60)
+    await asyncio.sleep(0.06)
+    assert await store.get('key') == {'token': 'a'}